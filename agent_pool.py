@@ -0,0 +1,48 @@
+import threading
+from brand_agents import BrandAgent
+from tools import create_tool
+from tools.object_pool import ObjectPool
+from tools.llm_cache import create_llm
+
+
+class AgentPool(ObjectPool):
+    """
+    Pool of pre-built BrandAgent sets. All sets share one LLM client and one
+    instance of each tool; a set is used by one crew at a time because crewai
+    agents keep per-run state. The shared LLM and tools are created on first
+    use, so building a pool is cheap until it is warmed or acquired from.
+    """
+    def __init__(self, size):
+        super().__init__(self._create_agents, size)
+        self._shared = {}
+        self._shared_lock = threading.Lock()
+
+    def _get_shared(self, name, factory):
+        with self._shared_lock:
+            if name not in self._shared:
+                self._shared[name] = factory()
+            return self._shared[name]
+
+    @property
+    def llm(self):
+        return self._get_shared("llm", create_llm)
+
+    @property
+    def search_tool(self):
+        return self._get_shared("search", lambda: create_tool("search"))
+
+    @property
+    def browser_tool(self):
+        return self._get_shared("browser", lambda: create_tool("browser"))
+
+    @property
+    def finance_tool(self):
+        return self._get_shared("finance", lambda: create_tool("finance"))
+
+    def _create_agents(self):
+        return BrandAgent(
+            llm=self.llm,
+            search_tool=self.search_tool,
+            browser_tool=self.browser_tool,
+            finance_tool=self.finance_tool
+        ).warm()
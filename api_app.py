@@ -1,13 +1,30 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Response
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional, List
-from brand_agents import BrandAgent
+from typing import Optional, List, Dict, Any
 from brand_tasks import BrandTask
-from crewai import Crew
+from brand_jobs import JobManager
+from brand_crew import BrandCrew
+from crew_executor import create_crew_backend
+from report_cache import ReportCache
+from brand_batch import BatchPrefetcher
+from agent_pool import AgentPool
+from brand_monitor import BrandMonitor, get_monitor_store
+from brand_schemas import SearchResults, compact_json
+from tools.search_cache import get_search_cache
+from tools.scrape_cache import get_scrape_cache
+from tools.llm_cache import get_llm_cache
+from tools.http_client import get_http_client
+from tools.secret_provider import get_secret
+from tools.instrumentation import RequestTimings, collect_timings, record_cache, metrics_payload
+from tools.rate_governor import get_rate_governor, request_priority, PRIORITY_BATCH, PRIORITY_BACKGROUND
+import asyncio
+import json
 import os
-from functools import lru_cache
+import uuid
+from functools import partial, lru_cache
 from dotenv import load_dotenv
 import uvicorn
 
@@ -58,90 +75,288 @@ class BrandAnalysisRequest(BaseModel):
         description="List of competitors with their ticker symbols"
     )
 
+# Request models for analyzing many brands in one call
+class BatchBrandAnalysisRequest(BrandAnalysisRequest):
+    ticker: Optional[str] = Field(
+        None,
+        example="NKE",
+        description="Stock ticker symbol of the brand, if it is listed; listed first in the shared finance data"
+    )
+
+class BatchAnalysisRequest(BaseModel):
+    requests: List[BatchBrandAnalysisRequest] = Field(
+        ...,
+        description="Brand analyses to run; search and finance data is shared across them"
+    )
+
 # Response model for brand analysis
 class BrandAnalysisResponse(BaseModel):
     status: str
     message: str
     report: Optional[str] = None
     error: Optional[str] = None
+    cached: bool = False
+    report_age_seconds: Optional[float] = None
+    timings: Optional[Dict[str, Any]] = None
+
+class BatchAnalysisResponse(BaseModel):
+    results: List[BrandAnalysisResponse]
+
+# Request and response models for scheduled brand monitors
+class MonitorRequest(BrandAnalysisRequest):
+    interval_minutes: int = Field(
+        60,
+        ge=1,
+        example=60,
+        description="Minutes between checks for new coverage"
+    )
+
+class MonitorResponse(BaseModel):
+    monitor_id: str
+    brand_name: str
+    competitors: List[CompetitorInput]
+    interval_minutes: float
+    last_status: str
+    last_error: Optional[str] = None
+    seen_urls: int
+    next_run_at: datetime
+    last_run_at: Optional[datetime] = None
+    report: Optional[str] = None
+    report_updated_at: Optional[datetime] = None
+    job_id: Optional[str] = None
+    created_at: datetime
+
+# Response model for asynchronous analysis jobs
+class JobResponse(BaseModel):
+    job_id: str
+    status: str
+    brand_name: str
+    progress: float
+    completed_steps: int
+    total_steps: int
+    current_step: Optional[str] = None
+    subscribers: int = 1
+    subscriber_id: Optional[str] = None
+    report: Optional[str] = None
+    error: Optional[str] = None
+    cached: bool = False
+    report_age_seconds: Optional[float] = None
+    timings: Optional[Dict[str, Any]] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
 
 # Settings class to load API keys from environment
 class Settings:
     def __init__(self):
-        self.GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-        self.SERPER_API_KEY = os.getenv("SERPER_API_KEY")
-        self.BROWSERLESS_API_KEY = os.getenv("BROWSERLESS_API_KEY")
+        self.GEMINI_API_KEY = get_secret("GEMINI_API_KEY")
+        self.SERPER_API_KEY = get_secret("SERPER_API_KEY")
+        self.BROWSERLESS_API_KEY = get_secret("BROWSERLESS_API_KEY")
+        self.MAX_CONCURRENT_JOBS = int(os.getenv("MAX_CONCURRENT_JOBS", "4"))
+        self.REPORT_CACHE_TTL = int(os.getenv("REPORT_CACHE_TTL", "3600"))
+        self.REPORT_CACHE_STALE_TTL = int(os.getenv("REPORT_CACHE_STALE_TTL", "86400"))
+        self.REPORT_CACHE_MAX_ENTRIES = int(os.getenv("REPORT_CACHE_MAX_ENTRIES", "256"))
+        self.MONITOR_ENABLED = os.getenv("MONITOR_ENABLED", "true").lower() == "true"
+        self.MONITOR_POLL_SECONDS = int(os.getenv("MONITOR_POLL_SECONDS", "30"))
+        self.CREW_BACKEND = os.getenv("CREW_BACKEND", "thread").lower()
+        # One worker per core by default, but no more than the jobs that can run at once
+        self.CREW_PROCESSES = int(os.getenv("CREW_PROCESSES", "0")) or min(os.cpu_count() or 1, self.MAX_CONCURRENT_JOBS)
+        self.CREW_WORKER_MEMORY_MB = int(os.getenv("CREW_WORKER_MEMORY_MB", "2048"))
 
 # Cached settings loader
 @lru_cache()
 def get_settings():
     return Settings()
 
-# Main class to orchestrate brand monitoring using CrewAI
-class BrandCrew:
+# Shared services, created when the app starts rather than at import: crew
+# worker processes import this module too when it is run as a script
+agent_pool = None
+crew_backend = None
+report_cache = None
+job_manager = None
+brand_monitor = None
+
+# Runs a queued job on a worker thread and caches its report
+def run_job(job, prefetched=None):
+    cache_key = ReportCache.make_key(job.brand_name, job.competitors)
+    job.timings = RequestTimings()
+    try:
+        with collect_timings(job.timings), request_priority(job.priority):
+            report = crew_backend.run(
+                job.brand_name,
+                job.competitors,
+                step_callback=job.step_completed,
+                prefetched=prefetched
+            )
+        report_cache.set(cache_key, report)
+        return report
+    finally:
+        report_cache.end_refresh(cache_key)
+
+# Scrapes the new articles of a monitor and updates its report on a worker thread
+def run_monitor_update(job, previous_report, articles):
+    job.timings = RequestTimings()
+    with collect_timings(job.timings), request_priority(job.priority):
+        articles = brand_monitor.scrape_articles(articles)
+        report = crew_backend.run(
+            job.brand_name,
+            job.competitors,
+            step_callback=job.step_completed,
+            prefetched={"search_task": compact_json(SearchResults(articles=articles))},
+            previous_report=previous_report
+        )
+    report_cache.set(ReportCache.make_key(job.brand_name, job.competitors), report)
+    return report
+
+def submit_monitor_full(monitor):
+    return job_manager.submit(
+        monitor.brand_name,
+        monitor.competitors,
+        dedupe_key=ReportCache.make_key(monitor.brand_name, monitor.competitors),
+        priority=PRIORITY_BACKGROUND,
+        subscriber=f"monitor:{monitor.monitor_id}"
+    )
+
+def submit_monitor_update(monitor, articles):
+    return job_manager.submit(
+        monitor.brand_name,
+        monitor.competitors,
+        dedupe_key=f"monitor-update:{monitor.monitor_id}",
+        runner=partial(run_monitor_update, previous_report=monitor.report, articles=articles),
+        priority=PRIORITY_BACKGROUND,
+        total_steps=len(BrandTask.UPDATE_DEPENDENCIES),
+        subscriber=f"monitor:{monitor.monitor_id}"
+    )
+
+@app.on_event("startup")
+def create_services():
+    global agent_pool, crew_backend, report_cache, job_manager, brand_monitor
+    settings = get_settings()
+
+    # Warm agents and tools shared by all jobs; one agent set per concurrent job
+    agent_pool = AgentPool(size=settings.MAX_CONCURRENT_JOBS)
+
+    # Runs crews on job threads, or on worker processes with CREW_BACKEND=process
+    crew_backend = create_crew_backend(
+        settings.CREW_BACKEND,
+        agent_pool,
+        max_concurrency=settings.MAX_CONCURRENT_JOBS,
+        processes=settings.CREW_PROCESSES,
+        memory_limit_mb=settings.CREW_WORKER_MEMORY_MB
+    )
+
+    # Cache of finished reports keyed on brand and competitor set
+    report_cache = ReportCache(
+        ttl_seconds=settings.REPORT_CACHE_TTL,
+        stale_ttl_seconds=settings.REPORT_CACHE_STALE_TTL,
+        max_entries=settings.REPORT_CACHE_MAX_ENTRIES
+    )
+
+    # Bounded worker pool shared by all analysis endpoints; one job thread per crew slot
+    job_manager = JobManager(
+        run_job,
+        max_workers=crew_backend.max_concurrency,
+        total_steps=len(BrandCrew.TASK_NAMES)
+    )
+
+    # Scheduled monitors share the warm tools and the job pool with the API
+    brand_monitor = BrandMonitor(
+        get_monitor_store(),
+        submit_monitor_full,
+        submit_monitor_update,
+        search_tool=agent_pool.search_tool,
+        browser_tool=agent_pool.browser_tool,
+        poll_seconds=settings.MONITOR_POLL_SECONDS
+    )
+
+def get_cached_report(brand_name, competitors_list):
     """
-    Handles the orchestration of brand monitoring using CrewAI agents and tasks.
+    Looks up a cached report. Stale hits schedule one background refresh.
     """
-    def __init__(self, brand_name, competitors):
-        self.brand_name = brand_name
-        self.competitors = competitors
-
-    def run(self):
-        """
-        Runs the brand monitoring process by initializing agents, tasks, and Crew.
-        Returns the generated brand report or None if an error occurs.
-        """
-        try:
-            # Initialize agent and task classes
-            agents = BrandAgent()
-            tasks = BrandTask()
-
-            # Create agents for different roles
-            search_agent = agents.search_agent_brand()
-            sentiment_agent = agents.sentiment_analyst_agent()
-            finance_agent = agents.finance_analyst_agent()
-            comparison_agent = agents.comparison_analyst_agent()
-            report_agent = agents.report_agent()
-
-            # Define tasks for each agent
-            search_task = tasks.search_task(
-                search_agent,
-                self.brand_name,
-                self.competitors
-            )
-            sentiment_task = tasks.sentiment_task(sentiment_agent)
-            finance_task = tasks.finance_task(
-                finance_agent,
-                self.brand_name,
-                self.competitors
-            )
-            comparison_task = tasks.comparison_task(
-                comparison_agent,
-                self.brand_name,
-                self.competitors
-            )
-            report_task = tasks.report_task(
-                report_agent,
-                self.brand_name
-            )
+    cache_key = ReportCache.make_key(brand_name, competitors_list)
+    cached = report_cache.get(cache_key)
+    record_cache("report", cached is not None)
+    if cached is not None and cached.is_stale and report_cache.begin_refresh(cache_key):
+        job_manager.submit(
+            brand_name,
+            competitors_list,
+            dedupe_key=cache_key,
+            priority=PRIORITY_BACKGROUND,
+            subscriber="report-refresh"
+        )
+    return cached
 
-            # Create Crew with agents and tasks
-            crew = Crew(
-                agents=[search_agent, sentiment_agent, finance_agent, comparison_agent, report_agent],
-                tasks=[search_task, sentiment_task, finance_task, comparison_task, report_task],
-                verbose=True
-            )
+def job_to_response(job, subscriber_id=None):
+    return JobResponse(
+        job_id=job.job_id,
+        status=job.status,
+        brand_name=job.brand_name,
+        progress=round(job.progress, 2),
+        completed_steps=job.completed_steps,
+        total_steps=job.total_steps,
+        current_step=job.current_step,
+        subscribers=job.subscribers,
+        subscriber_id=subscriber_id,
+        report=job.report,
+        error=job.error,
+        cached=job.cached,
+        report_age_seconds=job.report_age_seconds,
+        timings=job.timings.to_dict() if job.timings else None,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at
+    )
 
-            # Run the Crew to generate the brand report
-            result = crew.kickoff()
-            return result.raw
+def monitor_to_response(monitor):
+    job = brand_monitor.current_job(monitor.monitor_id)
 
-        except Exception as e:
-            # Raise HTTPException for FastAPI error handling
-            raise HTTPException(
-                status_code=500,
-                detail=str(e)
-            )
+    def to_datetime(timestamp):
+        return datetime.fromtimestamp(timestamp) if timestamp else None
+
+    return MonitorResponse(
+        monitor_id=monitor.monitor_id,
+        brand_name=monitor.brand_name,
+        competitors=monitor.competitors,
+        interval_minutes=round(monitor.interval_seconds / 60, 2),
+        last_status=monitor.last_status,
+        last_error=monitor.last_error,
+        seen_urls=monitor.seen_urls,
+        next_run_at=to_datetime(monitor.next_run_at),
+        last_run_at=to_datetime(monitor.last_run_at),
+        report=monitor.report,
+        report_updated_at=to_datetime(monitor.report_updated_at),
+        job_id=job.job_id if job is not None and not job.is_finished() else None,
+        created_at=to_datetime(monitor.created_at)
+    )
+
+def get_competitors_list(request: BrandAnalysisRequest):
+    # Validate competitors list
+    if not request.competitors or len(request.competitors) == 0:
+        raise HTTPException(
+            status_code=400,
+            detail="At least one competitor must be provided"
+        )
+
+    # Convert competitors to the format expected by tasks
+    return [{"name": comp.name, "ticker": comp.ticker} for comp in request.competitors]
+
+# Build the agent pool or crew workers before serving so the first request is not slowed down
+@app.on_event("startup")
+async def warm_agent_pool():
+    await asyncio.to_thread(crew_backend.warm)
+    from tools.browser_tools import warm_summarizer_pool
+    await asyncio.to_thread(warm_summarizer_pool)
+
+@app.on_event("startup")
+def start_brand_monitor():
+    if get_settings().MONITOR_ENABLED:
+        brand_monitor.start()
+
+@app.on_event("shutdown")
+def shutdown_job_manager():
+    brand_monitor.stop()
+    job_manager.shutdown()
+    crew_backend.shutdown()
 
 # Root endpoint for API health/info
 @app.get("/")
@@ -155,29 +370,34 @@ async def root():
 # Main endpoint to analyze brand
 @app.post("/api/v1/analyze-brand", response_model=BrandAnalysisResponse)
 async def analyze_brand(request: BrandAnalysisRequest):
-    # Validate competitors list
-    if not request.competitors or len(request.competitors) == 0:
-        raise HTTPException(
-            status_code=400,
-            detail="At least one competitor must be provided"
+    competitors_list = get_competitors_list(request)
+
+    # Serve cached reports without running the crew
+    cached = get_cached_report(request.brand_name, competitors_list)
+    if cached is not None:
+        return BrandAnalysisResponse(
+            status="SUCCESS",
+            message="Brand analysis served from cache",
+            report=cached.report,
+            cached=True,
+            report_age_seconds=round(cached.age_seconds, 3)
         )
-    
-    # Convert competitors to the format expected by tasks
-    competitors_list = [{"name": comp.name, "ticker": comp.ticker} for comp in request.competitors]
 
     try:
-        # Initialize brand crew and generate report
-        brand_crew = BrandCrew(
+        # Run the crew on the worker pool and wait without blocking the event loop
+        job = job_manager.submit(
             request.brand_name,
-            competitors_list
+            competitors_list,
+            dedupe_key=ReportCache.make_key(request.brand_name, competitors_list)
         )
-        report = brand_crew.run()
+        report = await asyncio.wrap_future(job.future)
 
         # Return successful response
         return BrandAnalysisResponse(
             status="SUCCESS",
             message="Brand analysis completed successfully",
-            report=report
+            report=report,
+            timings=job.timings.to_dict() if job.timings else None
         )
     
     except Exception as e:
@@ -188,6 +408,293 @@ async def analyze_brand(request: BrandAnalysisRequest):
             error=str(e)
         )
 
+def format_sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+# Stream each task result as a server-sent event while the crew runs
+@app.post("/api/v1/analyze-brand/stream")
+async def analyze_brand_stream(request: BrandAnalysisRequest):
+    competitors_list = get_competitors_list(request)
+    cached = get_cached_report(request.brand_name, competitors_list)
+    job = None
+    if cached is None:
+        job = job_manager.submit(
+            request.brand_name,
+            competitors_list,
+            dedupe_key=ReportCache.make_key(request.brand_name, competitors_list)
+        )
+
+    async def events():
+        if cached is not None:
+            yield format_sse("report", {
+                "report": cached.report,
+                "cached": True,
+                "report_age_seconds": round(cached.age_seconds, 3)
+            })
+            yield format_sse("done", {"status": "SUCCESS"})
+            return
+
+        # Task results arrive on worker threads; hand them to the event loop
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+        steps_seen = 0
+
+        # Listeners run one at a time, in step order, replayed steps first
+        def listener(step_name, raw_output):
+            nonlocal steps_seen
+            steps_seen += 1
+            loop.call_soon_threadsafe(queue.put_nowait, (step_name, raw_output, steps_seen))
+
+        job.add_listener(listener)
+        job_future = asyncio.wrap_future(job.future)
+        try:
+            yield format_sse("job", {"job_id": job.job_id, "total_steps": job.total_steps})
+            while True:
+                get_step = asyncio.ensure_future(queue.get())
+                done, _ = await asyncio.wait({get_step, job_future}, timeout=15, return_when=asyncio.FIRST_COMPLETED)
+                if get_step in done:
+                    step_name, raw_output, completed_steps = get_step.result()
+                    yield format_sse("task", {
+                        "task": step_name,
+                        "output": raw_output,
+                        "completed_steps": completed_steps,
+                        "total_steps": job.total_steps
+                    })
+                    continue
+                get_step.cancel()
+                if job_future in done:
+                    break
+                # Keep idle connections open through proxies
+                yield ": keep-alive\n\n"
+
+            # Flush steps that finished together with the job
+            while not queue.empty():
+                step_name, raw_output, completed_steps = queue.get_nowait()
+                yield format_sse("task", {
+                    "task": step_name,
+                    "output": raw_output,
+                    "completed_steps": completed_steps,
+                    "total_steps": job.total_steps
+                })
+
+            try:
+                report = job_future.result()
+                yield format_sse("report", {
+                    "report": report,
+                    "cached": False,
+                    "timings": job.timings.to_dict() if job.timings else None
+                })
+                yield format_sse("done", {"status": "SUCCESS"})
+            except (Exception, asyncio.CancelledError) as e:
+                yield format_sse("error", {"status": job.status, "error": job.error or str(e) or "Job was cancelled"})
+        finally:
+            job.remove_listener(listener)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# Analyze many brands, fetching shared search and finance data only once
+@app.post("/api/v1/analyze-brands/batch", response_model=BatchAnalysisResponse)
+async def analyze_brands_batch(batch: BatchAnalysisRequest):
+    if not batch.requests:
+        raise HTTPException(
+            status_code=400,
+            detail="At least one brand analysis request must be provided"
+        )
+    analyses = [(request.brand_name, get_competitors_list(request), request.ticker) for request in batch.requests]
+
+    # Serve cached reports directly and prefetch data only for the rest
+    results = [None] * len(analyses)
+    for idx, (brand_name, competitors_list, _) in enumerate(analyses):
+        cached = get_cached_report(brand_name, competitors_list)
+        if cached is not None:
+            results[idx] = BrandAnalysisResponse(
+                status="SUCCESS",
+                message="Brand analysis served from cache",
+                report=cached.report,
+                cached=True,
+                report_age_seconds=round(cached.age_seconds, 3)
+            )
+    pending = [idx for idx, result in enumerate(results) if result is None]
+
+    if pending:
+        try:
+            # Batch calls queue behind interactive requests at the rate governor
+            with request_priority(PRIORITY_BATCH):
+                shared = await asyncio.to_thread(
+                    BatchPrefetcher(
+                        search_tool=agent_pool.search_tool,
+                        browser_tool=agent_pool.browser_tool,
+                        finance_tool=agent_pool.finance_tool
+                    ).prefetch,
+                    [analyses[idx] for idx in pending]
+                )
+        except Exception as e:
+            shared = None
+            for idx in pending:
+                results[idx] = BrandAnalysisResponse(
+                    status="ERROR",
+                    message="Failed to fetch shared batch data",
+                    error=str(e)
+                )
+
+        if shared is not None:
+            # Fan out the per-brand stages with search and finance already done
+            jobs = []
+            for idx in pending:
+                brand_name, competitors_list, ticker = analyses[idx]
+                prefetched = {
+                    "search_task": shared.search_output(brand_name, competitors_list),
+                    "finance_task": shared.finance_output(brand_name, competitors_list, ticker)
+                }
+                jobs.append(job_manager.submit(
+                    brand_name,
+                    competitors_list,
+                    dedupe_key=ReportCache.make_key(brand_name, competitors_list),
+                    runner=partial(run_job, prefetched=prefetched),
+                    priority=PRIORITY_BATCH
+                ))
+
+            reports = await asyncio.gather(
+                *(asyncio.wrap_future(job.future) for job in jobs),
+                return_exceptions=True
+            )
+            for idx, job, report in zip(pending, jobs, reports):
+                if isinstance(report, BaseException):
+                    results[idx] = BrandAnalysisResponse(
+                        status="ERROR",
+                        message="Failed to generate brand analysis",
+                        error=str(report)
+                    )
+                else:
+                    results[idx] = BrandAnalysisResponse(
+                        status="SUCCESS",
+                        message="Brand analysis completed successfully",
+                        report=report,
+                        timings=job.timings.to_dict() if job.timings else None
+                    )
+
+    return BatchAnalysisResponse(results=results)
+
+# Submit an analysis job and return its id immediately
+@app.post("/api/v1/analyze-brand/jobs", response_model=JobResponse, status_code=202)
+async def submit_analysis_job(request: BrandAnalysisRequest):
+    competitors_list = get_competitors_list(request)
+
+    # Identifies this caller when cancelling a job shared with other requests
+    subscriber_id = uuid.uuid4().hex
+    cached = get_cached_report(request.brand_name, competitors_list)
+    if cached is not None:
+        job = job_manager.add_completed(
+            request.brand_name,
+            competitors_list,
+            cached.report,
+            report_age_seconds=round(cached.age_seconds, 3)
+        )
+    else:
+        job = job_manager.submit(
+            request.brand_name,
+            competitors_list,
+            dedupe_key=ReportCache.make_key(request.brand_name, competitors_list),
+            subscriber=subscriber_id
+        )
+    return job_to_response(job, subscriber_id)
+
+# Poll the status, progress and report of a job
+@app.get("/api/v1/analyze-brand/jobs/{job_id}", response_model=JobResponse)
+async def get_analysis_job(job_id: str):
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return job_to_response(job)
+
+# Detach from a job; it is cancelled once no other request is waiting on it.
+# Without a subscriber_id the job is cancelled for every subscriber
+@app.delete("/api/v1/analyze-brand/jobs/{job_id}", response_model=JobResponse)
+async def cancel_analysis_job(job_id: str, subscriber_id: Optional[str] = None):
+    job = job_manager.cancel(job_id, subscriber_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return job_to_response(job)
+
+# Create a monitor that re-checks a brand for new coverage on an interval
+@app.post("/api/v1/monitors", response_model=MonitorResponse, status_code=201)
+async def create_monitor(request: MonitorRequest):
+    competitors_list = get_competitors_list(request)
+    monitor = await asyncio.to_thread(
+        get_monitor_store().create,
+        request.brand_name,
+        competitors_list,
+        request.interval_minutes * 60
+    )
+    return monitor_to_response(monitor)
+
+@app.get("/api/v1/monitors", response_model=List[MonitorResponse])
+async def list_monitors():
+    monitors = await asyncio.to_thread(get_monitor_store().list)
+    return [monitor_to_response(monitor) for monitor in monitors]
+
+@app.get("/api/v1/monitors/{monitor_id}", response_model=MonitorResponse)
+async def get_monitor(monitor_id: str):
+    monitor = await asyncio.to_thread(get_monitor_store().get, monitor_id)
+    if monitor is None:
+        raise HTTPException(status_code=404, detail=f"Monitor not found: {monitor_id}")
+    return monitor_to_response(monitor)
+
+# Check a monitor for new coverage now instead of waiting for its next tick
+@app.post("/api/v1/monitors/{monitor_id}/run", response_model=MonitorResponse)
+async def run_monitor(monitor_id: str):
+    monitor = await asyncio.to_thread(get_monitor_store().get, monitor_id)
+    if monitor is None:
+        raise HTTPException(status_code=404, detail=f"Monitor not found: {monitor_id}")
+    try:
+        await asyncio.to_thread(brand_monitor.tick, monitor)
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"Monitor check failed: {str(e)}")
+    return monitor_to_response(await asyncio.to_thread(get_monitor_store().get, monitor_id))
+
+@app.delete("/api/v1/monitors/{monitor_id}", status_code=204)
+async def delete_monitor(monitor_id: str):
+    if not await asyncio.to_thread(get_monitor_store().delete, monitor_id):
+        raise HTTPException(status_code=404, detail=f"Monitor not found: {monitor_id}")
+    return Response(status_code=204)
+
+# Hit-rate counters for the persistent caches
+@app.get("/api/v1/cache/stats")
+async def cache_stats():
+    search_cache = get_search_cache()
+    scrape_cache = get_scrape_cache()
+    llm_cache = get_llm_cache()
+    return {
+        "search": search_cache.stats() if search_cache else None,
+        "scrape": scrape_cache.stats() if scrape_cache else None,
+        "llm": llm_cache.stats() if llm_cache else None
+    }
+
+# Per-provider latency, retry and error counters for outbound HTTP calls
+@app.get("/api/v1/http/stats")
+async def http_stats():
+    return get_http_client().stats()
+
+# Current rate, in-flight calls and queue length per external provider
+@app.get("/api/v1/rate-limits")
+async def rate_limits():
+    return get_rate_governor().stats()
+
+# Crew backend, and for the process backend its workers' memory and job counts
+@app.get("/api/v1/crew-backend")
+async def crew_backend_stats():
+    return crew_backend.stats()
+
+# Prometheus metrics for crews, tasks, tools, LLM calls, HTTP and caches
+@app.get("/metrics")
+async def metrics():
+    body, content_type = metrics_payload()
+    return Response(content=body, media_type=content_type)
+
 # Health check endpoint
 @app.get("/health")
 async def health_check():
@@ -0,0 +1,64 @@
+"""
+Compares two benchmark result files level by level.
+
+    python -m benchmarks.compare benchmarks/results/<before>.json benchmarks/results/<after>.json
+"""
+import sys
+import json
+import argparse
+
+METRICS = [
+    ("p50 (s)", lambda level: level["latency_seconds"]["p50"]),
+    ("p95 (s)", lambda level: level["latency_seconds"]["p95"]),
+    ("p99 (s)", lambda level: level["latency_seconds"]["p99"]),
+    ("throughput (req/s)", lambda level: level["throughput_rps"]),
+    ("errors", lambda level: level["errors"]),
+    ("peak RSS (MB)", lambda level: level["peak_rss_mb"])
+]
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def change(before, after):
+    if before is None or after is None:
+        return "n/a"
+    if before == 0:
+        return "+0.0%" if after == 0 else "new"
+    return f"{(after - before) / before * 100:+.1f}%"
+
+
+def compare(before, after):
+    """
+    Returns a text table of each metric at each concurrency level present in
+    both runs.
+    """
+    before_levels = {level["concurrency"]: level for level in before["levels"]}
+    after_levels = {level["concurrency"]: level for level in after["levels"]}
+
+    lines = [f"Before: {before['commit']} ({before['timestamp']})", f"After:  {after['commit']} ({after['timestamp']})"]
+    if before["config"] != after["config"]:
+        lines.append("Warning: the runs used different benchmark settings")
+
+    for concurrency in sorted(set(before_levels) & set(after_levels)):
+        lines.append("")
+        lines.append(f"Concurrency {concurrency}:")
+        lines.append(f"  {'metric':<20} {'before':>10} {'after':>10} {'change':>10}")
+        for name, read in METRICS:
+            old, new = read(before_levels[concurrency]), read(after_levels[concurrency])
+            lines.append(f"  {name:<20} {str(old):>10} {str(new):>10} {change(old, new):>10}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("before")
+    parser.add_argument("after")
+    args = parser.parse_args(argv)
+    print(compare(load(args.before), load(args.after)))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
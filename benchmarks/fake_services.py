@@ -0,0 +1,222 @@
+import re
+import json
+import time
+import random
+import hashlib
+import logging
+import threading
+from typing import ClassVar
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+from crewai.llms.base_llm import BaseLLM
+from crewai.utilities.string_utils import sanitize_tool_name
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+class FakeServiceConfig:
+    """
+    Knobs shared by the local stand-ins.
+    """
+    def __init__(self, serper_delay=0.05, browserless_delay=0.2, html_kb=50, finance_delay=0.1, llm_delay=0.5):
+        self.serper_delay = serper_delay
+        self.browserless_delay = browserless_delay
+        self.html_kb = html_kb
+        self.finance_delay = finance_delay
+        self.llm_delay = llm_delay
+
+
+def canned_serper_response(query):
+    """
+    Deterministic Serper-shaped search results for a query.
+    """
+    slug = re.sub(r"\W+", "-", query.casefold()).strip("-")
+    return {
+        "searchParameters": {"q": query},
+        "organic": [
+            {
+                "title": f"{query.title()} result {idx + 1}",
+                "link": f"https://news.example.com/{slug}/{idx + 1}",
+                "snippet": f"Coverage of {query} from a reputable source, item {idx + 1}.",
+                "date": "1 day ago",
+                "source": "Example News"
+            }
+            for idx in range(6)
+        ]
+    }
+
+
+def canned_html(url, size_kb):
+    """
+    Article-like HTML of roughly size_kb kilobytes, with navigation and footer
+    boilerplate around the content.
+    """
+    paragraph = (
+        f"<p>The company behind {url} reported steady demand this quarter, with analysts "
+        "pointing to new product launches, marketing spend and supply chain improvements.</p>\n"
+    )
+    body = paragraph * max(1, (size_kb * 1024) // len(paragraph))
+    return (
+        "<html><head><title>Example article</title></head><body>"
+        "<nav><a href='/'>Home</a><a href='/news'>News</a></nav>"
+        "<h1>Example article</h1>"
+        f"{body}"
+        "<footer>Privacy policy. All rights reserved.</footer>"
+        "</body></html>"
+    )
+
+
+def _make_handler(config):
+    class FakeHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status, body, content_type):
+            payload = body.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            path = urlparse(self.path).path
+            if path == "/search":
+                time.sleep(config.serper_delay)
+                self._send(200, json.dumps(canned_serper_response(request.get("q", ""))), "application/json")
+            elif path == "/content":
+                time.sleep(config.browserless_delay)
+                self._send(200, canned_html(request.get("url", ""), config.html_kb), "text/html")
+            else:
+                self._send(404, "{}", "application/json")
+
+    return FakeHandler
+
+
+class FakeHTTPServices:
+    """
+    Local HTTP server answering Serper (/search) and browserless (/content).
+    """
+    def __init__(self, config, host="127.0.0.1", port=0):
+        self.server = ThreadingHTTPServer((host, port), _make_handler(config))
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+
+
+def make_fake_download_bars(config):
+    """
+    Returns a stand-in for tools.price_store.download_bars that generates a
+    deterministic random walk per ticker instead of calling Yahoo Finance.
+    """
+    def fake_download_bars(tickers, start, end):
+        import numpy as np
+        import pandas as pd
+
+        time.sleep(config.finance_delay)
+        dates = pd.bdate_range(pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize())
+        bars = {}
+        for ticker in tickers:
+            rng = np.random.default_rng(int(hashlib.sha256(ticker.encode()).hexdigest()[:8], 16))
+            close = 100 * np.exp(np.cumsum(rng.normal(0, 0.015, len(dates))))
+            bars[ticker] = pd.DataFrame({
+                "Open": close * 0.995,
+                "High": close * 1.01,
+                "Low": close * 0.99,
+                "Close": close,
+                "Volume": rng.integers(1_000_000, 5_000_000, len(dates)).astype(float)
+            }, index=dates)
+        return bars
+
+    return fake_download_bars
+
+
+def fake_ticker_info(self, ticker):
+    """
+    Stand-in for YFinanceTools._fetch_info.
+    """
+    return {"longName": f"{ticker} Holdings", "marketCap": 50e9, "trailingPE": 21.5, "dividendYield": 0.012}
+
+
+class FakeLLM(BaseLLM):
+    """
+    Deterministic LLM with a fixed delay. Agents with tools get one tool call
+    per available tool before a final answer, so tool paths are exercised.
+    """
+    delay: ClassVar[float] = 0.5
+
+    TOOL_ACTIONS: ClassVar[list] = [
+        ("Search the Internet", lambda prompt: {"query": "brand latest news"}),
+        ("Scrape the website content", lambda prompt: {"website": "https://news.example.com/brand/1"}),
+        ("Get Stock Financial Data", lambda prompt: {"ticker": FakeLLM._tickers(prompt)})
+    ]
+
+    # Structured answers for the tasks that declare an output schema, keyed on
+    # a phrase from the task description
+    STRUCTURED_ANSWERS: ClassVar[list] = [
+        ("You are the Search Agent", lambda prompt: {"articles": [
+            {"brand": "Brand", "title": "Brand result 1", "url": "https://news.example.com/brand/1",
+             "source": "Example News", "published_at": "1 day ago", "summary": "Brand reported steady demand."}
+        ]}),
+        ("You are the Sentiment Analyst Agent", lambda prompt: {"rows": [
+            {"brand": "Brand", "positive": 3, "neutral": 1, "negative": 1, "avg_sentiment_score": 0.4}
+        ]}),
+        ("You are the Financial Analyst", lambda prompt: {"rows": [
+            {"ticker": ticker.strip(), "current_price": 100.0, "change_7d": 1.2, "volatility": "Moderate"}
+            for ticker in FakeLLM._tickers(prompt).split(",")
+        ]}),
+        ("You are the Competitive Intelligence Analyst", lambda prompt: {
+            "rows": [{"brand": "Brand", "mentions": 3, "sentiment_score": 0.4, "change_7d": 1.2, "verdict": "Moderate"}],
+            "leader": "Brand",
+            "summary": ["Brand leads on sentiment."]
+        })
+    ]
+
+    @staticmethod
+    def _tickers(prompt):
+        match = re.search(r"competitors \(([^)]*)\)", prompt)
+        return match.group(1) if match else "NKE"
+
+    def call(self, messages, *args, **kwargs):
+        time.sleep(self.delay)
+        if isinstance(messages, str):
+            messages = [{"role": "user", "content": messages}]
+        prompt = "\n".join(str(m.get("content", "")) for m in messages)
+
+        # The format instructions mention "Observation:" too; only count
+        # observations added after the system prompt and the first user prompt
+        first_user = next((idx for idx, m in enumerate(messages) if m.get("role") == "user"), 0)
+        observations = sum(
+            str(m.get("content", "")).count("Observation:")
+            for idx, m in enumerate(messages)
+            if idx > first_user and m.get("role") != "system"
+        )
+        # crewai renders tools under their sanitized names, e.g. search_the_internet
+        available = [
+            (sanitize_tool_name(name), build) for name, build in self.TOOL_ACTIONS
+            if f"Tool Name: {sanitize_tool_name(name)}" in prompt
+        ]
+        if observations < len(available):
+            name, build = available[observations]
+            return f"Thought: I should use a tool\nAction: {name}\nAction Input: {json.dumps(build(prompt))}"
+
+        for marker, build in self.STRUCTURED_ANSWERS:
+            if marker in prompt:
+                return f"Thought: I now can give a great answer\nFinal Answer: {json.dumps(build(prompt))}"
+
+        digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:8]
+        return f"Thought: I now can give a great answer\nFinal Answer: Benchmark answer {digest}. Sentiment is positive with a score of {random.Random(digest).uniform(-1, 1):.2f}."
@@ -0,0 +1,240 @@
+"""
+End-to-end benchmark of /api/v1/analyze-brand against local stand-ins for
+Serper, browserless, yfinance and Gemini.
+
+    python -m benchmarks.run_benchmark --concurrency 1 4 8 --requests 16
+
+Results are written to benchmarks/results/<timestamp>-<commit>.json; compare
+two runs with benchmarks/compare.py.
+"""
+import os
+import sys
+import json
+import math
+import time
+import socket
+import logging
+import argparse
+import resource
+import platform
+import threading
+import subprocess
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from benchmarks.fake_services import (
+    FakeServiceConfig, FakeHTTPServices, FakeLLM, make_fake_download_bars, fake_ticker_info
+)
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+BRANDS = ["Nike", "Apple", "Tesla", "Coca-Cola", "Starbucks", "Netflix", "Spotify", "Airbnb"]
+COMPETITORS = [
+    {"name": "Adidas", "ticker": "ADDYY"},
+    {"name": "Puma", "ticker": "PUMSY"},
+    {"name": "Under Armour", "ticker": "UAA"}
+]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the brand analysis API against local fake services")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8], help="Concurrency levels to run")
+    parser.add_argument("--requests", type=int, default=16, help="Requests per concurrency level")
+    parser.add_argument("--llm-delay", type=float, default=0.5, help="Seconds per fake LLM call")
+    parser.add_argument("--serper-delay", type=float, default=0.05, help="Seconds per fake Serper request")
+    parser.add_argument("--browserless-delay", type=float, default=0.2, help="Seconds per fake browserless request")
+    parser.add_argument("--finance-delay", type=float, default=0.1, help="Seconds per fake price download")
+    parser.add_argument("--html-kb", type=int, default=50, help="Size of the fake browserless pages in KB")
+    parser.add_argument("--keep-caches", action="store_true", help="Leave the search, scrape, LLM and price caches and the URL index enabled")
+    parser.add_argument("--output-dir", default=RESULTS_DIR, help="Directory for the results file")
+    return parser.parse_args(argv)
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except Exception:
+        return "unknown"
+
+
+def percentile(values, pct):
+    """
+    Nearest-rank percentile of a list of numbers.
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def peak_rss_mb():
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def configure_environment(args, services):
+    """
+    Points the tools at the fake services. Must run before the API starts,
+    since settings and pools are created on startup.
+    """
+    os.environ["SERPER_URL"] = f"{services.base_url}/search"
+    os.environ["BROWSERLESS_URL"] = f"{services.base_url}/content"
+    for name in ("SERPER_API_KEY", "BROWSERLESS_API_KEY", "GEMINI_API_KEY"):
+        os.environ[name] = "benchmark"
+    if not args.keep_caches:
+        os.environ["SEARCH_CACHE_ENABLED"] = "false"
+        os.environ["SCRAPE_CACHE_ENABLED"] = "false"
+        os.environ["PRICE_STORE_ENABLED"] = "false"
+        os.environ["URL_INDEX_ENABLED"] = "false"
+        os.environ["LLM_CACHE_MODE"] = "off"
+    # The fakes below are patched into this process only
+    os.environ["CREW_BACKEND"] = "thread"
+
+
+def patch_services(config):
+    """
+    yfinance and the Gemini client cannot be redirected to a local server, so
+    they are replaced in-process.
+    """
+    import tools.price_store
+    from tools.finance_tools import YFinanceTools
+    from tools.llm_cache import set_llm_factory
+
+    tools.price_store.download_bars = make_fake_download_bars(config)
+    YFinanceTools._fetch_info = fake_ticker_info
+    FakeLLM.delay = config.llm_delay
+    set_llm_factory(FakeLLM)
+
+
+def start_api(port):
+    import uvicorn
+    from api_app import app
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+
+    deadline = time.time() + 30
+    while not server.started:
+        if time.time() > deadline:
+            raise RuntimeError("API server did not start within 30 seconds")
+        time.sleep(0.05)
+    return server, thread
+
+
+def run_level(base_url, concurrency, total, run_id):
+    """
+    Sends total requests with the given concurrency. Brand names are made
+    unique per request so the report cache and single-flight never short-circuit.
+    """
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=concurrency, pool_maxsize=concurrency)
+    session.mount("http://", adapter)
+
+    def send(idx):
+        payload = {
+            "brand_name": f"{BRANDS[idx % len(BRANDS)]} {run_id}-{concurrency}-{idx}",
+            "competitors": COMPETITORS
+        }
+        start = time.perf_counter()
+        try:
+            response = session.post(f"{base_url}/api/v1/analyze-brand", json=payload, timeout=600)
+            ok = response.status_code == 200 and response.json().get("status") == "SUCCESS"
+        except Exception as e:
+            logger.warning(f"Request {idx} failed: {str(e)}")
+            ok = False
+        return time.perf_counter() - start, ok
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(send, range(total)))
+    elapsed = time.perf_counter() - started
+
+    latencies = [latency for latency, ok in results if ok]
+    return {
+        "concurrency": concurrency,
+        "requests": total,
+        "errors": sum(1 for _, ok in results if not ok),
+        "wall_seconds": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 4) if elapsed else None,
+        "latency_seconds": {
+            "mean": round(sum(latencies) / len(latencies), 3) if latencies else None,
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99),
+            "max": max(latencies) if latencies else None
+        },
+        "peak_rss_mb": round(peak_rss_mb(), 1)
+    }
+
+
+def main(argv=None):
+    logging.basicConfig(level=logging.WARNING)
+    args = parse_args(argv)
+    config = FakeServiceConfig(
+        serper_delay=args.serper_delay,
+        browserless_delay=args.browserless_delay,
+        html_kb=args.html_kb,
+        finance_delay=args.finance_delay,
+        llm_delay=args.llm_delay
+    )
+
+    services = FakeHTTPServices(config).start()
+    configure_environment(args, services)
+    patch_services(config)
+
+    port = free_port()
+    server, thread = start_api(port)
+    base_url = f"http://127.0.0.1:{port}"
+    run_id = datetime.now().strftime("%H%M%S")
+
+    levels = []
+    try:
+        for concurrency in args.concurrency:
+            print(f"Running {args.requests} requests at concurrency {concurrency}...")
+            level = run_level(base_url, concurrency, args.requests, run_id)
+            latency = level["latency_seconds"]
+            print(
+                f"  p50={latency['p50']}s p95={latency['p95']}s p99={latency['p99']}s "
+                f"throughput={level['throughput_rps']} req/s errors={level['errors']} peak_rss={level['peak_rss_mb']} MB"
+            )
+            levels.append(level)
+    finally:
+        server.should_exit = True
+        thread.join(timeout=30)
+        services.stop()
+
+    commit = git_commit()
+    result = {
+        "commit": commit,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {key: value for key, value in vars(args).items() if key != "output_dir"},
+        "levels": levels
+    }
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    path = os.path.join(args.output_dir, f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{commit}.json")
+    with open(path, "w") as f:
+        json.dump(result, f, indent=2)
+    print(f"Results saved to {path}")
+    return path
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,47 @@
-from crewai import Agent, LLM
+import functools
+from crewai import Agent
 from dotenv import load_dotenv
-from tools.search_tools import SearchTools
-from tools.browser_tools import BrowserTools
-from tools.finance_tools import YFinanceTools
+from tools import create_tool
+from tools.llm_cache import create_llm
 
 load_dotenv()
 
+
+def reusable(method):
+    """
+    Builds the agent on first call and returns the same instance afterwards.
+    """
+    @functools.wraps(method)
+    def wrapper(self):
+        if method.__name__ not in self._agents:
+            self._agents[method.__name__] = method(self)
+        return self._agents[method.__name__]
+    return wrapper
+
+
 class BrandAgent():
 
-    def __init__(self):
-        self.llm = LLM(model="gemini/gemini-2.0-flash")
-        self.search_tool = SearchTools()
-        self.browser_tool = BrowserTools()
-        self.finance_tool = YFinanceTools()
+    def __init__(self, llm=None, search_tool=None, browser_tool=None, finance_tool=None):
+        # LLM and tools can be shared between BrandAgent instances
+        self.llm = llm or create_llm()
+        self.search_tool = search_tool or create_tool("search")
+        self.browser_tool = browser_tool or create_tool("browser")
+        self.finance_tool = finance_tool or create_tool("finance")
+        self._agents = {}
+
+    def warm(self):
+        """
+        Builds all agents up front so the first crew does not pay for it.
+        """
+        self.search_agent_brand()
+        self.sentiment_analyst_agent()
+        self.finance_analyst_agent()
+        self.comparison_analyst_agent()
+        self.report_agent()
+        return self
 
 
+    @reusable
     def search_agent_brand(self):
         return Agent(
             role = "Search Agent",
@@ -38,6 +65,7 @@ class BrandAgent():
         )
     
 
+    @reusable
     def sentiment_analyst_agent(self):
         return Agent(
             role = "Sentiment Analyst Agent",
@@ -60,6 +88,7 @@ class BrandAgent():
             allow_delegation = False
         )
     
+    @reusable
     def finance_analyst_agent(self):
         return Agent(
             role="Financial Intelligence Analyst",
@@ -83,6 +112,7 @@ class BrandAgent():
         )
 
     
+    @reusable
     def comparison_analyst_agent(self):
         return Agent(
             role="Competitive Intelligence Analyst",
@@ -105,6 +135,7 @@ class BrandAgent():
             verbose=True
         )
     
+    @reusable
     def report_agent(self):
         return Agent(
             role="Executive Reporting Specialist",
@@ -0,0 +1,103 @@
+import logging
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from tools import create_tool
+from brand_schemas import Article, SearchResults, compact_json
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+def normalize_name(name):
+    return " ".join(name.split()).casefold()
+
+
+class SharedEntityData:
+    """
+    Search, scrape and finance data fetched once per distinct brand and
+    ticker across a batch of analyses.
+    """
+    def __init__(self):
+        self.search = {}
+        self.tickers = {}
+        self.finance_sections = {}
+        self.history = {}
+
+    def search_output(self, brand_name, competitors):
+        """
+        Builds the search_task output for one analysis from the shared data,
+        in the same compact JSON form as a structured search_task result.
+        """
+        names = [brand_name] + [c["name"] for c in competitors]
+        articles = [self.search[normalize_name(name)] for name in dict.fromkeys(names)]
+        return compact_json(SearchResults(articles=articles))
+
+    def finance_output(self, brand_name, competitors, ticker=None):
+        """
+        Builds the finance_task output for one analysis, with the brand's own
+        ticker first when it is given or known from another request in the batch.
+        """
+        tickers = [ticker or self.tickers.get(normalize_name(brand_name))] + [c["ticker"] for c in competitors]
+        tickers = [ticker.upper() for ticker in tickers if ticker]
+        return create_tool("finance").format_ticker_panel(tickers, self.finance_sections, self.history)
+
+
+class BatchPrefetcher:
+    """
+    Fetches the external data for a batch of brand analyses, calling each
+    provider once per distinct entity instead of once per brand x competitor.
+    """
+    def __init__(self, max_workers=4, search_tool=None, browser_tool=None, finance_tool=None):
+        self.max_workers = max_workers
+        self.search_tool = search_tool or create_tool("search")
+        self.browser_tool = browser_tool or create_tool("browser")
+        self.finance_tool = finance_tool or create_tool("finance")
+
+    def _fetch_entity_news(self, name):
+        """
+        Searches for the latest news about one entity and summarizes the top result.
+        """
+        logger.info(f"Prefetching news for: {name}")
+        data = self.search_tool._search(f"{name} latest news")
+        if not data or not data.get("organic"):
+            return Article(brand=name, title="N/A", summary="No search results found")
+
+        top = data["organic"][0]
+        summary = self.browser_tool._run(top["link"]) if top.get("link") else top.get("snippet", "N/A")
+        return Article(
+            brand=name,
+            title=top.get("title", "N/A"),
+            url=top.get("link"),
+            source=top.get("source"),
+            published_at=top.get("date"),
+            summary=summary
+        )
+
+    def prefetch(self, analyses):
+        """
+        analyses is a list of (brand_name, competitors, ticker) tuples, where
+        ticker is the brand's own ticker or None. Returns the SharedEntityData
+        for all of them.
+        """
+        data = SharedEntityData()
+        names = {}
+        for brand_name, competitors, ticker in analyses:
+            names.setdefault(normalize_name(brand_name), brand_name)
+            if ticker:
+                data.tickers[normalize_name(brand_name)] = ticker.upper()
+            for competitor in competitors:
+                names.setdefault(normalize_name(competitor["name"]), competitor["name"])
+                data.tickers.setdefault(normalize_name(competitor["name"]), competitor["ticker"].upper())
+
+        logger.info(f"Prefetching {len(names)} entities and {len(set(data.tickers.values()))} tickers for {len(analyses)} analyses")
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="batch-prefetch") as executor:
+            # Fetch in copies of the caller's context so its request priority applies
+            finance = executor.submit(contextvars.copy_context().run, self.finance_tool.fetch_ticker_data, sorted(set(data.tickers.values())))
+            news = {
+                key: executor.submit(contextvars.copy_context().run, self._fetch_entity_news, name)
+                for key, name in names.items()
+            }
+            data.search.update({key: future.result() for key, future in news.items()})
+            data.finance_sections, data.history = finance.result()
+        return data
@@ -0,0 +1,153 @@
+from fastapi import HTTPException
+from contextlib import nullcontext
+from brand_agents import BrandAgent
+from brand_tasks import BrandTask
+from brand_jobs import JobCancelled
+from brand_schemas import compact_json
+from crew_scheduler import TaskGraph, TaskNode
+from sentiment_engine import SentimentRunner, get_sentiment_engine
+from tools.instrumentation import timed
+
+
+# Main class to orchestrate brand monitoring using CrewAI
+class BrandCrew:
+    """
+    Handles the orchestration of brand monitoring using CrewAI agents and tasks.
+    """
+    TASK_NAMES = list(BrandTask.DEPENDENCIES)
+
+    def __init__(self, brand_name, competitors, step_callback=None, prefetched=None, agent_pool=None):
+        self.brand_name = brand_name
+        self.competitors = competitors
+        self.step_callback = step_callback
+        self.prefetched = prefetched or {}
+        self.agent_pool = agent_pool
+        self.sentiment_engine = get_sentiment_engine()
+
+    def _runners(self, tasks, sentiment_agent):
+        # Sentiment is scored locally; only ambiguous articles reach the agent
+        if self.sentiment_engine is None:
+            return {}
+        return {
+            "sentiment_task": SentimentRunner(
+                self.sentiment_engine,
+                lambda articles: tasks.sentiment_task(sentiment_agent, articles=articles)
+            )
+        }
+
+    def run(self):
+        """
+        Runs the brand monitoring process by initializing agents and tasks and
+        executing them as a dependency graph. Agents are checked out of the
+        warm pool when one is configured.
+        Returns the generated brand report or None if an error occurs.
+        """
+        try:
+            # Check out a warmed agent set, or build one for this run
+            agents_context = self.agent_pool.acquire() if self.agent_pool else nullcontext(BrandAgent())
+            with timed("crew", "brand_crew"), agents_context as agents:
+                tasks = BrandTask()
+
+                # Create agents for different roles
+                search_agent = agents.search_agent_brand()
+                sentiment_agent = agents.sentiment_analyst_agent()
+                finance_agent = agents.finance_analyst_agent()
+                comparison_agent = agents.comparison_analyst_agent()
+                report_agent = agents.report_agent()
+
+                # Define tasks for each agent
+                search_task = tasks.search_task(
+                    search_agent,
+                    self.brand_name,
+                    self.competitors
+                )
+                sentiment_task = tasks.sentiment_task(sentiment_agent)
+                finance_task = tasks.finance_task(
+                    finance_agent,
+                    self.brand_name,
+                    self.competitors
+                )
+                comparison_task = tasks.comparison_task(
+                    comparison_agent,
+                    self.brand_name,
+                    self.competitors
+                )
+                report_task = tasks.report_task(
+                    report_agent,
+                    self.brand_name
+                )
+
+                # Build the task graph from the declared task dependencies
+                task_agents = {
+                    "search_task": (search_task, search_agent),
+                    "sentiment_task": (sentiment_task, sentiment_agent),
+                    "finance_task": (finance_task, finance_agent),
+                    "comparison_task": (comparison_task, comparison_agent),
+                    "report_task": (report_task, report_agent)
+                }
+                runners = self._runners(tasks, sentiment_agent)
+                graph = TaskGraph(
+                    [
+                        TaskNode(name, task, agent, BrandTask.DEPENDENCIES[name], runner=runners.get(name))
+                        for name, (task, agent) in task_agents.items()
+                    ],
+                    agents=[search_agent, sentiment_agent, finance_agent, comparison_agent, report_agent],
+                    format_output=compact_json
+                )
+
+                # Run the graph to generate the brand report
+                outputs = graph.run(task_callback=self.step_callback, completed=self.prefetched)
+                return outputs["report_task"].raw
+
+        except JobCancelled:
+            raise
+
+        except Exception as e:
+            # Raise HTTPException for FastAPI error handling
+            raise HTTPException(
+                status_code=500,
+                detail=str(e)
+            )
+
+    def run_update(self, previous_report):
+        """
+        Updates previous_report from new articles passed in as the prefetched
+        search_task output: only sentiment and the report update run.
+        Returns the updated report.
+        """
+        try:
+            agents_context = self.agent_pool.acquire() if self.agent_pool else nullcontext(BrandAgent())
+            with timed("crew", "brand_crew_update"), agents_context as agents:
+                tasks = BrandTask()
+
+                search_agent = agents.search_agent_brand()
+                sentiment_agent = agents.sentiment_analyst_agent()
+                report_agent = agents.report_agent()
+
+                # search_task is never run; it only carries the new articles
+                task_agents = {
+                    "search_task": (tasks.search_task(search_agent, self.brand_name, self.competitors), search_agent),
+                    "sentiment_task": (tasks.sentiment_task(sentiment_agent), sentiment_agent),
+                    "report_update_task": (tasks.report_update_task(report_agent, self.brand_name, previous_report), report_agent)
+                }
+                runners = self._runners(tasks, sentiment_agent)
+                graph = TaskGraph(
+                    [
+                        TaskNode(name, task, agent, BrandTask.UPDATE_DEPENDENCIES[name], runner=runners.get(name))
+                        for name, (task, agent) in task_agents.items()
+                    ],
+                    agents=[search_agent, sentiment_agent, report_agent],
+                    format_output=compact_json
+                )
+
+                outputs = graph.run(task_callback=self.step_callback, completed=self.prefetched)
+                return outputs["report_update_task"].raw
+
+        except JobCancelled:
+            raise
+
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=str(e)
+            )
@@ -0,0 +1,257 @@
+import logging
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from tools.rate_governor import PRIORITY_INTERACTIVE
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+# Possible states of an analysis job
+class JobStatus:
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    SUCCESS = "SUCCESS"
+    ERROR = "ERROR"
+    CANCELLED = "CANCELLED"
+
+
+class JobCancelled(Exception):
+    """
+    Raised inside a running job once cancellation has been requested.
+    """
+
+
+class Job:
+    """
+    Tracks the state, progress and result of a single brand analysis.
+    Every caller sharing the job is a subscriber; the job is only cancelled
+    once all of them have detached.
+    """
+    def __init__(self, brand_name, competitors, total_steps, dedupe_key=None, runner=None, priority=PRIORITY_INTERACTIVE,
+                 subscriber=None):
+        self.job_id = uuid.uuid4().hex
+        self.brand_name = brand_name
+        self.competitors = competitors
+        self.dedupe_key = dedupe_key
+        self.runner = runner
+        self.priority = priority
+        self.subscriber_ids = {subscriber or uuid.uuid4().hex}
+        self.total_steps = total_steps
+        self.completed_steps = 0
+        self.current_step = None
+        self.status = JobStatus.PENDING
+        self.report = None
+        self.cached = False
+        self.report_age_seconds = None
+        self.timings = None
+        self.error = None
+        self.created_at = datetime.now()
+        self.started_at = None
+        self.finished_at = None
+        self.future = None
+        self.step_outputs = []
+        self._listeners = []
+        self._listeners_lock = threading.Lock()
+        self._cancel_event = threading.Event()
+
+    @property
+    def subscribers(self):
+        return len(self.subscriber_ids)
+
+    @property
+    def cancel_requested(self):
+        return self._cancel_event.is_set()
+
+    @property
+    def progress(self):
+        if self.status == JobStatus.SUCCESS:
+            return 1.0
+        return self.completed_steps / self.total_steps if self.total_steps else 0.0
+
+    def add_listener(self, listener):
+        """
+        Registers listener(step_name, raw_output) for finished steps. Steps
+        that already finished are replayed to the listener first.
+        """
+        with self._listeners_lock:
+            for step_name, raw_output in self.step_outputs:
+                listener(step_name, raw_output)
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        with self._listeners_lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def step_completed(self, step_name, output=None):
+        """
+        Records a finished crew step and notifies listeners. Raises
+        JobCancelled if the job was cancelled while the step was running, so
+        the crew stops early.
+        """
+        raw_output = getattr(output, "raw", output)
+        with self._listeners_lock:
+            self.completed_steps += 1
+            self.current_step = step_name
+            self.step_outputs.append((step_name, raw_output))
+            for listener in list(self._listeners):
+                try:
+                    listener(step_name, raw_output)
+                except Exception as e:
+                    logger.warning(f"Job {self.job_id}: step listener failed: {str(e)}")
+        logger.info(f"Job {self.job_id}: completed {step_name} ({self.completed_steps}/{self.total_steps})")
+        if self.cancel_requested:
+            raise JobCancelled(f"Job {self.job_id} was cancelled")
+
+    def is_finished(self):
+        return self.status in (JobStatus.SUCCESS, JobStatus.ERROR, JobStatus.CANCELLED)
+
+
+class JobManager:
+    """
+    Runs brand analyses on a bounded pool of worker threads so that the
+    event loop is never blocked by a crew.
+
+    Submissions that share a dedupe key with an unfinished job are attached to
+    that job instead of starting another crew (single-flight).
+    """
+    def __init__(self, runner, max_workers=4, total_steps=0, max_retained_jobs=1000):
+        self.runner = runner
+        self.total_steps = total_steps
+        self.max_retained_jobs = max_retained_jobs
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="brand-job")
+        self._jobs = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def submit(self, brand_name, competitors, dedupe_key=None, runner=None, priority=PRIORITY_INTERACTIVE, total_steps=None,
+               subscriber=None):
+        """
+        Queues a new analysis and returns its Job immediately. If an identical
+        analysis is already pending or running, that Job is returned instead,
+        raised to the more urgent of the two priorities.
+        runner and total_steps override the manager's defaults for this job.
+        subscriber identifies the caller for cancel(); anonymous callers get a
+        random id and stay subscribed until the job finishes.
+        """
+        subscriber = subscriber or uuid.uuid4().hex
+        with self._lock:
+            inflight = self._inflight.get(dedupe_key) if dedupe_key is not None else None
+            if inflight is not None and not inflight.cancel_requested:
+                inflight.subscriber_ids.add(subscriber)
+                inflight.priority = min(inflight.priority, priority)
+                logger.info(f"Coalesced request for brand {brand_name} into job {inflight.job_id} ({inflight.subscribers} subscribers)")
+                return inflight
+
+            job = Job(
+                brand_name,
+                competitors,
+                total_steps or self.total_steps,
+                dedupe_key=dedupe_key,
+                runner=runner,
+                priority=priority,
+                subscriber=subscriber
+            )
+            self._jobs[job.job_id] = job
+            if dedupe_key is not None:
+                self._inflight[dedupe_key] = job
+            self._evict_finished()
+            job.future = self._executor.submit(self._execute, job)
+
+        logger.info(f"Submitted job {job.job_id} for brand: {brand_name}")
+        return job
+
+    def add_completed(self, brand_name, competitors, report, report_age_seconds=None):
+        """
+        Registers a job whose report is already available, e.g. from the report cache.
+        """
+        job = Job(brand_name, competitors, self.total_steps)
+        job.status = JobStatus.SUCCESS
+        job.report = report
+        job.cached = True
+        job.report_age_seconds = report_age_seconds
+        job.completed_steps = self.total_steps
+        job.started_at = job.finished_at = datetime.now()
+        with self._lock:
+            self._jobs[job.job_id] = job
+            self._evict_finished()
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id, subscriber=None):
+        """
+        Detaches subscriber from a job and cancels the job once no
+        subscribers are left; without a subscriber every one is detached.
+        Pending jobs are dropped right away; running jobs stop at the next
+        step boundary. Returns None for unknown job ids.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.is_finished():
+                return job
+
+            if subscriber is None:
+                job.subscriber_ids.clear()
+            else:
+                job.subscriber_ids.discard(subscriber)
+            if job.subscriber_ids:
+                logger.info(f"Subscriber left job {job_id}, {job.subscribers} remaining")
+                return job
+            job._cancel_event.set()
+
+        if job.future.cancel():
+            job.status = JobStatus.CANCELLED
+            job.finished_at = datetime.now()
+            self._release(job)
+        logger.info(f"Cancellation requested for job {job_id}")
+        return job
+
+    def shutdown(self, wait=False):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _execute(self, job):
+        if job.cancel_requested:
+            job.status = JobStatus.CANCELLED
+            job.finished_at = datetime.now()
+            self._release(job)
+            raise JobCancelled(f"Job {job.job_id} was cancelled")
+
+        job.status = JobStatus.RUNNING
+        job.started_at = datetime.now()
+        try:
+            job.report = (job.runner or self.runner)(job)
+            job.status = JobStatus.SUCCESS
+            return job.report
+        except JobCancelled:
+            job.status = JobStatus.CANCELLED
+            raise
+        except Exception as e:
+            logger.exception(f"Job {job.job_id} failed: {str(e)}")
+            job.status = JobStatus.ERROR
+            job.error = getattr(e, "detail", None) or str(e)
+            raise
+        finally:
+            job.finished_at = datetime.now()
+            self._release(job)
+
+    def _release(self, job):
+        # Stop routing new submissions to a finished job
+        with self._lock:
+            if job.dedupe_key is not None and self._inflight.get(job.dedupe_key) is job:
+                del self._inflight[job.dedupe_key]
+
+    def _evict_finished(self):
+        # Drop the oldest finished jobs once the retention limit is exceeded
+        excess = len(self._jobs) - self.max_retained_jobs
+        if excess <= 0:
+            return
+        for job_id in [jid for jid, job in self._jobs.items() if job.is_finished()][:excess]:
+            del self._jobs[job_id]
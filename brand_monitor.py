@@ -0,0 +1,322 @@
+import os
+import json
+import time
+import uuid
+import logging
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from brand_schemas import Article
+from tools import create_tool
+from tools.sqlite_store import SQLiteStore, DEFAULT_CACHE_DIR
+from tools.rate_governor import request_priority, PRIORITY_BACKGROUND
+from tools.url_index import resolve_url
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+# Outcomes of a monitoring tick
+class MonitorStatus:
+    NEW = "NEW"
+    NO_CHANGES = "NO_CHANGES"
+    UPDATING = "UPDATING"
+    UPDATED = "UPDATED"
+    ERROR = "ERROR"
+
+
+class Monitor:
+    """
+    A brand and competitor set checked for new coverage on an interval.
+    """
+    def __init__(self, monitor_id, brand_name, competitors, interval_seconds, next_run_at,
+                 last_run_at=None, last_status=MonitorStatus.NEW, last_error=None, report=None,
+                 report_updated_at=None, seen_urls=0, created_at=None):
+        self.monitor_id = monitor_id
+        self.brand_name = brand_name
+        self.competitors = competitors
+        self.interval_seconds = interval_seconds
+        self.next_run_at = next_run_at
+        self.last_run_at = last_run_at
+        self.last_status = last_status
+        self.last_error = last_error
+        self.report = report
+        self.report_updated_at = report_updated_at
+        self.seen_urls = seen_urls
+        self.created_at = created_at
+
+    @property
+    def entities(self):
+        return list(dict.fromkeys([self.brand_name] + [c["name"] for c in self.competitors]))
+
+
+class MonitorStore(SQLiteStore):
+    """
+    Persistent monitors, their latest report and the canonical URLs of the
+    search results they have already seen.
+    """
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS monitors (
+        monitor_id TEXT PRIMARY KEY,
+        brand_name TEXT NOT NULL,
+        competitors TEXT NOT NULL,
+        interval_seconds INTEGER NOT NULL,
+        next_run_at REAL NOT NULL,
+        last_run_at REAL,
+        last_status TEXT NOT NULL,
+        last_error TEXT,
+        report TEXT,
+        report_updated_at REAL,
+        created_at REAL NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS monitor_seen_urls (
+        monitor_id TEXT NOT NULL,
+        url TEXT NOT NULL,
+        entity TEXT NOT NULL,
+        first_seen_at REAL NOT NULL,
+        PRIMARY KEY (monitor_id, url)
+    );
+    """
+    STATS_NAME = "monitor"
+
+    COLUMNS = (
+        "monitor_id, brand_name, competitors, interval_seconds, next_run_at, last_run_at, "
+        "last_status, last_error, report, report_updated_at, created_at"
+    )
+
+    def _to_monitor(self, row):
+        conn = self._connect()
+        seen = conn.execute("SELECT COUNT(*) FROM monitor_seen_urls WHERE monitor_id = ?", (row[0],)).fetchone()[0]
+        return Monitor(
+            monitor_id=row[0],
+            brand_name=row[1],
+            competitors=json.loads(row[2]),
+            interval_seconds=row[3],
+            next_run_at=row[4],
+            last_run_at=row[5],
+            last_status=row[6],
+            last_error=row[7],
+            report=row[8],
+            report_updated_at=row[9],
+            created_at=row[10],
+            seen_urls=seen
+        )
+
+    def create(self, brand_name, competitors, interval_seconds):
+        now = time.time()
+        monitor_id = uuid.uuid4().hex
+        self._connect().execute(
+            f"INSERT INTO monitors ({self.COLUMNS}) VALUES (?, ?, ?, ?, ?, NULL, ?, NULL, NULL, NULL, ?)",
+            (monitor_id, brand_name, json.dumps(competitors), interval_seconds, now, MonitorStatus.NEW, now)
+        )
+        return self.get(monitor_id)
+
+    def get(self, monitor_id):
+        row = self._connect().execute(f"SELECT {self.COLUMNS} FROM monitors WHERE monitor_id = ?", (monitor_id,)).fetchone()
+        return self._to_monitor(row) if row else None
+
+    def list(self):
+        rows = self._connect().execute(f"SELECT {self.COLUMNS} FROM monitors ORDER BY created_at").fetchall()
+        return [self._to_monitor(row) for row in rows]
+
+    def due(self, now):
+        rows = self._connect().execute(
+            f"SELECT {self.COLUMNS} FROM monitors WHERE next_run_at <= ? ORDER BY next_run_at",
+            (now,)
+        ).fetchall()
+        return [self._to_monitor(row) for row in rows]
+
+    def delete(self, monitor_id):
+        conn = self._connect()
+        conn.execute("DELETE FROM monitor_seen_urls WHERE monitor_id = ?", (monitor_id,))
+        return conn.execute("DELETE FROM monitors WHERE monitor_id = ?", (monitor_id,)).rowcount > 0
+
+    def schedule(self, monitor_id, next_run_at):
+        self._connect().execute("UPDATE monitors SET next_run_at = ? WHERE monitor_id = ?", (next_run_at, monitor_id))
+
+    def record_run(self, monitor_id, status, error=None, report=None):
+        now = time.time()
+        conn = self._connect()
+        conn.execute(
+            "UPDATE monitors SET last_run_at = ?, last_status = ?, last_error = ? WHERE monitor_id = ?",
+            (now, status, error, monitor_id)
+        )
+        if report is not None:
+            conn.execute(
+                "UPDATE monitors SET report = ?, report_updated_at = ? WHERE monitor_id = ?",
+                (report, now, monitor_id)
+            )
+
+    def seen_urls(self, monitor_id):
+        rows = self._connect().execute("SELECT url FROM monitor_seen_urls WHERE monitor_id = ?", (monitor_id,)).fetchall()
+        return {row[0] for row in rows}
+
+    def add_seen(self, monitor_id, articles):
+        now = time.time()
+        self._connect().executemany(
+            "INSERT OR IGNORE INTO monitor_seen_urls (monitor_id, url, entity, first_seen_at) VALUES (?, ?, ?, ?)",
+            [(monitor_id, resolve_url(article.url), article.brand, now) for article in articles if article.url]
+        )
+
+
+class BrandMonitor:
+    """
+    Checks due monitors on a background thread. Each tick runs one batched
+    search for the brand and its competitors; the crew only runs when new
+    URLs show up. The first run produces a full report, later runs scrape
+    just the new articles and update the stored report.
+
+    submit_full(monitor) and submit_update(monitor, articles) queue the crew
+    runs and return a Job.
+    """
+    def __init__(self, store, submit_full, submit_update, search_tool=None, browser_tool=None,
+                 poll_seconds=30, results_per_entity=5, scrape_workers=4):
+        self.store = store
+        self.submit_full = submit_full
+        self.submit_update = submit_update
+        self.search_tool = search_tool or create_tool("search")
+        self.browser_tool = browser_tool or create_tool("browser")
+        self.poll_seconds = poll_seconds
+        self.results_per_entity = results_per_entity
+        self.scrape_workers = scrape_workers
+        self._jobs = {}
+        self._ticking = set()
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name="brand-monitor", daemon=True)
+            self._thread.start()
+            logger.info(f"Brand monitor started, polling every {self.poll_seconds}s")
+
+    def stop(self):
+        self._stop_event.set()
+
+    def _loop(self):
+        while not self._stop_event.is_set():
+            # A failing store must not end the scheduler thread
+            try:
+                for monitor in self.store.due(time.time()):
+                    try:
+                        self.tick(monitor)
+                    except Exception as e:
+                        logger.exception(f"Monitor {monitor.monitor_id} tick failed: {str(e)}")
+                        self.store.record_run(monitor.monitor_id, MonitorStatus.ERROR, error=str(e))
+            except Exception as e:
+                logger.exception(f"Monitor scheduler pass failed: {str(e)}")
+            self._stop_event.wait(self.poll_seconds)
+
+    def current_job(self, monitor_id):
+        with self._lock:
+            return self._jobs.get(monitor_id)
+
+    def find_new_articles(self, monitor):
+        """
+        Searches every entity of the monitor in one request and returns the
+        results whose canonical URLs the monitor has not seen yet.
+        """
+        queries = [f"{name} latest news" for name in monitor.entities]
+        with request_priority(PRIORITY_BACKGROUND):
+            results = self.search_tool._search_many(queries)
+        if results is None:
+            raise RuntimeError("Monitoring search request failed")
+
+        seen = self.store.seen_urls(monitor.monitor_id)
+        articles = {}
+        for name, data in zip(monitor.entities, results):
+            for item in data.get("organic", [])[:self.results_per_entity]:
+                key = resolve_url(item["link"]) if item.get("link") else None
+                if key and key not in seen and key not in articles:
+                    articles[key] = Article(
+                        brand=name,
+                        title=item.get("title", "N/A"),
+                        url=item["link"],
+                        source=item.get("source"),
+                        published_at=item.get("date"),
+                        summary=item.get("snippet", "N/A")
+                    )
+        return list(articles.values())
+
+    def scrape_articles(self, articles):
+        """
+        Replaces each article's search snippet with a summary of the page.
+        """
+        def scrape(article):
+            summary = self.browser_tool._run(article.url)
+            if summary.startswith("Error"):
+                return article
+            return article.model_copy(update={"summary": summary})
+
+        with ThreadPoolExecutor(max_workers=self.scrape_workers, thread_name_prefix="monitor-scrape") as executor:
+            # Scrape in copies of the caller's context so its background priority applies
+            futures = [executor.submit(contextvars.copy_context().run, scrape, article) for article in articles]
+            return [future.result() for future in futures]
+
+    def tick(self, monitor):
+        """
+        Runs one check of a monitor, queuing a crew run when it found new URLs.
+        Returns the queued Job, or None. A scheduled and a manual check of the
+        same monitor never overlap.
+        """
+        self.store.schedule(monitor.monitor_id, time.time() + monitor.interval_seconds)
+        with self._lock:
+            running = self._jobs.get(monitor.monitor_id)
+            if monitor.monitor_id in self._ticking or (running is not None and not running.is_finished()):
+                logger.info(f"Monitor {monitor.monitor_id}: previous run still in progress, skipping tick")
+                return None
+            self._ticking.add(monitor.monitor_id)
+
+        try:
+            articles = self.find_new_articles(monitor)
+            if monitor.report is not None and not articles:
+                logger.info(f"Monitor {monitor.monitor_id}: no new articles for {monitor.brand_name}")
+                self.store.record_run(monitor.monitor_id, MonitorStatus.NO_CHANGES)
+                return None
+
+            self.store.record_run(monitor.monitor_id, MonitorStatus.UPDATING)
+            if monitor.report is None:
+                logger.info(f"Monitor {monitor.monitor_id}: building the first report for {monitor.brand_name}")
+                job = self.submit_full(monitor)
+            else:
+                logger.info(f"Monitor {monitor.monitor_id}: updating the report with {len(articles)} new articles")
+                job = self.submit_update(monitor, articles)
+
+            with self._lock:
+                self._jobs[monitor.monitor_id] = job
+        finally:
+            with self._lock:
+                self._ticking.discard(monitor.monitor_id)
+
+        job.future.add_done_callback(lambda future: self._finish(monitor, articles, future))
+        return job
+
+    def _finish(self, monitor, articles, future):
+        # URLs are marked seen only once the report includes them, so a
+        # failed run retries them on the next tick
+        if future.cancelled():
+            self.store.record_run(monitor.monitor_id, MonitorStatus.ERROR, error="Run was cancelled")
+            return
+        error = future.exception()
+        if error is not None:
+            self.store.record_run(monitor.monitor_id, MonitorStatus.ERROR, error=getattr(error, "detail", None) or str(error))
+            return
+        self.store.add_seen(monitor.monitor_id, articles)
+        self.store.record_run(monitor.monitor_id, MonitorStatus.UPDATED, report=future.result())
+
+
+_monitor_store = None
+_monitor_store_lock = threading.Lock()
+
+
+def get_monitor_store():
+    """
+    Returns the shared monitor store.
+    """
+    global _monitor_store
+    with _monitor_store_lock:
+        if _monitor_store is None:
+            _monitor_store = MonitorStore(os.getenv("MONITOR_STORE_PATH", os.path.join(DEFAULT_CACHE_DIR, "monitors.sqlite")))
+        return _monitor_store
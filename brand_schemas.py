@@ -0,0 +1,67 @@
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+
+# Structured outputs of the crew tasks. Downstream tasks receive these as
+# compact JSON instead of the full text of the upstream answers.
+
+class Article(BaseModel):
+    brand: str
+    title: str
+    url: Optional[str] = None
+    source: Optional[str] = None
+    published_at: Optional[str] = Field(None, description="Publication date, e.g. 2025-07-03 or '2 days ago'")
+    summary: str = Field(..., description="At most two sentences on what the article says about the brand")
+
+
+class SearchResults(BaseModel):
+    articles: List[Article]
+
+
+class SentimentRow(BaseModel):
+    brand: str
+    positive: int
+    neutral: int
+    negative: int
+    avg_sentiment_score: float = Field(..., ge=-1, le=1, description="From -1 (negative) to +1 (positive)")
+
+
+class SentimentResults(BaseModel):
+    rows: List[SentimentRow]
+
+
+class FinanceRow(BaseModel):
+    ticker: str
+    company: Optional[str] = None
+    current_price: Optional[float] = None
+    change_7d: Optional[float] = Field(None, description="7-day price change in %")
+    return_30d: Optional[float] = Field(None, description="30-day return in %")
+    volatility: Optional[str] = Field(None, description="Low, Moderate or High")
+    max_drawdown: Optional[float] = Field(None, description="Max drawdown in %")
+    beta: Optional[float] = None
+    notes: Optional[str] = Field(None, description="Investor-impacting news or anomalies, one sentence")
+
+
+class FinanceResults(BaseModel):
+    rows: List[FinanceRow]
+
+
+class ComparisonRow(BaseModel):
+    brand: str
+    mentions: int
+    sentiment_score: Optional[float] = None
+    change_7d: Optional[float] = Field(None, description="7-day price change in %")
+    verdict: str = Field(..., description="Short verdict, e.g. 'Best performance', 'Moderate' or 'Weak'")
+
+
+class ComparisonResults(BaseModel):
+    rows: List[ComparisonRow]
+    leader: str = Field(..., description="Brand that leads overall")
+    summary: List[str] = Field(..., description="Two or three short bullets explaining the ranking")
+
+
+def compact_json(model):
+    """
+    Serializes a task output model without whitespace or empty fields.
+    """
+    return model.model_dump_json(exclude_none=True)
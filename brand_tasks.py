@@ -1,8 +1,26 @@
 from crewai import Task
+from brand_schemas import SearchResults, SentimentResults, FinanceResults, ComparisonResults, compact_json
 
 
 class BrandTask():
 
+    # Upstream tasks whose output each task reads as context. Tasks without a
+    # path between them (e.g. search and finance) run concurrently.
+    DEPENDENCIES = {
+        "search_task": [],
+        "sentiment_task": ["search_task"],
+        "finance_task": [],
+        "comparison_task": ["search_task", "sentiment_task", "finance_task"],
+        "report_task": ["sentiment_task", "finance_task", "comparison_task"]
+    }
+
+    # Incremental update of an existing report from newly found articles
+    UPDATE_DEPENDENCIES = {
+        "search_task": [],
+        "sentiment_task": ["search_task"],
+        "report_update_task": ["search_task", "sentiment_task"]
+    }
+
     def __validate_inputs(self, brand_name, competitors):
         if not brand_name or not competitors:
             raise ValueError("Brand name and competitor list must be provided")
@@ -17,48 +35,56 @@ class BrandTask():
             Use search engines and APIs to:
             - Fetch 1 latest high-quality news or blog entries per brand.
             - Prioritize reputable, timely, and relevant sources.
-            - Summarize each source clearly for use by downstream agents.
+            - Summarize each source in at most two sentences for use by downstream agents.
             """,
                         expected_output="""
-            [
             {
+            "articles": [
+                {
                 "brand": "Nike",
                 "title": "Nike launches eco-friendly shoes",
                 "url": "https://...",
                 "source": "CNN",
-                "publishedAt": "2025-07-03",
+                "published_at": "2025-07-03",
                 "summary": "Nike introduced a new line of sustainable footwear..."
-            },
-            ...
+                },
+                ...
             ]
+            }
             """,
+                        output_pydantic=SearchResults,
                         agent=agent
                     )
     
 
-    def sentiment_task(self, agent):
+    def sentiment_task(self, agent, articles=None):
+        # articles, when given, are embedded in the task instead of read from context
+        inline_articles = f"\nArticles:\n{compact_json(SearchResults(articles=articles))}\n" if articles else ""
         return Task(
-            description="""
+            description=f"""
 You are the Sentiment Analyst Agent.
 
-Your input is a collection of article summaries about brands. For each brand:
+Your input is a JSON object with article summaries about brands. For each brand:
 - Count articles with positive, neutral, and negative tone.
 - Assign a sentiment score from -1 (negative) to +1 (positive).
 
 Highlight subtle emotional cues and ignore sarcastic/misleading signals.
-""",
+{inline_articles}""",
             expected_output="""
-[
-  {
-    "brand": "Nike",
-    "positive": 6,
-    "neutral": 2,
-    "negative": 2,
-    "avg_sentiment_score": 0.60
-  },
-  ...
-]
+{
+  "rows": [
+    {
+      "brand": "Nike",
+      "positive": 6,
+      "neutral": 2,
+      "negative": 2,
+      "avg_sentiment_score": 0.60
+    },
+    ...
+  ]
+}
 """,
+            output_pydantic=SentimentResults,
             agent=agent
         )
 
@@ -70,22 +96,32 @@ Highlight subtle emotional cues and ignore sarcastic/misleading signals.
 
         Analyze financial performance for **{brand_name}** and its competitors ({', '.join([c['ticker'] for c in competitors])}) using YFinance API.
 
+        Look up all tickers in a single tool call by passing them comma-separated, in the order listed.
+        Use the returned Comparative Metrics table for returns, volatility, drawdown and beta instead of computing them yourself.
+        Beta is measured against the first ticker of the table.
+
         For each brand:
-        - Retrieve current price, 7-day trend (%), and volatility.
+        - Retrieve current price, 7-day trend (%), 30-day return (%), volatility, max drawdown (%) and beta.
         - Identify any investor-impacting news or anomalies.
         """,
                     expected_output="""
-        [
         {
+        "rows": [
+            {
             "ticker": "NKE",
             "company": "Nike",
             "current_price": 98.40,
             "change_7d": 1.25,
-            "volatility": "Moderate"
-        },
-        ...
+            "return_30d": 3.10,
+            "volatility": "Moderate",
+            "max_drawdown": -8.20,
+            "beta": 1.0
+            },
+            ...
         ]
+        }
         """,
+                    output_pydantic=FinanceResults,
                     agent=agent
                 )
 
@@ -97,7 +133,7 @@ Highlight subtle emotional cues and ignore sarcastic/misleading signals.
 
         Compare the overall brand performance of **{brand_name}** with competitors: {', '.join([c['name'] for c in competitors])}.
 
-        Use:
+        Use the JSON results of the earlier tasks:
         - Sentiment analysis results
         - Search visibility / article count
         - Financial change % over 7 days
@@ -105,15 +141,17 @@ Highlight subtle emotional cues and ignore sarcastic/misleading signals.
         Generate a side-by-side comparison and declare which brand leads overall and why.
         """,
                     expected_output="""
-        | Brand   | Mentions | Sentiment Score | 7-Day Trend (%) | Verdict |
-        |---------|----------|-----------------|------------------|---------|
-        | Nike    | 12       | 0.60            | +1.25%           | 🟢 Best performance |
-        | Adidas  | 8        | 0.45            | +0.75%           | 🟡 Moderate |
-        | Puma    | 4        | -0.10           | -0.80%           | 🔴 Weak |
-
-        Summary:
-        - Nike is ahead in sentiment, visibility, and financial strength.
+        {
+        "rows": [
+            {"brand": "Nike", "mentions": 12, "sentiment_score": 0.60, "change_7d": 1.25, "verdict": "Best performance"},
+            {"brand": "Adidas", "mentions": 8, "sentiment_score": 0.45, "change_7d": 0.75, "verdict": "Moderate"},
+            {"brand": "Puma", "mentions": 4, "sentiment_score": -0.10, "change_7d": -0.80, "verdict": "Weak"}
+        ],
+        "leader": "Nike",
+        "summary": ["Nike is ahead in sentiment, visibility, and financial strength."]
+        }
         """,
+                    output_pydantic=ComparisonResults,
                     agent=agent
                 )
 
@@ -122,7 +160,7 @@ Highlight subtle emotional cues and ignore sarcastic/misleading signals.
             description=f"""
         You are the Executive Reporting Specialist.
 
-        Consolidate outputs from all other agents and prepare a final report for **{brand_name}**.
+        Consolidate the JSON outputs from all other agents and prepare a final report for **{brand_name}**.
 
         The report should:
         - Summarize sentiment trends
@@ -164,3 +202,25 @@ Highlight subtle emotional cues and ignore sarcastic/misleading signals.
                     agent=agent
                 )
 
+    def report_update_task(self, agent, brand_name, previous_report):
+        return Task(
+            description=f"""
+        You are the Executive Reporting Specialist.
+
+        Below is the current brand monitoring report for **{brand_name}**. New articles have been published since it was written;
+        they and their sentiment are given as JSON in the context.
+
+        Current report:
+        {previous_report}
+
+        Update the report with the new articles:
+        - Revise the sentiment overview and scores to account for the new coverage
+        - Add new insights and adjust recommendations only where the new articles change them
+        - Keep sections the new articles do not affect unchanged
+        """,
+                    expected_output=f"""
+        The full updated report in **valid GitHub-flavored Markdown**, with the same 5 sections and headings as the current report,
+        starting with "# 📊 Brand Monitoring Report: {brand_name}".
+        """,
+                    agent=agent
+                )
@@ -0,0 +1,359 @@
+import os
+import sys
+import queue
+import logging
+import importlib
+import threading
+import multiprocessing
+from fastapi import HTTPException
+from brand_crew import BrandCrew
+from brand_jobs import JobCancelled
+from tools.instrumentation import RequestTimings, collect_timings, current_timings
+from tools.rate_governor import request_priority, current_priority, get_rate_governor
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# Imported by every worker before it reports ready, so no crew pays for them
+PRELOAD_MODULES = (
+    "crewai",
+    "pandas",
+    "yfinance",
+    "unstructured.partition.html",
+    "tools.search_tools",
+    "tools.browser_tools",
+    "tools.finance_tools",
+    "agent_pool"
+)
+
+
+def _rss_bytes():
+    # Current resident set size; peak RSS where /proc is not available
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _worker_main(conn, cancel_event, rate_share):
+    """
+    Entry point of a crew worker process. Preloads the heavy imports and a
+    warm agent set, then runs one crew request at a time, sending each step
+    output back as soon as it is produced.
+    """
+    os.environ["RATE_GOVERNOR_SHARE"] = str(rate_share)
+    get_rate_governor().set_share(rate_share)
+    for module in PRELOAD_MODULES:
+        try:
+            importlib.import_module(module)
+        except ImportError as e:
+            logger.warning(f"Crew worker could not preload {module}: {str(e)}")
+
+    from agent_pool import AgentPool
+    from tools.browser_tools import warm_summarizer_pool
+    agent_pool = AgentPool(size=1)
+    agent_pool.warm()
+    warm_summarizer_pool()
+    conn.send(("ready", _rss_bytes()))
+
+    while True:
+        request = conn.recv()
+        if request is None:
+            break
+
+        def step_callback(step_name, output):
+            conn.send(("step", step_name, getattr(output, "raw", output)))
+            if cancel_event.is_set():
+                raise JobCancelled(f"Crew for {request['brand_name']} was cancelled")
+
+        timings = RequestTimings()
+        try:
+            with collect_timings(timings), request_priority(request["priority"]):
+                brand_crew = BrandCrew(
+                    request["brand_name"],
+                    request["competitors"],
+                    step_callback=step_callback,
+                    prefetched=request["prefetched"],
+                    agent_pool=agent_pool
+                )
+                if request["previous_report"] is None:
+                    report = brand_crew.run()
+                else:
+                    report = brand_crew.run_update(request["previous_report"])
+            conn.send(("done", report, timings.to_dict(), _rss_bytes()))
+        except JobCancelled as e:
+            conn.send(("cancelled", str(e), timings.to_dict(), _rss_bytes()))
+        except Exception as e:
+            conn.send(("error", getattr(e, "detail", None) or str(e), timings.to_dict(), _rss_bytes()))
+
+
+class CrewWorker:
+    """
+    Handle on one crew worker process. The process starts right away; the
+    ready handshake is awaited on first use.
+    """
+    def __init__(self, context, rate_share):
+        self.conn, child_conn = context.Pipe()
+        self.cancel_event = context.Event()
+        self.process = context.Process(
+            target=_worker_main,
+            args=(child_conn, self.cancel_event, rate_share),
+            name="crew-worker",
+            daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.ready = False
+        self.broken = False
+        self.jobs_run = 0
+        self.rss_bytes = 0
+
+    @property
+    def pid(self):
+        return self.process.pid
+
+    def wait_ready(self, timeout):
+        if self.ready:
+            return
+        try:
+            if not self.conn.poll(timeout):
+                raise RuntimeError(f"Crew worker {self.pid} did not start within {timeout}s")
+            _, self.rss_bytes = self.conn.recv()
+        except (EOFError, OSError):
+            self.broken = True
+            raise RuntimeError(f"Crew worker {self.pid} exited during startup (exit code {self.process.exitcode})")
+        except RuntimeError:
+            self.broken = True
+            raise
+        self.ready = True
+        logger.info(f"Crew worker {self.pid} ready ({self.rss_bytes / 1024 / 1024:.0f} MB)")
+
+    def run(self, request, step_callback=None):
+        """
+        Sends one crew request and relays its step outputs to step_callback
+        until the worker reports the result. Returns (kind, payload, timings).
+        """
+        self.cancel_event.clear()
+        cancelled = None
+        try:
+            self.conn.send(request)
+            while True:
+                message = self.conn.recv()
+                if message[0] != "step":
+                    break
+                if step_callback is not None and cancelled is None:
+                    try:
+                        step_callback(message[1], message[2])
+                    except JobCancelled as e:
+                        # The worker stops at its next step boundary
+                        cancelled = e
+                        self.cancel_event.set()
+        except (EOFError, OSError):
+            self.broken = True
+            self.process.join(1)
+            raise RuntimeError(f"Crew worker {self.pid} exited unexpectedly (exit code {self.process.exitcode})")
+
+        kind, payload, timings, self.rss_bytes = message
+        self.jobs_run += 1
+        if cancelled is not None:
+            raise cancelled
+        return kind, payload, timings
+
+    def stop(self, timeout=5):
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(timeout)
+        self.conn.close()
+
+
+class ThreadCrewBackend:
+    """
+    Runs crews on the calling thread with agents from the API process's pool.
+    """
+    def __init__(self, agent_pool, max_concurrency):
+        self.agent_pool = agent_pool
+        self.max_concurrency = max_concurrency
+
+    def warm(self):
+        self.agent_pool.warm()
+
+    def run(self, brand_name, competitors, step_callback=None, prefetched=None, previous_report=None):
+        """
+        Runs a full analysis, or an update of previous_report when one is
+        given, and returns the report.
+        """
+        brand_crew = BrandCrew(
+            brand_name,
+            competitors,
+            step_callback=step_callback,
+            prefetched=prefetched,
+            agent_pool=self.agent_pool
+        )
+        if previous_report is None:
+            return brand_crew.run()
+        return brand_crew.run_update(previous_report)
+
+    def stats(self):
+        return {"backend": "thread", "max_concurrency": self.max_concurrency, "agent_sets": self.agent_pool.size()}
+
+    def shutdown(self):
+        pass
+
+
+class ProcessCrewBackend:
+    """
+    Runs each crew in a pool of worker processes so crews use every core
+    instead of sharing the API process's GIL. Workers preload imports and a
+    warm agent set, stream step outputs back to the calling thread, and are
+    replaced once their memory exceeds memory_limit_mb or they die.
+
+    The workers and the API process, which still calls providers for
+    monitors and batch prefetches, each take an equal share of the provider
+    rate limits.
+    """
+    def __init__(self, processes, memory_limit_mb=2048, start_timeout=300):
+        self.processes = processes
+        self.max_concurrency = processes
+        self.memory_limit_bytes = memory_limit_mb * 1024 * 1024
+        self.start_timeout = start_timeout
+        self.recycled = 0
+        self.rate_share = float(os.getenv("RATE_GOVERNOR_SHARE", "1")) / (processes + 1)
+        get_rate_governor().set_share(self.rate_share)
+        self._context = multiprocessing.get_context("spawn")
+        self._idle = queue.Queue()
+        self._workers = set()
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _spawn(self):
+        worker = CrewWorker(self._context, rate_share=self.rate_share)
+        with self._lock:
+            self._workers.add(worker)
+        return worker
+
+    def warm(self):
+        """
+        Starts every worker and waits until all of them are ready.
+        """
+        with self._lock:
+            missing = self.processes - len(self._workers)
+        workers = [self._spawn() for _ in range(missing)]
+        for worker in workers:
+            try:
+                worker.wait_ready(self.start_timeout)
+            except RuntimeError as e:
+                logger.error(str(e))
+                self._retire(worker)
+                continue
+            self._idle.put(worker)
+        logger.info(f"Crew process pool ready with {self._idle.qsize()} workers")
+
+    def _acquire(self):
+        try:
+            worker = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                spare = len(self._workers) < self.processes
+            worker = self._spawn() if spare else self._idle.get()
+        try:
+            worker.wait_ready(self.start_timeout)
+        except RuntimeError:
+            self._retire(worker)
+            raise
+        return worker
+
+    def _release(self, worker):
+        if self._closed:
+            self._retire(worker)
+        elif worker.broken or worker.rss_bytes > self.memory_limit_bytes:
+            logger.info(
+                f"Recycling crew worker {worker.pid} after {worker.jobs_run} crews "
+                f"({'exited' if worker.broken else f'{worker.rss_bytes / 1024 / 1024:.0f} MB'})"
+            )
+            self.recycled += 1
+            self._retire(worker)
+            # The replacement preloads in the background and is awaited on first use
+            self._idle.put(self._spawn())
+        else:
+            self._idle.put(worker)
+
+    def _retire(self, worker):
+        with self._lock:
+            self._workers.discard(worker)
+        worker.stop()
+
+    def run(self, brand_name, competitors, step_callback=None, prefetched=None, previous_report=None):
+        """
+        Runs a full analysis, or an update of previous_report when one is
+        given, on a worker process and returns the report. The request
+        priority and timing breakdown cross the process boundary with it.
+        """
+        request = {
+            "brand_name": brand_name,
+            "competitors": competitors,
+            "prefetched": prefetched or {},
+            "previous_report": previous_report,
+            "priority": current_priority()
+        }
+        worker = self._acquire()
+        try:
+            kind, payload, timings = worker.run(request, step_callback)
+        finally:
+            self._release(worker)
+
+        if current_timings() is not None:
+            current_timings().merge(timings)
+        if kind == "cancelled":
+            raise JobCancelled(payload)
+        if kind == "error":
+            raise HTTPException(status_code=500, detail=payload)
+        return payload
+
+    def stats(self):
+        with self._lock:
+            workers = list(self._workers)
+        return {
+            "backend": "process",
+            "max_concurrency": self.max_concurrency,
+            "rate_share": round(self.rate_share, 4),
+            "memory_limit_mb": self.memory_limit_bytes // (1024 * 1024),
+            "recycled": self.recycled,
+            "workers": [
+                {
+                    "pid": worker.pid,
+                    "ready": worker.ready,
+                    "jobs_run": worker.jobs_run,
+                    "rss_mb": round(worker.rss_bytes / 1024 / 1024, 1)
+                }
+                for worker in workers
+            ]
+        }
+
+    def shutdown(self):
+        self._closed = True
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._retire(worker)
+
+
+def create_crew_backend(name, agent_pool, max_concurrency, processes=None, memory_limit_mb=2048):
+    """
+    Returns the crew backend for CREW_BACKEND: "thread" (default) or "process".
+    """
+    if name == "thread":
+        return ThreadCrewBackend(agent_pool, max_concurrency)
+    if name == "process":
+        return ProcessCrewBackend(processes or min(os.cpu_count() or 1, max_concurrency), memory_limit_mb=memory_limit_mb)
+    raise ValueError(f"Unknown crew backend: {name}")
@@ -0,0 +1,162 @@
+import logging
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from crewai import Crew
+from crewai.tasks.task_output import TaskOutput
+from tools.instrumentation import timed, track_agent_tokens
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+class TaskNode:
+    """
+    A crew task together with the agent that runs it and the names of the
+    tasks whose output it reads.
+
+    runner, when given, replaces the crew run: runner(inputs, run_task) gets
+    the raw outputs of the dependencies by name and returns the raw output
+    of the node. run_task(task=None) runs a task (default the node's own) on
+    the node's agent and returns its TaskOutput, so a runner can still hand
+    part of the work to the agent.
+    """
+    def __init__(self, name, task, agent, depends_on=None, runner=None):
+        self.name = name
+        self.task = task
+        self.agent = agent
+        self.depends_on = list(depends_on or [])
+        self.runner = runner
+
+
+class TaskGraph:
+    """
+    Runs crew tasks as a dependency graph. Every task starts as soon as the
+    tasks it depends on have finished, so independent branches run concurrently.
+
+    format_output, when given, turns a task's structured (pydantic) output
+    into the raw text its downstream tasks read as context.
+    """
+    def __init__(self, nodes, agents=None, format_output=None):
+        self.nodes = {node.name: node for node in nodes}
+        self.agents = agents or [node.agent for node in nodes]
+        self.format_output = format_output
+        self.order = self._topological_order()
+
+    def _topological_order(self):
+        # Validate the declared dependencies and reject cycles
+        for node in self.nodes.values():
+            for dep in node.depends_on:
+                if dep not in self.nodes:
+                    raise ValueError(f"Task '{node.name}' depends on unknown task '{dep}'")
+
+        order, visiting, visited = [], set(), set()
+
+        def visit(name):
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f"Dependency cycle detected at task '{name}'")
+            visiting.add(name)
+            for dep in self.nodes[name].depends_on:
+                visit(dep)
+            visiting.discard(name)
+            visited.add(name)
+            order.append(name)
+
+        for name in self.nodes:
+            visit(name)
+        return order
+
+    def _kickoff(self, node, task):
+        # Delegating agents need their coworkers in the crew; they only run
+        # after the independent branches have joined, so sharing is safe.
+        crew_agents = self.agents if node.agent.allow_delegation else [node.agent]
+        crew = Crew(
+            agents=crew_agents,
+            tasks=[task],
+            verbose=True
+        )
+        with track_agent_tokens(*crew_agents):
+            crew.kickoff()
+
+        # Downstream tasks read output.raw as context; hand them the validated
+        # structured output instead of the full answer text
+        output = task.output
+        if output.pydantic is not None and self.format_output is not None:
+            output.raw = self.format_output(output.pydantic)
+        return output
+
+    def _execute_node(self, node):
+        """
+        Runs a single task in its own crew, with the outputs of its
+        dependencies passed in as context, or through the node's runner.
+        """
+        logger.info(f"Starting task: {node.name}")
+        if node.depends_on:
+            node.task.context = [self.nodes[dep].task for dep in node.depends_on]
+
+        with timed("task", node.name):
+            if node.runner is None:
+                output = self._kickoff(node, node.task)
+            else:
+                inputs = {dep: self.nodes[dep].task.output.raw for dep in node.depends_on}
+                raw = node.runner(inputs, lambda task=None: self._kickoff(node, task or node.task))
+                output = self._preset_output(node, raw)
+        logger.info(f"Finished task: {node.name}")
+        return output
+
+    def _preset_output(self, node, raw):
+        # Attach precomputed output so downstream tasks read it as context
+        node.task.output = TaskOutput(
+            description=node.task.description,
+            raw=raw,
+            agent=node.agent.role
+        )
+        return node.task.output
+
+    def run(self, task_callback=None, max_workers=None, completed=None):
+        """
+        Executes the graph and returns a dict of task name to TaskOutput.
+        task_callback(name, output) is called as each task completes.
+        completed maps task names to raw outputs computed elsewhere; those
+        tasks are not run.
+        """
+        outputs = {}
+        pending = {name: set(self.nodes[name].depends_on) for name in self.order}
+        running = {}
+
+        for name, raw in (completed or {}).items():
+            outputs[name] = self._preset_output(self.nodes[name], raw)
+            del pending[name]
+            for deps in pending.values():
+                deps.discard(name)
+            if task_callback:
+                task_callback(name, outputs[name])
+
+        executor = ThreadPoolExecutor(max_workers=max_workers or max(1, len(pending)), thread_name_prefix="crew-task")
+
+        def schedule_ready():
+            for name in [n for n, deps in pending.items() if not deps]:
+                del pending[name]
+                # Tasks run in a copy of the caller's context so request timings follow them
+                running[executor.submit(contextvars.copy_context().run, self._execute_node, self.nodes[name])] = name
+
+        try:
+            schedule_ready()
+            while running:
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    outputs[name] = future.result()
+                    if task_callback:
+                        task_callback(name, outputs[name])
+                    for deps in pending.values():
+                        deps.discard(name)
+                schedule_ready()
+        finally:
+            # On failure, drop queued tasks but wait for running ones: they use
+            # the caller's agents, which must be idle before they are released
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        return outputs
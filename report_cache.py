@@ -0,0 +1,89 @@
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+class CachedReport:
+    """
+    A report served from the cache together with its age.
+    """
+    def __init__(self, report, age_seconds, is_stale):
+        self.report = report
+        self.age_seconds = age_seconds
+        self.is_stale = is_stale
+
+
+class ReportCache:
+    """
+    In-memory LRU cache of finished brand reports.
+
+    Entries younger than ttl_seconds are fresh. Older entries are still served
+    for another stale_ttl_seconds while a single background refresh runs.
+    """
+    def __init__(self, ttl_seconds=3600, stale_ttl_seconds=86400, max_entries=256):
+        self.ttl_seconds = ttl_seconds
+        self.stale_ttl_seconds = stale_ttl_seconds
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(brand_name, competitors):
+        """
+        Builds a cache key that ignores case, extra whitespace and competitor order.
+        """
+        def normalize(value):
+            return " ".join(str(value).split()).casefold()
+
+        competitor_pairs = sorted({
+            (normalize(c["name"]), normalize(c["ticker"]).upper())
+            for c in competitors
+        })
+        return json.dumps([normalize(brand_name), competitor_pairs])
+
+    def get(self, key):
+        """
+        Returns a CachedReport, or None when the key is missing or fully expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            report, created_at = entry
+            age = time.time() - created_at
+            if age > self.ttl_seconds + self.stale_ttl_seconds:
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return CachedReport(report, age, age > self.ttl_seconds)
+
+    def set(self, key, report):
+        with self._lock:
+            self._entries[key] = (report, time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                logger.debug(f"Evicted cached report: {evicted}")
+
+    def begin_refresh(self, key):
+        """
+        Marks a key as being refreshed. Returns False if a refresh is already running.
+        """
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            return True
+
+    def end_refresh(self, key):
+        with self._lock:
+            self._refreshing.discard(key)
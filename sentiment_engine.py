@@ -0,0 +1,259 @@
+import os
+import re
+import math
+import logging
+from collections import OrderedDict
+from pydantic import ValidationError
+from brand_schemas import SearchResults, SentimentResults, SentimentRow, compact_json
+from tools.instrumentation import record_sentiment
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# Word valences from -3 (very negative) to +3 (very positive), weighted
+# towards the vocabulary of business and brand news
+LEXICON = {
+    # Positive
+    "good": 1.9, "great": 3.1, "excellent": 2.7, "strong": 2.0, "stronger": 2.1, "strongest": 2.4,
+    "positive": 2.2, "success": 2.7, "successful": 2.7, "win": 2.6, "wins": 2.6, "won": 2.5, "winning": 2.4,
+    "gain": 1.9, "gains": 1.9, "gained": 1.8, "growth": 1.9, "grow": 1.6, "grows": 1.6, "grew": 1.6,
+    "growing": 1.6, "rise": 1.4, "rises": 1.4, "rose": 1.4, "rising": 1.3, "surge": 2.0, "surges": 2.0,
+    "surged": 2.0, "soar": 2.4, "soars": 2.4, "soared": 2.4, "jump": 1.5, "jumps": 1.5, "jumped": 1.5,
+    "rally": 1.8, "rallies": 1.8, "rallied": 1.8, "boost": 1.8, "boosts": 1.8, "boosted": 1.8,
+    "profit": 1.6, "profits": 1.6, "profitable": 2.0, "beat": 1.5, "beats": 1.5, "outperform": 2.1,
+    "outperforms": 2.1, "outperformed": 2.1, "upgrade": 1.8, "upgraded": 1.8, "bullish": 2.2,
+    "innovative": 2.0, "innovation": 1.8, "launch": 0.8, "launches": 0.8, "launched": 0.8,
+    "popular": 1.8, "praise": 2.4, "praised": 2.4, "acclaimed": 2.5, "award": 2.0, "awarded": 2.0,
+    "leader": 1.4, "leading": 1.3, "lead": 1.0, "leads": 1.0, "best": 3.0, "better": 1.9, "improve": 1.9,
+    "improved": 2.0, "improves": 1.9, "improvement": 2.0, "recover": 1.5, "recovery": 1.5,
+    "recovered": 1.5, "expand": 1.3, "expands": 1.3, "expansion": 1.4, "partnership": 1.3,
+    "sustainable": 1.4, "eco-friendly": 1.6, "milestone": 1.8, "optimistic": 2.3, "confidence": 1.8,
+    "confident": 2.2, "love": 3.2, "loved": 2.9, "favorite": 2.0, "exciting": 2.2, "excited": 2.0,
+    "impressive": 2.5, "robust": 1.8, "solid": 1.5, "thrive": 2.4, "thriving": 2.4, "momentum": 1.3,
+    "opportunity": 1.6, "opportunities": 1.6, "benefit": 1.9, "benefits": 1.9, "upbeat": 2.1,
+    "breakthrough": 2.4, "demand": 0.8, "dividend": 1.0, "approval": 1.8, "approved": 1.8,
+    # Negative
+    "bad": -2.5, "poor": -2.1, "weak": -1.9, "weaker": -1.9, "weakest": -2.2, "negative": -2.3,
+    "fail": -2.5, "fails": -2.5, "failed": -2.3, "failure": -2.4, "loss": -1.9, "losses": -1.9,
+    "lose": -1.8, "loses": -1.8, "lost": -1.6, "decline": -1.6, "declines": -1.6, "declined": -1.6,
+    "declining": -1.6, "drop": -1.4, "drops": -1.4, "dropped": -1.4, "fall": -1.4, "falls": -1.4,
+    "fell": -1.4, "falling": -1.4, "slump": -2.0, "slumps": -2.0, "slumped": -2.0, "plunge": -2.3,
+    "plunges": -2.3, "plunged": -2.3, "tumble": -2.0, "tumbles": -2.0, "tumbled": -2.0, "crash": -2.7,
+    "crashed": -2.7, "miss": -1.4, "misses": -1.4, "missed": -1.5, "downgrade": -1.9, "downgraded": -1.9,
+    "bearish": -2.2, "layoff": -2.2, "layoffs": -2.3, "cuts": -1.2, "cut": -1.0, "lawsuit": -2.1,
+    "lawsuits": -2.1, "sued": -2.1, "sues": -1.9, "fined": -2.0, "penalty": -2.0,
+    "recall": -2.2, "recalls": -2.2, "recalled": -2.2, "scandal": -2.9, "controversy": -2.1,
+    "controversial": -1.8, "backlash": -2.3, "boycott": -2.4, "boycotts": -2.4, "criticism": -2.0,
+    "criticized": -2.1, "criticised": -2.1, "complaint": -1.8, "complaints": -1.8, "probe": -1.5,
+    "investigation": -1.4, "fraud": -3.0, "breach": -2.3, "hack": -2.0, "hacked": -2.2,
+    "outage": -2.0, "delay": -1.3, "delays": -1.3, "delayed": -1.4, "shortage": -1.7, "struggle": -2.0,
+    "struggles": -2.0, "struggling": -2.1, "concern": -1.4, "concerns": -1.4, "worry": -1.9,
+    "worries": -1.9, "fear": -2.2, "fears": -2.2, "risk": -1.1, "risks": -1.1, "uncertainty": -1.4,
+    "volatile": -1.3, "volatility": -1.0, "debt": -1.2, "bankruptcy": -3.0, "bankrupt": -3.0,
+    "warning": -1.6, "warns": -1.6, "warned": -1.6, "disappoint": -2.2, "disappointing": -2.2,
+    "disappointed": -2.1, "slowdown": -1.7, "slow": -1.0, "slows": -1.1, "slowed": -1.1,
+    "worse": -2.1, "worst": -3.1, "hate": -2.7, "angry": -2.3, "toxic": -2.5, "unsafe": -2.2,
+    "dispute": -1.7, "strike": -1.4, "halt": -1.3, "halted": -1.4, "pessimistic": -2.2, "headwinds": -1.5,
+    "exodus": -1.8, "resign": -1.3, "resigns": -1.3, "resigned": -1.3, "ousted": -2.0, "downturn": -1.9,
+    "sink": -1.8, "sinks": -1.8, "sank": -1.8, "slide": -1.4, "slides": -1.4, "slid": -1.4
+}
+
+# Two-word phrases scored as one term, ahead of their single words
+PHRASES = {
+    ("beat", "expectations"): 2.2, ("beats", "expectations"): 2.2, ("exceeded", "expectations"): 2.3,
+    ("missed", "expectations"): -2.2, ("misses", "expectations"): -2.2, ("below", "expectations"): -1.9,
+    ("above", "expectations"): 1.9, ("all-time", "high"): 2.2, ("record", "high"): 2.2,
+    ("record", "low"): -2.2, ("price", "cut"): -0.4, ("price", "cuts"): -0.4, ("class", "action"): -1.8,
+    ("data", "breach"): -2.6, ("short", "sellers"): -1.2
+}
+
+NEGATIONS = {
+    "not", "no", "never", "none", "nobody", "nothing", "neither", "nor", "without", "hardly",
+    "barely", "cannot", "lack", "lacks", "lacked"
+}
+
+# Multiplier adjustments for the next scored word
+BOOSTERS = {
+    "very": 0.3, "extremely": 0.4, "highly": 0.3, "significantly": 0.3, "sharply": 0.3, "strongly": 0.3,
+    "hugely": 0.4, "massive": 0.3, "major": 0.2, "record": 0.3, "deeply": 0.3, "particularly": 0.2,
+    "slightly": -0.3, "somewhat": -0.3, "marginally": -0.3, "modestly": -0.3, "mildly": -0.3, "partly": -0.2
+}
+
+# Score above which an article is positive, and below minus which it is negative
+NEUTRAL_BAND = 0.05
+
+# Normalization constant of the compound score
+ALPHA = 15
+
+_TOKEN = re.compile(r"[a-z][a-z'\-]*")
+
+
+class ArticleSentiment:
+    """
+    Lexicon score of one article: compound score in [-1, 1], label and a
+    confidence in [0, 1] that the label is right.
+    """
+    def __init__(self, article, score, label, confidence):
+        self.article = article
+        self.score = score
+        self.label = label
+        self.confidence = confidence
+
+
+class SentimentEngine:
+    """
+    Scores article summaries in-process with a sentiment lexicon that
+    handles phrases, negation, boosters and "but" clauses.
+
+    Confidence drops when an article mixes positive and negative terms or
+    carries little sentiment evidence; articles below min_confidence should
+    be left to the Sentiment Analyst agent.
+    """
+    def __init__(self, min_confidence=0.5, lexicon=None):
+        self.min_confidence = min_confidence
+        self.lexicon = lexicon or LEXICON
+
+    def _terms(self, tokens):
+        # Yields (index, valence) of every scored term
+        idx = 0
+        while idx < len(tokens):
+            pair = tuple(tokens[idx:idx + 2])
+            if pair in PHRASES:
+                yield idx, PHRASES[pair]
+                idx += 2
+                continue
+            if tokens[idx] in self.lexicon:
+                yield idx, self.lexicon[tokens[idx]]
+            idx += 1
+
+    def score_text(self, text):
+        """
+        Returns (compound score, confidence) for a piece of text.
+        """
+        tokens = [token.replace("n't", " not").strip("'-") for token in _TOKEN.findall(text.casefold())]
+        tokens = " ".join(tokens).split()
+
+        # Words after "but" carry the writer's conclusion
+        but_index = tokens.index("but") if "but" in tokens else None
+
+        positive = negative = 0.0
+        for idx, valence in self._terms(tokens):
+            window = tokens[max(0, idx - 3):idx]
+            valence *= 1 + sum(BOOSTERS.get(word, 0.0) for word in window[-2:])
+            if any(word in NEGATIONS for word in window):
+                valence *= -0.74
+            if but_index is not None:
+                valence *= 0.5 if idx < but_index else 1.5
+            if valence > 0:
+                positive += valence
+            elif valence < 0:
+                negative -= valence
+
+        if not positive and not negative:
+            # No lexicon evidence either way; the wording may still be clearly
+            # positive or negative ("faces grounding order"), so leave it to the agent
+            return 0.0, 0.0
+
+        total = positive - negative
+        compound = total / math.sqrt(total * total + ALPHA)
+        conflict = min(positive, negative) / max(positive, negative)
+        evidence = min(1.0, (positive + negative) / 2.0)
+        confidence = (1 - conflict) * evidence
+        if abs(compound) < NEUTRAL_BAND:
+            # A near-zero score from sentiment terms is a tie, not neutrality
+            confidence = min(confidence, 0.3)
+        return compound, round(confidence, 3)
+
+    def score_articles(self, articles):
+        """
+        Scores a batch of Article models. Returns (confident, ambiguous)
+        lists of ArticleSentiment.
+        """
+        confident, ambiguous = [], []
+        for article in articles:
+            score, confidence = self.score_text(f"{article.title}. {article.summary}")
+            if score > NEUTRAL_BAND:
+                label = "positive"
+            elif score < -NEUTRAL_BAND:
+                label = "negative"
+            else:
+                label = "neutral"
+            scored = ArticleSentiment(article, score, label, confidence)
+            (confident if confidence >= self.min_confidence else ambiguous).append(scored)
+        return confident, ambiguous
+
+    @staticmethod
+    def aggregate(scored, escalated=None):
+        """
+        Builds the sentiment_task output from scored articles, merged with
+        the agent's rows for escalated articles when given. Scores are
+        averaged over all of a brand's articles.
+        """
+        totals = OrderedDict()
+        for item in scored:
+            entry = totals.setdefault(item.article.brand, {"positive": 0, "neutral": 0, "negative": 0, "score": 0.0})
+            entry[item.label] += 1
+            entry["score"] += item.score
+        for row in (escalated.rows if escalated is not None else []):
+            entry = totals.setdefault(row.brand, {"positive": 0, "neutral": 0, "negative": 0, "score": 0.0})
+            entry["positive"] += row.positive
+            entry["neutral"] += row.neutral
+            entry["negative"] += row.negative
+            entry["score"] += row.avg_sentiment_score * (row.positive + row.neutral + row.negative)
+
+        rows = []
+        for brand, entry in totals.items():
+            count = entry["positive"] + entry["neutral"] + entry["negative"]
+            rows.append(SentimentRow(
+                brand=brand,
+                positive=entry["positive"],
+                neutral=entry["neutral"],
+                negative=entry["negative"],
+                avg_sentiment_score=round(max(-1.0, min(1.0, entry["score"] / count)), 2) if count else 0.0
+            ))
+        return SentimentResults(rows=rows)
+
+
+class SentimentRunner:
+    """
+    TaskGraph node runner for sentiment_task. Articles are scored locally;
+    only the ambiguous ones are sent to the Sentiment Analyst agent, as a
+    task built by escalation_task(articles). If the search output cannot be
+    parsed, the node's own task runs on the agent as before.
+    """
+    def __init__(self, engine, escalation_task):
+        self.engine = engine
+        self.escalation_task = escalation_task
+
+    def __call__(self, inputs, run_task):
+        try:
+            articles = SearchResults.model_validate_json(inputs["search_task"]).articles
+        except (KeyError, ValidationError) as e:
+            logger.warning(f"Search output is not structured, running sentiment on the agent: {str(e)}")
+            return run_task().raw
+
+        confident, ambiguous = self.engine.score_articles(articles)
+        record_sentiment(local=len(confident), escalated=len(ambiguous))
+        logger.info(f"Scored {len(confident)} articles locally, escalating {len(ambiguous)} to the agent")
+        if not ambiguous:
+            return compact_json(self.engine.aggregate(confident))
+
+        try:
+            output = run_task(self.escalation_task([item.article for item in ambiguous]))
+            escalated = output.pydantic or SentimentResults.model_validate_json(output.raw)
+        except Exception as e:
+            # Fall back to the local scores of the ambiguous articles
+            logger.warning(f"Sentiment escalation failed, using local scores: {str(e)}")
+            return compact_json(self.engine.aggregate(confident + ambiguous))
+        return compact_json(self.engine.aggregate(confident, escalated))
+
+
+def get_sentiment_engine():
+    """
+    Returns the local sentiment engine, or None when SENTIMENT_ENGINE is
+    "llm" and every article goes to the agent.
+    """
+    if os.getenv("SENTIMENT_ENGINE", "lexicon").lower() != "lexicon":
+        return None
+    return SentimentEngine(min_confidence=float(os.getenv("SENTIMENT_MIN_CONFIDENCE", "0.5")))
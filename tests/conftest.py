@@ -0,0 +1,9 @@
+import os
+import sys
+import tempfile
+
+# Make the top-level modules importable when pytest is run from any directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Keep the on-disk caches of a test run out of the working tree
+os.environ.setdefault("BRANDSCOPE_CACHE_DIR", tempfile.mkdtemp(prefix="brandscope-tests-"))
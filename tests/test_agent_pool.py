@@ -0,0 +1,29 @@
+import pytest
+import agent_pool
+from agent_pool import AgentPool
+
+
+@pytest.fixture
+def created(monkeypatch):
+    created = []
+
+    def fake_create_tool(name):
+        created.append(name)
+        return object()
+
+    monkeypatch.setattr(agent_pool, "create_tool", fake_create_tool)
+    monkeypatch.setattr(agent_pool, "create_llm", lambda: created.append("llm") or object())
+    return created
+
+
+def test_pool_creates_nothing_until_used(created):
+    AgentPool(size=4)
+
+    assert created == []
+
+
+def test_shared_tools_are_created_once_on_first_use(created):
+    pool = AgentPool(size=4)
+
+    assert pool.search_tool is pool.search_tool
+    assert created == ["search"]
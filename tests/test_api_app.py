@@ -0,0 +1,202 @@
+import json
+import asyncio
+import threading
+import pytest
+from brand_jobs import JobManager
+
+
+REQUEST = {"brand_name": "Nike", "competitors": [{"name": "Puma", "ticker": "PUMSY"}]}
+
+
+def test_import_builds_no_services():
+    import api_app
+
+    assert api_app.agent_pool is None
+    assert api_app.job_manager is None
+    assert api_app.brand_monitor is None
+
+
+@pytest.fixture
+def client(monkeypatch):
+    from fastapi.testclient import TestClient
+    import api_app
+
+    for name in ("GEMINI_API_KEY", "SERPER_API_KEY", "BROWSERLESS_API_KEY"):
+        monkeypatch.setenv(name, "test")
+    monkeypatch.setenv("MONITOR_ENABLED", "false")
+    monkeypatch.setenv("CREW_BACKEND", "thread")
+    monkeypatch.setenv("MAX_CONCURRENT_JOBS", "1")
+    api_app.get_settings.cache_clear()
+    # Restore the import-time state afterwards
+    for name in ("agent_pool", "crew_backend", "report_cache", "job_manager", "brand_monitor"):
+        monkeypatch.setattr(api_app, name, None)
+
+    with TestClient(api_app.app) as client:
+        yield client
+    api_app.get_settings.cache_clear()
+
+
+@pytest.fixture
+def blocking_jobs(client, monkeypatch):
+    """
+    Replaces the job runner with one that finishes its first step, then
+    blocks until released.
+    """
+    import api_app
+
+    release = threading.Event()
+
+    def runner(job):
+        job.step_completed("search_task", "articles")
+        release.wait(5)
+        job.step_completed("report_task", f"report for {job.brand_name}")
+        return f"report for {job.brand_name}"
+
+    monkeypatch.setattr(api_app, "job_manager", JobManager(runner, max_workers=1, total_steps=2))
+    yield api_app.job_manager, release
+    release.set()
+
+
+def test_services_are_created_on_startup(client):
+    import api_app
+
+    assert client.get("/").status_code == 200
+    assert api_app.job_manager is not None
+    assert api_app.crew_backend.max_concurrency == 1
+
+
+def test_cancel_without_subscriber_id_cancels_the_job(client, blocking_jobs):
+    manager, release = blocking_jobs
+    first = client.post("/api/v1/analyze-brand/jobs", json=REQUEST).json()
+    second = client.post("/api/v1/analyze-brand/jobs", json=REQUEST).json()
+    assert first["job_id"] == second["job_id"]
+
+    response = client.delete(f"/api/v1/analyze-brand/jobs/{first['job_id']}")
+    assert response.status_code == 200
+    assert response.json()["subscribers"] == 0
+    assert manager.get(first["job_id"]).cancel_requested
+
+
+def test_cancel_with_subscriber_id_only_detaches_that_caller(client, blocking_jobs):
+    manager, release = blocking_jobs
+    first = client.post("/api/v1/analyze-brand/jobs", json=REQUEST).json()
+    client.post("/api/v1/analyze-brand/jobs", json=REQUEST)
+
+    response = client.delete(f"/api/v1/analyze-brand/jobs/{first['job_id']}", params={"subscriber_id": first["subscriber_id"]})
+    assert response.json()["subscribers"] == 1
+    assert not manager.get(first["job_id"]).cancel_requested
+
+
+def test_default_process_count_is_capped_by_job_slots(monkeypatch):
+    import api_app
+
+    monkeypatch.delenv("CREW_PROCESSES", raising=False)
+    monkeypatch.setenv("MAX_CONCURRENT_JOBS", "2")
+    monkeypatch.setattr(api_app.os, "cpu_count", lambda: 64)
+
+    assert api_app.Settings().CREW_PROCESSES == 2
+
+
+def parse_events(body):
+    events = []
+    for block in body.strip().split("\n\n"):
+        # Comment lines are keep-alives
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if not line.startswith(":"))
+        if fields:
+            events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+async def stream_until_first_task(app, request):
+    """
+    Drives the stream endpoint over raw ASGI and disconnects as soon as the
+    first task event has been sent. Returns the streamed body.
+    """
+    body, disconnected, request_sent = [], asyncio.Event(), False
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": json.dumps(request).encode(), "more_body": False}
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            body.append(message.get("body", b"").decode())
+            if "event: task" in "".join(body):
+                disconnected.set()
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.3"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/api/v1/analyze-brand/stream",
+        "raw_path": b"/api/v1/analyze-brand/stream",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"testserver"), (b"content-type", b"application/json")],
+        "client": ("testclient", 50000),
+        "server": ("testserver", 80)
+    }
+    await asyncio.wait_for(app(scope, receive, send), timeout=5)
+    return "".join(body)
+
+
+def test_stream_sends_job_tasks_report_and_done(client, blocking_jobs):
+    manager, release = blocking_jobs
+    release.set()
+
+    response = client.post("/api/v1/analyze-brand/stream", json=REQUEST)
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = parse_events(response.text)
+    assert [event for event, _ in events] == ["job", "task", "task", "report", "done"]
+    assert events[0][1]["total_steps"] == 2
+    assert [(data["task"], data["completed_steps"]) for event, data in events if event == "task"] == [
+        ("search_task", 1), ("report_task", 2)
+    ]
+    assert events[3][1]["report"] == "report for Nike"
+    assert events[4][1] == {"status": "SUCCESS"}
+
+
+def test_stream_ends_with_an_error_event_when_the_job_fails(client, monkeypatch):
+    import api_app
+
+    def runner(job):
+        raise ValueError("search provider down")
+
+    monkeypatch.setattr(api_app, "job_manager", JobManager(runner, max_workers=1, total_steps=2))
+
+    events = parse_events(client.post("/api/v1/analyze-brand/stream", json=REQUEST).text)
+
+    assert [event for event, _ in events] == ["job", "error"]
+    assert events[-1][1] == {"status": "ERROR", "error": "search provider down"}
+
+
+def test_stream_detaches_from_the_job_when_the_client_disconnects(client, blocking_jobs):
+    import api_app
+
+    manager, release = blocking_jobs
+
+    events = parse_events(asyncio.run(stream_until_first_task(api_app.app, REQUEST)))
+
+    assert [event for event, _ in events] == ["job", "task"]
+    job = manager.get(events[0][1]["job_id"])
+    assert job._listeners == []
+    # The job keeps running for other callers and the report cache
+    release.set()
+    assert job.future.result(timeout=5) == "report for Nike"
+
+
+def test_only_batch_requests_take_a_brand_ticker():
+    import api_app
+
+    schemas = api_app.app.openapi()["components"]["schemas"]
+
+    assert "ticker" not in schemas["BrandAnalysisRequest"]["properties"]
+    assert "ticker" not in schemas["MonitorRequest"]["properties"]
+    assert "ticker" in schemas["BatchBrandAnalysisRequest"]["properties"]
@@ -0,0 +1,93 @@
+import pytest
+import brand_batch
+from brand_batch import BatchPrefetcher
+from tools.rate_governor import PRIORITY_BATCH, current_priority, request_priority
+
+
+class FakeSearchTool:
+    def _search(self, query):
+        return {"organic": [{"title": query, "link": f"https://news.example.com/{query.split()[0].lower()}"}]}
+
+
+class FakeBrowserTool:
+    def _run(self, website):
+        return f"summary of {website}"
+
+
+class FakeFinanceTool:
+    def __init__(self):
+        self.requested = []
+
+    def fetch_ticker_data(self, tickers):
+        self.requested.append(list(tickers))
+        return {ticker: f"section {ticker}" for ticker in tickers}, {}
+
+    def format_ticker_panel(self, tickers, sections, history):
+        return ",".join(tickers)
+
+
+@pytest.fixture
+def finance_tool(monkeypatch):
+    tool = FakeFinanceTool()
+    monkeypatch.setattr(brand_batch, "create_tool", lambda name: tool)
+    return tool
+
+
+def prefetch(analyses, finance_tool):
+    return BatchPrefetcher(
+        search_tool=FakeSearchTool(),
+        browser_tool=FakeBrowserTool(),
+        finance_tool=finance_tool
+    ).prefetch(analyses)
+
+
+def test_brand_ticker_is_fetched_and_listed_first(finance_tool):
+    competitors = [{"name": "Adidas", "ticker": "addyy"}]
+
+    data = prefetch([("Nike", competitors, "nke")], finance_tool)
+
+    assert finance_tool.requested == [["ADDYY", "NKE"]]
+    assert data.finance_output("Nike", competitors, "nke") == "NKE,ADDYY"
+
+
+def test_brand_ticker_falls_back_to_competitor_entries(finance_tool):
+    analyses = [
+        ("Nike", [{"name": "Adidas", "ticker": "ADDYY"}], None),
+        ("Adidas", [{"name": "Nike", "ticker": "NKE"}], None)
+    ]
+
+    data = prefetch(analyses, finance_tool)
+
+    assert data.finance_output("Nike", analyses[0][1]) == "NKE,ADDYY"
+
+
+def test_unlisted_brand_has_only_competitor_tickers(finance_tool):
+    competitors = [{"name": "Puma", "ticker": "PUMSY"}]
+
+    data = prefetch([("Allbirds Co", competitors, None)], finance_tool)
+
+    assert data.finance_output("Allbirds Co", competitors) == "PUMSY"
+
+
+def test_articles_are_shared_per_entity(finance_tool):
+    competitors = [{"name": "Adidas", "ticker": "ADDYY"}]
+
+    data = prefetch([("Nike", competitors, None), ("nike", competitors, None)], finance_tool)
+
+    assert len(data.search) == 2
+    assert data.search["nike"].summary == "summary of https://news.example.com/nike"
+
+
+def test_fetches_run_at_the_caller_priority(finance_tool):
+    priorities = []
+
+    class RecordingSearchTool(FakeSearchTool):
+        def _search(self, query):
+            priorities.append(current_priority())
+            return super()._search(query)
+
+    prefetcher = BatchPrefetcher(search_tool=RecordingSearchTool(), browser_tool=FakeBrowserTool(), finance_tool=finance_tool)
+    with request_priority(PRIORITY_BATCH):
+        prefetcher.prefetch([("Nike", [{"name": "Adidas", "ticker": "ADDYY"}], None)])
+
+    assert priorities and set(priorities) == {PRIORITY_BATCH}
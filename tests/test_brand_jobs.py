@@ -0,0 +1,92 @@
+import threading
+import pytest
+from brand_jobs import JobManager, JobStatus, JobCancelled
+
+
+@pytest.fixture
+def blocking_manager():
+    release = threading.Event()
+    started = threading.Event()
+
+    def runner(job):
+        started.set()
+        release.wait(5)
+        job.step_completed("search_task")
+        return f"report for {job.brand_name}"
+
+    manager = JobManager(runner, max_workers=1, total_steps=1)
+    yield manager, started, release
+    release.set()
+    manager.shutdown(wait=True)
+
+
+def test_coalesced_job_survives_one_subscriber_cancelling(blocking_manager):
+    manager, started, release = blocking_manager
+    first = manager.submit("Nike", [], dedupe_key="nike", subscriber="a")
+    second = manager.submit("Nike", [], dedupe_key="nike", subscriber="b")
+    assert first is second
+    assert first.subscribers == 2
+    started.wait(5)
+
+    manager.cancel(first.job_id, "a")
+    assert not first.cancel_requested
+    assert first.subscribers == 1
+
+    release.set()
+    assert first.future.result(timeout=5) == "report for Nike"
+    assert first.status == JobStatus.SUCCESS
+
+
+def test_last_subscriber_cancels_running_job(blocking_manager):
+    manager, started, release = blocking_manager
+    job = manager.submit("Nike", [], dedupe_key="nike", subscriber="a")
+    manager.submit("Nike", [], dedupe_key="nike", subscriber="b")
+    started.wait(5)
+
+    manager.cancel(job.job_id, "a")
+    manager.cancel(job.job_id, "b")
+    assert job.cancel_requested
+
+    release.set()
+    with pytest.raises(JobCancelled):
+        job.future.result(timeout=5)
+    assert job.status == JobStatus.CANCELLED
+
+
+def test_unknown_subscriber_does_not_cancel_anonymous_job(blocking_manager):
+    manager, started, release = blocking_manager
+    job = manager.submit("Nike", [], dedupe_key="nike")
+    manager.cancel(job.job_id, "someone-else")
+    assert not job.cancel_requested
+
+
+def test_pending_job_is_dropped_when_its_only_subscriber_cancels(blocking_manager):
+    manager, started, release = blocking_manager
+    manager.submit("Puma", [], subscriber="x")
+    started.wait(5)
+    pending = manager.submit("Nike", [], subscriber="a")
+
+    manager.cancel(pending.job_id, "a")
+    assert pending.status == JobStatus.CANCELLED
+    assert pending.future.cancelled()
+
+
+def test_cancelled_job_is_not_reused_for_new_submissions(blocking_manager):
+    manager, started, release = blocking_manager
+    job = manager.submit("Nike", [], dedupe_key="nike", subscriber="a")
+    started.wait(5)
+    manager.cancel(job.job_id, "a")
+
+    fresh = manager.submit("Nike", [], dedupe_key="nike", subscriber="b")
+    assert fresh is not job
+
+
+def test_cancel_without_subscriber_detaches_everyone(blocking_manager):
+    manager, started, release = blocking_manager
+    job = manager.submit("Nike", [], dedupe_key="nike", subscriber="a")
+    manager.submit("Nike", [], dedupe_key="nike", subscriber="b")
+    started.wait(5)
+
+    manager.cancel(job.job_id)
+    assert job.cancel_requested
+    assert job.subscribers == 0
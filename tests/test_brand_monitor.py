@@ -0,0 +1,120 @@
+import threading
+from concurrent.futures import Future
+import pytest
+from brand_monitor import BrandMonitor, MonitorStore, MonitorStatus
+from brand_schemas import Article
+from tools.rate_governor import PRIORITY_BACKGROUND, current_priority, request_priority
+
+
+class FakeJob:
+    def __init__(self):
+        self.future = Future()
+
+    def is_finished(self):
+        return self.future.done()
+
+
+class BlockingSearchTool:
+    """
+    Returns one new article per entity once released.
+    """
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def _search_many(self, queries):
+        self.started.set()
+        self.release.wait(5)
+        return [{"organic": [{"link": f"https://news.example.com/{idx}", "title": query}]} for idx, query in enumerate(queries)]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return MonitorStore(str(tmp_path / "monitors.sqlite"))
+
+
+def make_monitor(store, search_tool, submitted):
+    def submit(monitor, articles=None):
+        job = FakeJob()
+        submitted.append(job)
+        return job
+
+    return BrandMonitor(store, submit, submit, search_tool=search_tool, browser_tool=object(), poll_seconds=0.01)
+
+
+def test_overlapping_ticks_queue_one_job(store):
+    search_tool = BlockingSearchTool()
+    submitted = []
+    brand_monitor = make_monitor(store, search_tool, submitted)
+    monitor = store.create("Nike", [{"name": "Adidas", "ticker": "ADDYY"}], 3600)
+
+    scheduled = threading.Thread(target=brand_monitor.tick, args=(monitor,))
+    scheduled.start()
+    assert search_tool.started.wait(5)
+    manual = brand_monitor.tick(monitor)
+    search_tool.release.set()
+    scheduled.join(5)
+
+    assert manual is None
+    assert len(submitted) == 1
+    assert brand_monitor.current_job(monitor.monitor_id) is submitted[0]
+
+
+def test_finished_run_marks_articles_seen(store):
+    search_tool = BlockingSearchTool()
+    search_tool.release.set()
+    submitted = []
+    brand_monitor = make_monitor(store, search_tool, submitted)
+    monitor = store.create("Nike", [], 3600)
+
+    job = brand_monitor.tick(monitor)
+    job.future.set_result("# Report")
+
+    updated = store.get(monitor.monitor_id)
+    assert updated.last_status == MonitorStatus.UPDATED
+    assert updated.report == "# Report"
+    assert updated.seen_urls == 1
+
+
+def test_scheduler_survives_a_failing_store(store, monkeypatch):
+    calls = []
+
+    def flaky_due(now):
+        calls.append(now)
+        if len(calls) == 1:
+            raise RuntimeError("database is locked")
+        brand_monitor.stop()
+        return []
+
+    brand_monitor = make_monitor(store, BlockingSearchTool(), [])
+    monkeypatch.setattr(store, "due", flaky_due)
+
+    thread = threading.Thread(target=brand_monitor._loop)
+    thread.start()
+    thread.join(5)
+
+    assert not thread.is_alive()
+    assert len(calls) == 2
+
+
+def test_scrapes_keep_order_and_the_caller_priority(store):
+    priorities = []
+
+    class RecordingBrowserTool:
+        def _run(self, website):
+            priorities.append(current_priority())
+            return "Error: page gone" if website.endswith("/1") else f"summary of {website}"
+
+    monitor = BrandMonitor(store, None, None, search_tool=object(), browser_tool=RecordingBrowserTool())
+    articles = [
+        Article(brand="Nike", title=f"Story {idx}", url=f"https://news.example.com/{idx}", summary="snippet")
+        for idx in range(3)
+    ]
+
+    with request_priority(PRIORITY_BACKGROUND):
+        scraped = monitor.scrape_articles(articles)
+
+    assert [article.summary for article in scraped] == [
+        "summary of https://news.example.com/0", "snippet", "summary of https://news.example.com/2"
+    ]
+    assert set(priorities) == {PRIORITY_BACKGROUND}
@@ -0,0 +1,91 @@
+import sys
+import types
+import pytest
+from benchmarks.fake_services import FakeLLM
+from tools import browser_tools, llm_cache
+from tools.html_chunking import pack_chunks
+from tools.rate_governor import PRIORITY_BACKGROUND, current_priority, request_priority
+
+
+PAGE_HTML = "<html><body><p>Quarterly sales rose.</p><p>Margins improved.</p></body></html>"
+
+
+class FakeElement:
+    category = "NarrativeText"
+
+    def __init__(self, text):
+        self.text = text
+
+    def __str__(self):
+        return self.text
+
+
+class FakeResponse:
+    status_code = 200
+    text = PAGE_HTML
+
+
+class FakeHttpClient:
+    def post(self, service, url, **kwargs):
+        return FakeResponse()
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    monkeypatch.setattr(FakeLLM, "delay", 0.0)
+    monkeypatch.setattr(browser_tools, "_summarizer_pool", None)
+    llm_cache.set_llm_factory(FakeLLM)
+    yield
+    llm_cache.set_llm_factory(None)
+
+
+@pytest.fixture
+def page(monkeypatch):
+    # unstructured is not a test dependency; split the page on paragraphs instead
+    partition = types.ModuleType("unstructured.partition.html")
+    partition.partition_html = lambda text: [FakeElement("Quarterly sales rose."), FakeElement("Margins improved.")]
+    monkeypatch.setitem(sys.modules, "unstructured", types.ModuleType("unstructured"))
+    monkeypatch.setitem(sys.modules, "unstructured.partition", types.ModuleType("unstructured.partition"))
+    monkeypatch.setitem(sys.modules, "unstructured.partition.html", partition)
+    monkeypatch.setattr(browser_tools, "get_scrape_cache", lambda: None)
+    monkeypatch.setattr(browser_tools, "get_url_index", lambda: None)
+    monkeypatch.setattr(browser_tools, "get_http_client", lambda: FakeHttpClient())
+    monkeypatch.setattr(browser_tools, "require_secret", lambda name: "token")
+
+
+def test_page_is_summarized_and_merged_by_agents(fake_llm, page, monkeypatch):
+    # A tiny chunk budget splits the page, so the merge step runs too
+    monkeypatch.setattr(browser_tools, "pack_chunks", lambda texts: pack_chunks(texts, max_tokens=5))
+    merged = []
+    combine = browser_tools.BrowserTools._combine_summaries
+
+    def record_combine(self, summaries):
+        merged.append(summaries)
+        return combine(self, summaries)
+
+    monkeypatch.setattr(browser_tools.BrowserTools, "_combine_summaries", record_combine)
+
+    summary = browser_tools.BrowserTools()._run("https://example.com/article")
+
+    # One agent answer, not the concatenation fallback
+    assert summary.startswith("Benchmark answer") and summary.count("Benchmark answer") == 1
+    assert len(merged) == 1 and len(merged[0]) > 1
+    assert all(part.startswith("Benchmark answer") for part in merged[0])
+
+
+def test_chunk_summaries_run_at_the_caller_priority(page, monkeypatch):
+    monkeypatch.setattr(browser_tools, "pack_chunks", lambda texts: pack_chunks(texts, max_tokens=5))
+    priorities = []
+
+    def summarize_chunk(self, chunk, idx, total):
+        priorities.append(current_priority())
+        return f"summary {idx}"
+
+    monkeypatch.setattr(browser_tools.BrowserTools, "_summarize_chunk", summarize_chunk)
+    monkeypatch.setattr(browser_tools.BrowserTools, "_combine_summaries", lambda self, summaries: " ".join(summaries))
+
+    with request_priority(PRIORITY_BACKGROUND):
+        summary = browser_tools.BrowserTools()._run("https://example.com/article")
+
+    assert summary.startswith("summary 0 summary 1")
+    assert priorities and set(priorities) == {PRIORITY_BACKGROUND}
@@ -0,0 +1,89 @@
+import json
+from types import SimpleNamespace
+import pytest
+import crew_scheduler
+from crew_scheduler import TaskGraph, TaskNode
+
+
+class FakeCrew:
+    """
+    Stands in for crewai.Crew: "runs" its task by attaching a structured output.
+    """
+    def __init__(self, agents, tasks, verbose=False):
+        self.tasks = tasks
+
+    def kickoff(self):
+        for task in self.tasks:
+            task.output = SimpleNamespace(raw="Final Answer: long prose", pydantic={"score": 0.4})
+
+
+def make_node(name, depends_on=None, runner=None):
+    task = SimpleNamespace(description=f"{name} description", output=None, context=None)
+    agent = SimpleNamespace(role=f"{name} agent", allow_delegation=False)
+    return TaskNode(name, task, agent, depends_on, runner=runner)
+
+
+@pytest.fixture(autouse=True)
+def fake_crew(monkeypatch):
+    monkeypatch.setattr(crew_scheduler, "Crew", FakeCrew)
+
+
+def test_runners_receive_dependency_outputs():
+    graph = TaskGraph([
+        make_node("search", runner=lambda inputs, run_task: "articles"),
+        make_node("report", ["search"], runner=lambda inputs, run_task: f"report on {inputs['search']}")
+    ])
+
+    outputs = graph.run()
+
+    assert outputs["report"].raw == "report on articles"
+
+
+def test_completed_tasks_are_not_run():
+    def fail(inputs, run_task):
+        raise AssertionError("prefetched task was run")
+
+    graph = TaskGraph([
+        make_node("search", runner=fail),
+        make_node("report", ["search"], runner=lambda inputs, run_task: inputs["search"].upper())
+    ])
+
+    assert graph.run(completed={"search": "cached"})["report"].raw == "CACHED"
+
+
+def test_structured_output_is_formatted_for_downstream_tasks():
+    graph = TaskGraph([make_node("sentiment")], format_output=json.dumps)
+
+    assert graph.run()["sentiment"].raw == '{"score": 0.4}'
+
+
+def test_raw_output_is_kept_without_a_formatter():
+    graph = TaskGraph([make_node("sentiment")])
+
+    assert graph.run()["sentiment"].raw == "Final Answer: long prose"
+
+
+def test_dependency_cycles_are_rejected():
+    with pytest.raises(ValueError):
+        TaskGraph([make_node("a", ["b"]), make_node("b", ["a"])])
+
+
+def test_failure_waits_for_running_siblings():
+    import threading
+    import time
+
+    finished = threading.Event()
+
+    def slow(inputs, run_task):
+        time.sleep(0.2)
+        finished.set()
+        return "done"
+
+    def fail(inputs, run_task):
+        raise RuntimeError("task failed")
+
+    graph = TaskGraph([make_node("slow", runner=slow), make_node("fail", runner=fail)])
+
+    with pytest.raises(RuntimeError):
+        graph.run()
+    assert finished.is_set()
@@ -0,0 +1,36 @@
+from crewai import Agent, Task
+from benchmarks.fake_services import FakeLLM
+from tools.search_tools import SearchTools
+
+
+def test_fake_llm_builds_and_answers(monkeypatch):
+    monkeypatch.setattr(FakeLLM, "delay", 0.0)
+
+    llm = FakeLLM(model="gemini/gemini-2.0-flash")
+
+    assert llm.call("Summarize the news").startswith("Thought: I now can give a great answer\nFinal Answer:")
+
+
+def test_fake_llm_calls_each_available_tool_once(monkeypatch):
+    monkeypatch.setattr(FakeLLM, "delay", 0.0)
+    queries = []
+    monkeypatch.setattr(SearchTools, "_run", lambda self, query: queries.append(query) or "Nike results")
+    prompts = []
+    call = FakeLLM.call
+
+    def record_call(self, messages, *args, **kwargs):
+        prompts.append(messages)
+        return call(self, messages, *args, **kwargs)
+
+    monkeypatch.setattr(FakeLLM, "call", record_call)
+    llm = FakeLLM(model="gemini/gemini-2.0-flash")
+    agent = Agent(role="Researcher", goal="Find news", backstory="Reads the news", tools=[SearchTools()], llm=llm)
+    task = Task(description="Find news about Nike", expected_output="A list of articles", agent=agent)
+
+    output = task.execute_sync(agent=agent)
+
+    # The prompt crewai rendered, with the tool under its sanitized name
+    assert "Tool Name: search_the_internet" in str(prompts[0])
+    assert queries == ["brand latest news"]
+    assert len(prompts) == 2
+    assert output.raw.startswith("Benchmark answer")
@@ -0,0 +1,66 @@
+import pytest
+from benchmarks.fake_services import FakeServiceConfig, make_fake_download_bars, fake_ticker_info
+from tools import price_store
+from tools.finance_tools import YFinanceTools
+from tools.metrics_engine import build_panel, compute_panel_metrics
+
+
+@pytest.fixture
+def downloads(monkeypatch):
+    """
+    Serves generated price history instead of Yahoo Finance and records
+    every download request.
+    """
+    calls = []
+    fake_download = make_fake_download_bars(FakeServiceConfig(finance_delay=0))
+
+    def download_bars(tickers, start, end):
+        calls.append(sorted(tickers))
+        return fake_download(tickers, start, end)
+
+    monkeypatch.setenv("PRICE_STORE_ENABLED", "false")
+    monkeypatch.setattr(price_store, "download_bars", download_bars)
+    monkeypatch.setattr(YFinanceTools, "_fetch_info", fake_ticker_info)
+    return calls
+
+
+def test_several_tickers_are_downloaded_in_one_request(downloads):
+    output = YFinanceTools()._run("nke, addyy PUMSY")
+
+    assert downloads == [["ADDYY", "NKE", "PUMSY"]]
+    for ticker in ("NKE", "ADDYY", "PUMSY"):
+        assert f"Financial Data for {ticker}:" in output
+        assert f"Company: {ticker} Holdings" in output
+    assert "Comparative Metrics (returns, volatility and drawdown in %, beta vs NKE):" in output
+
+
+def test_fetch_ticker_data_returns_sections_and_history_per_ticker(downloads):
+    sections, history = YFinanceTools().fetch_ticker_data(["nke", "NKE", "addyy"])
+
+    assert downloads == [["ADDYY", "NKE"]]
+    assert set(sections) == set(history) == {"NKE", "ADDYY"}
+    assert not history["NKE"].empty
+
+
+def test_single_ticker_reads_company_info_through_fetch_info(downloads, monkeypatch):
+    looked_up = []
+
+    def fetch_info(self, ticker):
+        looked_up.append(ticker)
+        return fake_ticker_info(self, ticker)
+
+    monkeypatch.setattr(YFinanceTools, "_fetch_info", fetch_info)
+
+    output = YFinanceTools()._run(" nke ")
+
+    assert looked_up == ["NKE"]
+    assert output.startswith("Financial Data for NKE:")
+    assert "Market Cap: $50.00B" in output
+
+
+def test_section_and_metrics_table_agree_on_the_7_day_change(downloads):
+    tool = YFinanceTools()
+    sections, history = tool.fetch_ticker_data(["NKE"])
+    table = compute_panel_metrics(build_panel(history, "Close"), build_panel(history, "Volume"))
+
+    assert f"7-Day Change: {table.loc['NKE', 'return_7d']:.2f}%" in sections["NKE"]
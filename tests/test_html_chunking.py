@@ -0,0 +1,87 @@
+from tools.html_chunking import clean_elements, pack_chunks, estimate_tokens
+
+
+class FakeElement:
+    def __init__(self, text, category="NarrativeText"):
+        self.text = text
+        self.category = category
+
+    def __str__(self):
+        return self.text
+
+
+def words(chunks):
+    return " ".join(chunks).split()
+
+
+def test_estimate_tokens_rounds_up_quarter_characters():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcd") == 1
+    assert estimate_tokens("abcde") == 2
+
+
+def test_layout_and_boilerplate_elements_are_dropped():
+    elements = [
+        FakeElement("Site name", "Header"),
+        FakeElement("Nike reported record quarterly revenue driven by running shoes."),
+        FakeElement("We use cookies to improve your experience."),
+        FakeElement("Share", "UncategorizedText"),
+        FakeElement("Page 2", "PageNumber"),
+        FakeElement("All rights reserved.", "Footer")
+    ]
+
+    assert clean_elements(elements) == ["Nike reported record quarterly revenue driven by running shoes."]
+
+
+def test_long_paragraph_mentioning_boilerplate_is_kept():
+    text = "The company said its new privacy policy " + "covers customer data in every market it serves " * 4
+    assert clean_elements([FakeElement(text)]) == [" ".join(text.split())]
+
+
+def test_repeated_elements_are_kept_once_with_whitespace_collapsed():
+    elements = [
+        FakeElement("Nike  shares rose\n3% today."),
+        FakeElement("nike shares rose 3% today"),
+        FakeElement("Adidas shares fell 1% today.")
+    ]
+
+    assert clean_elements(elements) == ["Nike shares rose 3% today.", "Adidas shares fell 1% today."]
+
+
+def test_small_elements_share_a_chunk_in_page_order():
+    texts = ["First paragraph.", "Second paragraph.", "Third paragraph."]
+
+    assert pack_chunks(texts, max_tokens=100) == ["First paragraph.\n\nSecond paragraph.\n\nThird paragraph."]
+
+
+def test_chunks_break_on_element_boundaries_within_budget():
+    texts = [f"Paragraph {idx} has exactly this many words in it." for idx in range(10)]
+
+    chunks = pack_chunks(texts, max_tokens=30)
+
+    assert len(chunks) > 1
+    assert all(estimate_tokens(chunk) <= 30 for chunk in chunks)
+    # No element is split across chunks
+    assert [text for chunk in chunks for text in chunk.split("\n\n")] == texts
+
+
+def test_oversized_element_is_split_on_sentences():
+    sentence = "Revenue grew in every region this quarter."
+    chunks = pack_chunks([" ".join([sentence] * 6)], max_tokens=25)
+
+    assert all(estimate_tokens(chunk) <= 25 for chunk in chunks)
+    assert all(chunk.endswith(".") for chunk in chunks)
+    assert words(chunks) == sentence.split() * 6
+
+
+def test_oversized_sentence_is_split_on_words():
+    text = " ".join(f"word{idx}" for idx in range(200))
+
+    chunks = pack_chunks([text], max_tokens=20)
+
+    assert all(estimate_tokens(chunk) <= 20 for chunk in chunks)
+    assert words(chunks) == text.split()
+
+
+def test_no_input_gives_no_chunks():
+    assert pack_chunks([], max_tokens=10) == []
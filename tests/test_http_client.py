@@ -0,0 +1,114 @@
+import pytest
+import requests
+from tools import http_client
+from tools.http_client import HttpClient
+from tools.rate_governor import RateGovernor
+
+
+class StubResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.content = b"{}"
+
+
+class StubSession:
+    """
+    Plays back scripted responses (or exceptions) and records how many
+    governor slots were held while each request was sent.
+    """
+    def __init__(self, outcomes, limiter):
+        self.outcomes = list(outcomes)
+        self.limiter = limiter
+        self.in_flight = []
+
+    def request(self, method, url, **kwargs):
+        self.in_flight.append(self.limiter.in_flight)
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return StubResponse(outcome)
+
+
+@pytest.fixture
+def governor(monkeypatch):
+    governor = RateGovernor(max_wait=5)
+    monkeypatch.setattr(http_client, "get_rate_governor", lambda: governor)
+    return governor
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(http_client.time, "sleep", sleeps.append)
+    return sleeps
+
+
+def make_client(governor, outcomes, max_retries=3):
+    client = HttpClient(max_retries=max_retries, backoff_base=0.5, backoff_max=10.0)
+    client.session = StubSession(outcomes, governor.limiter("stub"))
+    return client
+
+
+def test_throttled_responses_are_retried_until_success(governor, sleeps):
+    client = make_client(governor, [429, 503, 200])
+
+    response = client.post("stub", "https://example.com")
+
+    assert response.status_code == 200
+    assert len(sleeps) == 2
+    stats = client.stats()["stub"]
+    assert (stats["requests"], stats["errors"], stats["retries"]) == (3, 2, 2)
+
+
+def test_every_attempt_holds_one_governor_slot(governor, sleeps):
+    client = make_client(governor, [429, 503, 200])
+
+    client.post("stub", "https://example.com")
+
+    limiter = governor.limiter("stub")
+    assert client.session.in_flight == [1, 1, 1]
+    assert limiter.in_flight == 0
+    assert limiter.throttled == 2
+
+
+def test_backoff_grows_exponentially_up_to_the_cap(governor, sleeps, monkeypatch):
+    monkeypatch.setattr(http_client.random, "uniform", lambda low, high: high)
+    client = make_client(governor, [503] * 6, max_retries=5)
+
+    client.get("stub", "https://example.com")
+
+    assert sleeps == [0.5, 1.0, 2.0, 4.0, 8.0]
+
+
+def test_retry_after_header_sets_the_delay(governor):
+    client = make_client(governor, [])
+
+    assert client._backoff_delay(0, StubResponse(429, {"Retry-After": "3"})) == 3.0
+    assert client._backoff_delay(0, StubResponse(429, {"Retry-After": "120"})) == 10.0
+
+
+def test_last_response_is_returned_when_retries_run_out(governor, sleeps):
+    client = make_client(governor, [503, 503, 503], max_retries=2)
+
+    response = client.post("stub", "https://example.com")
+
+    assert response.status_code == 503
+    assert len(sleeps) == 2
+
+
+def test_client_errors_are_not_retried(governor, sleeps):
+    client = make_client(governor, [404])
+
+    assert client.post("stub", "https://example.com").status_code == 404
+    assert sleeps == []
+
+
+def test_connection_errors_release_their_slot_and_raise_at_the_end(governor, sleeps):
+    client = make_client(governor, [requests.ConnectionError("reset")] * 2, max_retries=1)
+
+    with pytest.raises(requests.ConnectionError):
+        client.post("stub", "https://example.com")
+
+    assert governor.limiter("stub").in_flight == 0
+    assert client.stats()["stub"]["errors"] == 2
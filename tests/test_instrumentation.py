@@ -0,0 +1,40 @@
+from types import SimpleNamespace
+from tools.instrumentation import RequestTimings, collect_timings, track_agent_tokens
+
+
+class FakeTokenProcess:
+    def __init__(self):
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+    def get_summary(self):
+        return SimpleNamespace(prompt_tokens=self.prompt_tokens, completion_tokens=self.completion_tokens)
+
+
+def make_agent(model="test/model"):
+    return SimpleNamespace(_token_process=FakeTokenProcess(), llm=SimpleNamespace(model=model))
+
+
+def test_delegated_coworker_tokens_are_counted():
+    manager, coworker = make_agent(), make_agent()
+    manager._token_process.prompt_tokens = 1000
+    timings = RequestTimings()
+
+    with collect_timings(timings), track_agent_tokens(manager, coworker):
+        manager._token_process.prompt_tokens += 100
+        manager._token_process.completion_tokens += 10
+        coworker._token_process.prompt_tokens += 50
+        coworker._token_process.completion_tokens += 5
+
+    assert timings.tokens["prompt"] == 150
+    assert timings.tokens["completion"] == 15
+
+
+def test_an_agent_listed_twice_is_counted_once():
+    agent = make_agent()
+    timings = RequestTimings()
+
+    with collect_timings(timings), track_agent_tokens(agent, agent):
+        agent._token_process.prompt_tokens += 40
+
+    assert timings.tokens["prompt"] == 40
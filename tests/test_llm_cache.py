@@ -0,0 +1,64 @@
+import pytest
+from crewai.llms.base_llm import BaseLLM, call_stop_override
+from tools.llm_cache import CachedLLM, LLMCache, LLMCacheMiss, create_llm
+
+
+class RecordingLLM(BaseLLM):
+    """
+    Provider client stand-in that answers every prompt with a counter.
+    """
+    def __init__(self, **kwargs):
+        super().__init__(model="gemini/test-model", **kwargs)
+        object.__setattr__(self, "calls", [])
+
+    def call(self, messages, *args, **kwargs):
+        self.calls.append(list(self.stop_sequences))
+        return f"answer {len(self.calls)}"
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return LLMCache(str(tmp_path / "llm.sqlite"))
+
+
+def test_create_llm_wraps_the_provider_client():
+    llm = create_llm("gemini/gemini-2.0-flash")
+
+    assert isinstance(llm, CachedLLM)
+    assert llm.model == "gemini/gemini-2.0-flash"
+    assert isinstance(llm.llm, BaseLLM)
+
+
+def test_identical_prompts_are_served_from_cache(cache):
+    inner = RecordingLLM()
+    llm = CachedLLM(inner, cache=cache)
+
+    assert llm.call("What is new at Nike?") == "answer 1"
+    assert llm.call("What is new at Nike?") == "answer 1"
+    assert llm.call("What is new at Adidas?") == "answer 2"
+    assert len(inner.calls) == 2
+    assert cache.stats()["hits"] == 1
+
+
+def test_replay_mode_fails_on_a_miss(cache):
+    llm = CachedLLM(RecordingLLM(), cache=cache, cache_mode="replay")
+
+    with pytest.raises(LLMCacheMiss):
+        llm.call("Never seen before")
+
+
+def test_stop_words_reach_the_provider_and_the_cache_key(cache):
+    inner = RecordingLLM()
+    llm = CachedLLM(inner, cache=cache)
+
+    llm.call("Same prompt")
+    with call_stop_override(llm, ["\nObservation:"]):
+        assert llm.call("Same prompt") == "answer 2"
+
+    assert inner.calls == [[], ["\nObservation:"]]
+
+
+def test_token_usage_comes_from_the_provider_client():
+    inner = RecordingLLM()
+
+    assert CachedLLM(inner).get_token_usage_summary() == inner.get_token_usage_summary()
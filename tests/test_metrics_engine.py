@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+from tools.metrics_engine import compute_panel_metrics, format_metrics_table
+
+
+def make_panel():
+    index = pd.bdate_range("2024-01-01", periods=40)
+    close = pd.DataFrame({
+        "LIVE": np.linspace(100, 139, 40),
+        "GONE": [50.0 + i for i in range(30)] + [np.nan] * 10
+    }, index=index)
+    volume = pd.DataFrame({"LIVE": 1000.0, "GONE": 500.0}, index=index)
+    volume.loc[index[30]:, "GONE"] = np.nan
+    return close, volume
+
+
+def test_stale_ticker_reports_missing_returns():
+    close, volume = make_panel()
+
+    table = compute_panel_metrics(close, volume, return_windows=(1, 7))
+
+    assert table.loc["GONE", "last_close"] == 79.0
+    assert pd.isna(table.loc["GONE", "return_1d"])
+    assert pd.isna(table.loc["GONE", "return_7d"])
+    assert pd.isna(table.loc["GONE", "volatility_30d"])
+    assert table.loc["LIVE", "return_1d"] > 0
+
+
+def test_holiday_gaps_are_still_filled():
+    close, volume = make_panel()
+    close.iloc[-2, close.columns.get_loc("LIVE")] = np.nan
+
+    table = compute_panel_metrics(close, volume, return_windows=(1,))
+
+    assert table.loc["LIVE", "return_1d"] > 0
+
+
+def test_missing_metrics_render_as_na():
+    close, volume = make_panel()
+
+    rendered = format_metrics_table(compute_panel_metrics(close, volume, return_windows=(1,)))
+
+    assert "| GONE | 79.00 | N/A |" in rendered
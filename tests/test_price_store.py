@@ -0,0 +1,55 @@
+from datetime import datetime
+import pandas as pd
+import pytest
+from tools import price_store
+from tools.price_store import PriceStore, PRICE_COLUMNS, empty_bars, slice_bars
+
+
+def make_bars(dates, close):
+    index = pd.DatetimeIndex(pd.to_datetime(dates))
+    return pd.DataFrame({column: close for column in PRICE_COLUMNS}, index=index)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return PriceStore(str(tmp_path / "prices"))
+
+
+def test_unknown_ticker_returns_empty_bars(store, monkeypatch):
+    monkeypatch.setattr(price_store, "download_bars", lambda tickers, start, end: {t: empty_bars() for t in tickers})
+
+    history = store.get_history(["nope"], datetime(2024, 1, 1), datetime(2024, 3, 1))
+
+    assert history["NOPE"].empty
+    assert isinstance(history["NOPE"].index, pd.DatetimeIndex)
+    assert list(history["NOPE"].columns) == PRICE_COLUMNS
+
+
+def test_load_of_missing_ticker_has_date_index(store):
+    bars = store.load("NOPE")
+
+    assert bars.empty
+    assert isinstance(bars.index, pd.DatetimeIndex)
+
+
+def test_slice_bars_accepts_frame_without_date_index():
+    bars = pd.DataFrame(columns=PRICE_COLUMNS)
+
+    assert slice_bars(bars, datetime(2024, 1, 1), datetime(2024, 3, 1)).empty
+
+
+def test_downloaded_bars_are_stored_and_sliced(store, monkeypatch):
+    downloads = []
+
+    def fake_download(tickers, start, end):
+        downloads.append(list(tickers))
+        return {t: make_bars(["2024-01-02", "2024-01-03", "2024-01-04"], 10.0) for t in tickers}
+
+    monkeypatch.setattr(price_store, "download_bars", fake_download)
+
+    history = store.get_history(["abc"], datetime(2024, 1, 1), datetime(2024, 1, 3))
+    assert list(history["ABC"].index.strftime("%Y-%m-%d")) == ["2024-01-02", "2024-01-03"]
+
+    # A second lookup inside the refresh window is served from the store
+    store.get_history(["abc"], datetime(2024, 1, 1), datetime(2024, 1, 3))
+    assert downloads == [["ABC"]]
@@ -0,0 +1,36 @@
+import pytest
+from tools import rate_governor
+from tools.rate_governor import ProviderLimiter, RateGovernor
+
+
+def test_header_quota_is_scaled_by_share():
+    limiter = ProviderLimiter("serper", rate=5.0, burst=5, max_in_flight=8, share=0.25)
+
+    limiter.feedback(200, {"X-RateLimit-Remaining": "100", "X-RateLimit-Reset": "10"})
+
+    assert limiter.rate == pytest.approx(2.5)
+
+
+def test_limits_are_scaled_by_share(monkeypatch):
+    monkeypatch.setenv("RATE_SERPER_RPS", "8")
+    governor = RateGovernor(share=0.5)
+
+    assert governor.limiter("serper").max_rate == pytest.approx(4.0)
+
+    governor.set_share(0.25)
+    limiter = governor.limiter("serper")
+    assert limiter.max_rate == pytest.approx(2.0)
+    assert limiter.share == 0.25
+
+
+def test_process_backend_shares_quotas_with_the_api_process(monkeypatch):
+    from crew_executor import ProcessCrewBackend
+
+    governor = RateGovernor()
+    monkeypatch.setattr(rate_governor, "_rate_governor", governor)
+    monkeypatch.delenv("RATE_GOVERNOR_SHARE", raising=False)
+
+    backend = ProcessCrewBackend(processes=3)
+
+    assert backend.rate_share == pytest.approx(0.25)
+    assert governor.share == pytest.approx(0.25)
@@ -0,0 +1,75 @@
+import pytest
+import report_cache
+from report_cache import ReportCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(report_cache.time, "time", clock.time)
+    return clock
+
+
+def test_key_ignores_case_whitespace_and_competitor_order():
+    first = ReportCache.make_key("Nike", [{"name": "Adidas", "ticker": "addyy"}, {"name": "Puma", "ticker": "PUMSY"}])
+    second = ReportCache.make_key("  nike ", [{"name": "puma", "ticker": "pumsy"}, {"name": "ADIDAS", "ticker": "ADDYY"}])
+
+    assert first == second
+
+
+def test_key_differs_by_competitor_set():
+    assert ReportCache.make_key("Nike", [{"name": "Adidas", "ticker": "ADDYY"}]) != ReportCache.make_key("Nike", [])
+
+
+def test_entries_are_fresh_then_stale_then_expired(clock):
+    cache = ReportCache(ttl_seconds=60, stale_ttl_seconds=120)
+    cache.set("key", "# Report")
+
+    clock.now += 30
+    fresh = cache.get("key")
+    assert (fresh.report, fresh.is_stale, fresh.age_seconds) == ("# Report", False, 30)
+
+    clock.now += 60
+    assert cache.get("key").is_stale
+
+    clock.now += 120
+    assert cache.get("key") is None
+
+
+def test_setting_a_key_replaces_the_stale_entry(clock):
+    cache = ReportCache(ttl_seconds=60, stale_ttl_seconds=120)
+    cache.set("key", "old")
+    clock.now += 90
+    cache.set("key", "new")
+
+    cached = cache.get("key")
+    assert (cached.report, cached.is_stale) == ("new", False)
+
+
+def test_least_recently_used_entries_are_evicted(clock):
+    cache = ReportCache(max_entries=2)
+    cache.set("a", "A")
+    cache.set("b", "B")
+    cache.get("a")
+    cache.set("c", "C")
+
+    assert cache.get("b") is None
+    assert cache.get("a").report == "A"
+    assert cache.get("c").report == "C"
+
+
+def test_only_one_refresh_runs_per_key():
+    cache = ReportCache()
+
+    assert cache.begin_refresh("key")
+    assert not cache.begin_refresh("key")
+    cache.end_refresh("key")
+    assert cache.begin_refresh("key")
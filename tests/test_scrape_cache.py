@@ -0,0 +1,50 @@
+import pytest
+from tools import browser_tools
+from tools.scrape_cache import ScrapeCache, content_hash
+
+
+PAGE_HTML = "<html><body><p>Quarterly sales rose.</p></body></html>"
+
+
+class FakeResponse:
+    status_code = 200
+    text = PAGE_HTML
+
+
+class FakeHttpClient:
+    def post(self, service, url, **kwargs):
+        return FakeResponse()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ScrapeCache(str(tmp_path / "scrape.sqlite"))
+
+
+def test_saving_a_page_does_not_count_a_lookup(cache):
+    cache.save_page("https://example.com/a", "h", "text", "summary", {})
+    cache.save_page("https://example.com/a", "h2", "text", "summary", {})
+
+    assert cache.stats() == {"hits": 0, "misses": 0, "hit_rate": 0.0}
+
+
+def test_record_lookup_counts_hits_and_misses(cache):
+    cache.record_lookup(hit=True)
+    cache.record_lookup(hit=True)
+    cache.record_lookup(hit=False)
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (2, 1)
+
+
+def test_unchanged_page_counts_one_hit(cache, monkeypatch):
+    url = "https://example.com/article"
+    cache.save_page(url, content_hash(PAGE_HTML), "Quarterly sales rose.", "cached summary", {})
+    monkeypatch.setattr(browser_tools, "get_scrape_cache", lambda: cache)
+    monkeypatch.setattr(browser_tools, "get_url_index", lambda: None)
+    monkeypatch.setattr(browser_tools, "get_http_client", lambda: FakeHttpClient())
+    monkeypatch.setattr(browser_tools, "require_secret", lambda name: "token")
+
+    assert browser_tools.BrowserTools()._run(url) == "cached summary"
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 0)
@@ -0,0 +1,102 @@
+import pytest
+from tools import search_cache, search_tools
+from tools.search_cache import SearchCache, get_search_cache
+
+
+RESPONSE = {"organic": [{"title": "Nike earnings", "link": "https://example.com/nike"}]}
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+class FakeResponse:
+    status_code = 200
+
+    def json(self):
+        return RESPONSE
+
+
+class FakeHttpClient:
+    def __init__(self):
+        self.calls = 0
+
+    def post(self, service, url, **kwargs):
+        self.calls += 1
+        return FakeResponse()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(search_cache.time, "time", clock.time)
+    return clock
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    return SearchCache(str(tmp_path / "search.sqlite"), ttl_seconds=60, max_entries=2)
+
+
+def test_equivalent_queries_share_an_entry(cache):
+    cache.set("Nike news", RESPONSE)
+
+    assert cache.get("nike  latest news!") == RESPONSE
+    assert cache.stats()["hits"] == 1
+
+
+def test_unknown_query_counts_a_miss(cache):
+    assert cache.get("Adidas news") is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (0, 1)
+
+
+def test_entry_expires_after_its_ttl(cache, clock):
+    cache.set("Nike news", RESPONSE)
+    clock.now += 59
+    assert cache.get("Nike news") == RESPONSE
+
+    clock.now += 2
+    assert cache.get("Nike news") is None
+    # The expired row was deleted, so winding the clock back does not revive it
+    clock.now -= 10
+    assert cache.get("Nike news") is None
+
+
+def test_per_entry_ttl_overrides_the_default(cache, clock):
+    cache.set("Nike news", RESPONSE, ttl_seconds=5)
+    clock.now += 6
+
+    assert cache.get("Nike news") is None
+
+
+def test_least_recently_used_entry_is_evicted(cache, clock):
+    cache.set("Nike news", RESPONSE)
+    clock.now += 1
+    cache.set("Adidas news", RESPONSE)
+    clock.now += 1
+    cache.get("Nike news")
+    clock.now += 1
+    cache.set("Puma news", RESPONSE)
+
+    assert cache.get("Adidas news") is None
+    assert cache.get("Nike news") == RESPONSE
+    assert cache.get("Puma news") == RESPONSE
+
+
+def test_disabled_cache_is_bypassed(monkeypatch):
+    monkeypatch.setenv("SEARCH_CACHE_ENABLED", "false")
+    client = FakeHttpClient()
+    monkeypatch.setattr(search_tools, "get_http_client", lambda: client)
+    monkeypatch.setattr(search_tools, "require_secret", lambda name: "token")
+
+    assert get_search_cache() is None
+    tool = search_tools.SearchTools()
+    assert tool._search("Nike news") == RESPONSE
+    assert tool._search("Nike news") == RESPONSE
+    assert client.calls == 2
@@ -0,0 +1,81 @@
+import pytest
+from brand_schemas import Article, SentimentResults, SentimentRow
+from sentiment_engine import SentimentEngine
+
+
+@pytest.fixture
+def engine():
+    return SentimentEngine(min_confidence=0.5)
+
+
+def make_article(brand, title, summary=""):
+    return Article(brand=brand, title=title, summary=summary)
+
+
+def test_clear_positive_text_is_confident(engine):
+    score, confidence = engine.score_text("Nike shares surge after strong quarterly profit")
+
+    assert score > 0.5
+    assert confidence >= engine.min_confidence
+
+
+def test_clear_negative_text_is_confident(engine):
+    score, confidence = engine.score_text("Nike shares sink as sales slide in China")
+
+    assert score < -0.5
+    assert confidence >= engine.min_confidence
+
+
+def test_negation_flips_the_valence(engine):
+    assert engine.score_text("The launch was successful")[0] > 0
+    assert engine.score_text("The launch was not successful")[0] < 0
+    assert engine.score_text("The launch wasn't successful")[0] < 0
+
+
+def test_clause_after_but_outweighs_the_one_before(engine):
+    score, _ = engine.score_text("Revenue grew, but margins fell and guidance disappointed")
+
+    assert score < 0
+
+
+def test_mixed_text_has_low_confidence(engine):
+    _, confidence = engine.score_text("Strong sales growth offset by a recall and a lawsuit")
+
+    assert confidence < engine.min_confidence
+
+
+def test_text_without_evidence_is_escalated(engine):
+    score, confidence = engine.score_text("Boeing faces FAA grounding order after door plug blowout")
+
+    assert score == 0.0
+    assert confidence < engine.min_confidence
+
+
+def test_score_articles_splits_confident_and_ambiguous(engine):
+    articles = [
+        make_article("Nike", "Nike profits soar on record demand"),
+        make_article("Boeing", "Boeing faces FAA grounding order after door plug blowout")
+    ]
+
+    confident, ambiguous = engine.score_articles(articles)
+
+    assert [item.article.brand for item in confident] == ["Nike"]
+    assert confident[0].label == "positive"
+    assert [item.article.brand for item in ambiguous] == ["Boeing"]
+
+
+def test_aggregate_merges_escalated_rows(engine):
+    confident, _ = engine.score_articles([
+        make_article("Nike", "Nike profits soar on record demand"),
+        make_article("Nike", "Nike shares sink as sales slide in China")
+    ])
+    escalated = SentimentResults(rows=[
+        SentimentRow(brand="Boeing", positive=0, neutral=0, negative=1, avg_sentiment_score=-0.8)
+    ])
+
+    rows = {row.brand: row for row in engine.aggregate(confident, escalated).rows}
+
+    assert (rows["Nike"].positive, rows["Nike"].neutral, rows["Nike"].negative) == (1, 0, 1)
+    assert -1.0 <= rows["Nike"].avg_sentiment_score <= 1.0
+    assert rows["Boeing"].negative == 1
+    assert rows["Boeing"].avg_sentiment_score == -0.8
@@ -0,0 +1,102 @@
+import pytest
+from tools.url_index import UrlIndex, canonicalize_url, extract_canonical
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("https://www.Example.com/news/story/?utm_source=x&fbclid=1#top", "https://example.com/news/story"),
+    ("http://example.com:80/a?b=2&a=1", "https://example.com/a?a=1&b=2"),
+    ("https://amp.example.com/news/story", "https://example.com/news/story"),
+    ("https://example.com/news/story.amp", "https://example.com/news/story"),
+    ("https://example.com/news/story.amp.html", "https://example.com/news/story.html"),
+    ("https://www-example-com.cdn.ampproject.org/c/s/www.example.com/news/story", "https://example.com/news/story"),
+    ("https://www.google.com/amp/s/www.example.com/news/story", "https://example.com/news/story"),
+])
+def test_variants_share_a_canonical_url(url, expected):
+    assert canonicalize_url(url) == expected
+
+
+def test_amp_dev_keeps_its_domain():
+    assert canonicalize_url("http://amp.dev/documentation/") == "https://amp.dev/documentation"
+
+
+def test_amp_path_segments_are_kept():
+    assert canonicalize_url("https://example.com/news/amp") == "https://example.com/news/amp"
+    assert canonicalize_url("https://example.com/amp/story") == "https://example.com/amp/story"
+
+
+def test_escaped_slashes_stay_escaped():
+    assert canonicalize_url("https://example.com/a%2Fb") == "https://example.com/a%2Fb"
+    assert canonicalize_url("https://example.com/a%2fb") != canonicalize_url("https://example.com/a/b")
+
+
+def test_escapes_are_normalized():
+    assert canonicalize_url("https://example.com/%7Euser/caf%c3%a9") == canonicalize_url("https://example.com/~user/café")
+
+
+def test_extract_canonical_resolves_relative_links():
+    html = '<html><head><link rel="canonical" href="/news/story?utm_medium=rss"></head></html>'
+
+    assert extract_canonical(html, "https://amp.example.com/news/story.amp") == "https://example.com/news/story"
+
+
+def test_aliases_resolve_to_the_canonical_url(tmp_path):
+    index = UrlIndex(str(tmp_path / "index.sqlite"))
+    index.add_alias("https://partner.example.org/syndicated/123", "https://example.com/news/story")
+
+    assert index.resolve("https://partner.example.org/syndicated/123?utm_source=feed") == "https://example.com/news/story"
+
+
+def test_search_results_keep_original_links_and_drop_variants(monkeypatch):
+    from tools.search_tools import SearchTools
+
+    results = {"organic": [
+        {"title": "Story", "link": "http://www.example.com/news/story?utm_source=rss", "snippet": "s"},
+        {"title": "Story (AMP)", "link": "https://amp.example.com/news/story", "snippet": "s"},
+        {"title": "Docs", "link": "http://amp.dev/documentation/", "snippet": "d"}
+    ]}
+    monkeypatch.setattr(SearchTools, "_search", lambda self, query: results)
+
+    output = SearchTools()._run("example news")
+
+    assert "Link: http://www.example.com/news/story?utm_source=rss" in output
+    assert "Story (AMP)" not in output
+    assert "Link: http://amp.dev/documentation/" in output
+
+
+ARTICLE = " ".join(f"Nike reported quarterly revenue growth in region {idx} as demand for running shoes rose." for idx in range(20))
+CONSENT_WALL = "We value your privacy. We and our partners use cookies. Accept all or manage your choices."
+
+
+def test_short_pages_are_not_fingerprinted():
+    from tools.url_index import content_fingerprint
+
+    assert content_fingerprint(CONSENT_WALL) is None
+    assert content_fingerprint(ARTICLE) is not None
+
+
+def test_near_duplicates_match_within_the_window(tmp_path):
+    from tools.url_index import content_fingerprint
+
+    index = UrlIndex(str(tmp_path / "index.sqlite"))
+    index.save_article("https://example.com/story", "summary", content_fingerprint(ARTICLE))
+
+    duplicate = index.find_near_duplicate(content_fingerprint(ARTICLE + " Updated."), exclude="https://partner.example.org/story")
+
+    assert duplicate == ("https://example.com/story", "summary")
+
+
+def test_aliases_expire_with_the_window(tmp_path):
+    index = UrlIndex(str(tmp_path / "index.sqlite"), window_seconds=3600)
+    index.add_alias("https://partner.example.org/story", "https://example.com/news/story")
+    assert index.resolve("https://partner.example.org/story") == "https://example.com/news/story"
+
+    index._connect().execute("UPDATE url_aliases SET updated_at = updated_at - 7200")
+
+    assert index.resolve("https://partner.example.org/story") == "https://partner.example.org/story"
+
+
+def test_canonical_pointing_at_the_homepage_is_ignored():
+    html = '<link rel="canonical" href="https://example.com/">'
+
+    assert extract_canonical(html, "https://example.com/news/story") is None
+    assert extract_canonical(html, "https://www.example.com/") == "https://example.com/"
@@ -0,0 +1,29 @@
+import importlib
+import threading
+
+# Tool name -> (module, class). Modules are imported the first time a tool is requested.
+TOOL_REGISTRY = {
+    "search": ("tools.search_tools", "SearchTools"),
+    "browser": ("tools.browser_tools", "BrowserTools"),
+    "finance": ("tools.finance_tools", "YFinanceTools"),
+}
+
+_tool_classes = {}
+_tool_classes_lock = threading.Lock()
+
+
+def get_tool_class(name):
+    """
+    Returns the tool class registered under name, importing its module lazily.
+    """
+    with _tool_classes_lock:
+        if name not in _tool_classes:
+            if name not in TOOL_REGISTRY:
+                raise KeyError(f"Unknown tool: {name}")
+            module_name, class_name = TOOL_REGISTRY[name]
+            _tool_classes[name] = getattr(importlib.import_module(module_name), class_name)
+        return _tool_classes[name]
+
+
+def create_tool(name):
+    return get_tool_class(name)()
@@ -1,12 +1,21 @@
+import os
 import json
-import requests
-import streamlit as st
+import threading
 import logging
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
 from crewai.tools import BaseTool
-from unstructured.partition.html import partition_html
-from crewai import Task, Agent, LLM
+from crewai import Task, Agent
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
+from tools.http_client import get_http_client
+from tools.scrape_cache import get_scrape_cache, content_hash
+from tools.url_index import get_url_index, extract_canonical, content_fingerprint
+from tools.html_chunking import clean_elements, pack_chunks
+from tools.object_pool import ObjectPool
+from tools.secret_provider import require_secret
+from tools.llm_cache import create_llm
+from tools.instrumentation import timed, track_agent_tokens
 
 load_dotenv()
 
@@ -14,6 +23,47 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Maximum number of chunks summarized at the same time
+SUMMARY_CONCURRENCY = int(os.getenv("BROWSER_SUMMARY_CONCURRENCY", "4"))
+
+# browserless content endpoint (overridable for local stand-ins)
+BROWSERLESS_URL = os.getenv("BROWSERLESS_URL", "https://chrome.browserless.io/content")
+
+# Summarizer agents shared by all scrapes; caps concurrent summaries process-wide
+SUMMARIZER_POOL_SIZE = int(os.getenv("BROWSER_SUMMARIZER_POOL_SIZE", "8"))
+
+def _build_research_agent(llm):
+    return Agent(
+        role="Principal Researcher",
+        goal="Conduct in-depth research to gather accurate, relevant, and insightful information that supports strategic decision-making.",
+        backstory=(
+            "You are a highly analytical and detail-driven Principal Researcher with years of experience synthesizing complex information into actionable insights. "
+            "Known for your methodical approach and critical thinking, you specialize in uncovering valuable patterns, trends, and data-driven stories. "
+            "Your work enables teams to make informed choices across domains such as travel, business, technology, or policy. "
+            "You prioritize clarity, accuracy, and relevance in every report you produce."
+        ),
+        allow_delegation=False,
+        llm=llm
+    )
+
+_summarizer_pool = None
+_summarizer_pool_lock = threading.Lock()
+
+def get_summarizer_pool():
+    """
+    Returns the shared pool of summarizer agents, which all use one LLM client.
+    """
+    global _summarizer_pool
+    with _summarizer_pool_lock:
+        if _summarizer_pool is None:
+            logger.info("Initializing LLM model")
+            llm = create_llm()
+            _summarizer_pool = ObjectPool(lambda: _build_research_agent(llm), SUMMARIZER_POOL_SIZE)
+        return _summarizer_pool
+
+def warm_summarizer_pool():
+    get_summarizer_pool().warm(SUMMARY_CONCURRENCY)
+
 class WebsiteInput(BaseModel):
     """
     Defines the schema for the website scraping input.
@@ -28,77 +78,198 @@ class BrowserTools(BaseTool):
     description: str = "Useful to scrape and summarize a website content"
     args_schema: type[BaseModel] = WebsiteInput
 
-    def _run(self, website: str) -> str:
+    def _summarize_chunk(self, chunk, idx, total):
         """
-        Scrapes the content of a website and summarizes it using an LLM agent.
+        Summarizes a single chunk of page content with a pooled agent.
         """
-        try:
-            logger.info(f"Starting website scraping for: {website}")
-
-            # Prepare API endpoint and headers for browserless.io
-            api_key = st.secrets["BROWSERLESS_API_KEY"]
-            url = f"https://chrome.browserless.io/content?token={api_key}"
-            payload = json.dumps({"url": website})
-            headers = {
-                "Cache-Control": "no-cache",
-                "Content-Type": "application/json"
-            }
+        logger.info(f"Processing chunk {idx+1}/{total}")
+        with get_summarizer_pool().acquire() as agent, track_agent_tokens(agent):
+            return self._execute_summary(agent, chunk, idx)
 
-            logger.info("Sending POST request to browserless.io API")
-            response = requests.post(url, headers=headers, data=payload)
+    def _execute_summary(self, agent, chunk, idx):
+        task = Task(
+            description=(
+                "You are tasked with performing high-quality background research on the assigned topic. "
+                "This may include collecting data from reliable sources, summarizing key insights, comparing options, and identifying notable trends or considerations.\n\n"
+                f"**Topic**: {chunk}\n\n"
+                "Your goal is to:\n"
+                "- Analyze credible, up-to-date sources.\n"
+                "- Structure your findings clearly and concisely.\n"
+                "- Ensure all data supports the decision or planning process that follows.\n\n"
+                "Use a formal, well-organized tone and include references if relevant. Present your output as a research summary with headings, bullet points, and clear structure."
+            ),
+            expected_output="A structured research summary of the topic with headings and bullet points.",
+            agent=agent
+        )
 
-            if response.status_code != 200:
-                logger.error(f"Search API request failed. Status Code: {response.status_code}")
-                return f"Error: Search API request failed. Status Code: {response.status_code}"
+        logger.info(f"Executing summarization task for chunk {idx+1}")
+        return task.execute_sync(agent=agent).raw
 
-            logger.info("Partitioning HTML content")
-            elements = partition_html(text=response.text)
-            content = "\n\n".join(str(el) for el in elements)
+    def _combine_summaries(self, summaries):
+        """
+        Merges the ordered chunk summaries into one coherent summary.
+        Falls back to plain concatenation if the merge step fails.
+        """
+        if len(summaries) == 1:
+            return summaries[0]
 
-            logger.info("Splitting content into manageable chunks")
-            chunk_size = 8000
-            content_chunks = [content[i:i+chunk_size] for i in range(0, len(content), chunk_size)]
-            summaries = []
-
-            logger.info("Initializing LLM model")
-            llm = LLM(model="gemini/gemini-2.0-flash")
-
-            for idx, chunk in enumerate(content_chunks):
-                logger.info(f"Processing chunk {idx+1}/{len(content_chunks)}")
-                agent = Agent(
-                    role="Principal Researcher",
-                    goal="Conduct in-depth research to gather accurate, relevant, and insightful information that supports strategic decision-making.",
-                    backstory=(
-                        "You are a highly analytical and detail-driven Principal Researcher with years of experience synthesizing complex information into actionable insights. "
-                        "Known for your methodical approach and critical thinking, you specialize in uncovering valuable patterns, trends, and data-driven stories. "
-                        "Your work enables teams to make informed choices across domains such as travel, business, technology, or policy. "
-                        "You prioritize clarity, accuracy, and relevance in every report you produce."
-                    ),
-                    allow_delegation=False,
-                    llm=llm
-                )
+        joined = "\n\n".join(f"### Part {idx+1}\n{summary}" for idx, summary in enumerate(summaries))
+        description = (
+            "The following are summaries of consecutive parts of the same web page, in page order.\n\n"
+            f"{joined}\n\n"
+            "Merge them into a single coherent research summary of the whole page. "
+            "Remove repetition, keep every distinct fact, figure and reference, and preserve the original order of topics. "
+            "Present your output with headings, bullet points, and clear structure."
+        )
 
+        try:
+            with get_summarizer_pool().acquire() as agent, track_agent_tokens(agent):
                 task = Task(
-                    description=(
-                        "You are tasked with performing high-quality background research on the assigned topic. "
-                        "This may include collecting data from reliable sources, summarizing key insights, comparing options, and identifying notable trends or considerations.\n\n"
-                        f"**Topic**: {chunk}\n\n"
-                        "Your goal is to:\n"
-                        "- Analyze credible, up-to-date sources.\n"
-                        "- Structure your findings clearly and concisely.\n"
-                        "- Ensure all data supports the decision or planning process that follows.\n\n"
-                        "Use a formal, well-organized tone and include references if relevant. Present your output as a research summary with headings, bullet points, and clear structure."
-                    ),
+                    description=description,
+                    expected_output="A single structured research summary of the whole page.",
                     agent=agent
                 )
+                return task.execute_sync(agent=agent).raw
+        except Exception as e:
+            logger.error(f"Failed to merge chunk summaries, concatenating instead: {str(e)}")
+            return "\n\n".join(summaries)
 
-                logger.info(f"Executing summarization task for chunk {idx+1}")
-                summary = task.execute()
-                summaries.append(summary)
+    @timed("tool", "browser")
+    def _run(self, website: str) -> str:
+        """
+        Scrapes the content of a website and summarizes it using an LLM agent.
+        Articles summarized within the URL index window are returned without
+        fetching them again, whichever tracking or AMP variant of the URL is passed.
+        """
+        try:
+            index = get_url_index()
+            if index is None:
+                return self._scrape(website, website)
 
-            logger.info("Combining all summaries")
-            return "\n\n".join(summaries)
+            canonical = index.resolve(website)
+            with index.claim(canonical):
+                summary = index.get_summary(canonical)
+                if summary is not None:
+                    logger.info(f"Article already summarized, returning indexed summary for: {canonical}")
+                    return summary
+                return self._scrape(website, canonical, index)
 
         except Exception as e:
             logger.error(f"Error while processing the website: {str(e)}")
-            return f"Error while processing the website: {str(e)}"
\ No newline at end of file
+            return f"Error while processing the website: {str(e)}"
+
+    def _scrape(self, website, page_key, index=None):
+        """
+        Fetches and summarizes one page. page_key identifies the page in the
+        scrape cache and the URL index.
+        """
+        logger.info(f"Starting website scraping for: {website}")
+
+        # Prepare API endpoint and headers for browserless.io
+        api_key = require_secret("BROWSERLESS_API_KEY")
+        url = f"{BROWSERLESS_URL}?token={api_key}"
+        payload = json.dumps({"url": website})
+        headers = {
+            "Cache-Control": "no-cache",
+            "Content-Type": "application/json"
+        }
+
+        logger.info("Sending POST request to browserless.io API")
+        response = get_http_client().post("browserless", url, headers=headers, data=payload)
+
+        if response.status_code != 200:
+            logger.error(f"Search API request failed. Status Code: {response.status_code}")
+            return f"Error: Search API request failed. Status Code: {response.status_code}"
+
+        def remember(summary, fingerprint=None):
+            if index is not None:
+                index.save_article(page_key, summary, fingerprint)
+            return summary
+
+        # Syndicated copies declare the original article as canonical
+        if index is not None:
+            declared = extract_canonical(response.text, website)
+            if declared and declared != page_key:
+                index.add_alias(website, declared)
+                index.add_alias(page_key, declared)
+                page_key = declared
+                summary = index.get_summary(page_key)
+                if summary is not None:
+                    logger.info(f"Canonical article already summarized, returning indexed summary for: {page_key}")
+                    return summary
+
+        # Unchanged pages are served from the scrape cache
+        cache = get_scrape_cache()
+        html_hash = content_hash(response.text)
+        cached_page = cache.get_page(page_key) if cache is not None else None
+        if cached_page is not None and cached_page.html_hash == html_hash:
+            logger.info(f"Page unchanged, returning cached summary for: {page_key}")
+            cache.touch(page_key)
+            cache.record_lookup(hit=True)
+            return remember(cached_page.summary)
+
+        logger.info("Partitioning HTML content")
+        # unstructured is slow to import, so load it on first use
+        from unstructured.partition.html import partition_html
+        elements = partition_html(text=response.text)
+        content = "\n\n".join(clean_elements(elements))
+
+        # Markup-only changes leave the extracted text, and so the summary, unchanged
+        fingerprint = content_fingerprint(content)
+        if cached_page is not None and cached_page.text_hash == content_hash(content):
+            logger.info(f"Page text unchanged, returning cached summary for: {page_key}")
+            cache.save_page(page_key, html_hash, content, cached_page.summary, cache.get_chunk_summaries(page_key))
+            cache.record_lookup(hit=True)
+            return remember(cached_page.summary, fingerprint)
+        if cache is not None:
+            cache.record_lookup(hit=False)
+
+        # The same article republished under another URL
+        if index is not None and fingerprint is not None:
+            duplicate = index.find_near_duplicate(fingerprint, exclude=page_key)
+            if duplicate is not None:
+                logger.info(f"Near-duplicate of {duplicate[0]}, returning its summary for: {page_key}")
+                index.add_alias(page_key, duplicate[0])
+                return duplicate[1]
+
+        logger.info("Packing content into token-budgeted chunks")
+        content_chunks = pack_chunks(content.split("\n\n")) if content else []
+        if not content_chunks:
+            return "No content found on the website"
+
+        # Reuse summaries of chunks that did not change since the last scrape
+        chunk_hashes = [content_hash(chunk) for chunk in content_chunks]
+        known_summaries = cache.get_chunk_summaries(page_key) if cache is not None else {}
+        stale_chunks = [
+            (idx, chunk) for idx, chunk in enumerate(content_chunks)
+            if chunk_hashes[idx] not in known_summaries
+        ]
+        logger.info(f"Summarizing {len(stale_chunks)}/{len(content_chunks)} changed chunks")
+
+        # Summarize chunks concurrently, collecting the results in page order
+        new_summaries = {}
+        if stale_chunks:
+            workers = max(1, min(SUMMARY_CONCURRENCY, len(stale_chunks)))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="chunk-summary") as executor:
+                # Run each summary in a copy of this context so it is counted for the request
+                futures = [
+                    (idx, executor.submit(contextvars.copy_context().run, self._summarize_chunk, chunk, idx, len(content_chunks)))
+                    for idx, chunk in stale_chunks
+                ]
+                for idx, future in futures:
+                    new_summaries[chunk_hashes[idx]] = future.result()
+        chunk_summaries = {**known_summaries, **new_summaries}
+        summaries = [chunk_summaries[chunk_hash] for chunk_hash in chunk_hashes]
+
+        logger.info("Combining all summaries")
+        summary = self._combine_summaries(summaries)
+
+        if cache is not None:
+            cache.save_page(
+                page_key,
+                html_hash,
+                content,
+                summary,
+                {chunk_hash: chunk_summaries[chunk_hash] for chunk_hash in chunk_hashes}
+            )
+        return remember(summary, fingerprint)
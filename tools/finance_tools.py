@@ -1,109 +1,132 @@
+import os
+import re
 import json
 import logging
-import yfinance as yf
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
 from typing import Dict, Any
 from datetime import datetime, timedelta
-import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from tools.instrumentation import timed
 
 # Configure logger for this module
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# Days of price history loaded for the comparative metrics (covers the 90-day window)
+HISTORY_DAYS = int(os.getenv("FINANCE_HISTORY_DAYS", "180"))
+
 # Define the schema for the ticker query input
 class TickerQuery(BaseModel):
-    ticker: str = Field(..., description="The stock ticker symbol to look up (e.g., AAPL, GOOGL, MSFT)")
+    ticker: str = Field(..., description="The stock ticker symbol to look up (e.g., AAPL), or several comma-separated symbols (e.g., AAPL, GOOGL, MSFT)")
 
 # Define the YFinance tool class
 class YFinanceTools(BaseTool):
     name: str = "Get Stock Financial Data"
-    description: str = "Useful to get financial data about a stock ticker including current price, historical performance, and key metrics"
+    description: str = "Useful to get financial data about one or more stock tickers including current price, historical performance, and key metrics. Pass several tickers comma-separated to fetch them in one call"
     args_schema: type[BaseModel] = TickerQuery
 
     # Main method to run the financial data fetch
+    @timed("tool", "finance")
     def _run(self, ticker: str) -> str:
+        # pandas is slow to import, so load it on first use
+        from tools.price_store import get_history
+
+        # Several tickers go through the batched path
+        tickers = [t for t in re.split(r"[,\s]+", ticker.upper()) if t]
+        if len(tickers) > 1:
+            return self.get_multiple_tickers(tickers)
+        ticker = tickers[0] if tickers else ticker.strip()
+
         try:
             logger.info(f"Starting financial data fetch for ticker: {ticker}")
             
-            # Create a yfinance ticker object
-            stock = yf.Ticker(ticker.upper())
-            
             # Get stock info
-            info = stock.info
+            info = self._fetch_info(ticker.upper())
             logger.debug(f"Retrieved stock info for {ticker}")
             
-            # Get historical data for the last 30 days
+            # Get historical data for the last 30 days from the local price store
             end_date = datetime.now()
             start_date = end_date - timedelta(days=30)
-            hist_data = stock.history(start=start_date, end=end_date)
+            hist_data = get_history([ticker], start_date, end_date)[ticker.upper()]
             
             if hist_data.empty:
                 logger.warning(f"No historical data found for ticker: {ticker}")
                 return f"No historical data found for ticker: {ticker}"
             
-            # Calculate key metrics
-            current_price = hist_data['Close'].iloc[-1] if not hist_data.empty else None
-            
-            # Calculate 7-day change
-            if len(hist_data) >= 7:
-                price_7d_ago = hist_data['Close'].iloc[-7]
-                change_7d = ((current_price - price_7d_ago) / price_7d_ago) * 100
-            else:
-                change_7d = None
-            
-            # Calculate volatility (standard deviation of returns)
-            returns = hist_data['Close'].pct_change().dropna()
-            volatility = returns.std() * 100  # Convert to percentage
-            
-            # Determine volatility category
-            if volatility < 2:
-                volatility_category = "Low"
-            elif volatility < 5:
-                volatility_category = "Moderate"
-            else:
-                volatility_category = "High"
-            
-            # Get volume data
-            avg_volume = hist_data['Volume'].mean()
-            current_volume = hist_data['Volume'].iloc[-1]
-            
-            # Extract key company information
-            company_name = info.get('longName', 'N/A')
-            market_cap = info.get('marketCap', 'N/A')
-            pe_ratio = info.get('trailingPE', 'N/A')
-            dividend_yield = info.get('dividendYield', 'N/A')
-            
-            # Format dividend yield as percentage if available
-            if dividend_yield != 'N/A' and dividend_yield is not None:
-                dividend_yield = f"{dividend_yield * 100:.2f}%"
-            
-            # Format market cap
-            if market_cap != 'N/A' and market_cap is not None:
-                if market_cap >= 1e12:
-                    market_cap = f"${market_cap / 1e12:.2f}T"
-                elif market_cap >= 1e9:
-                    market_cap = f"${market_cap / 1e9:.2f}B"
-                elif market_cap >= 1e6:
-                    market_cap = f"${market_cap / 1e6:.2f}M"
-            
-            # Create formatted result
-            formatted_result = {
-                "ticker": ticker.upper(),
-                "company": company_name,
-                "current_price": f"${current_price:.2f}" if current_price else "N/A",
-                "change_7d": f"{change_7d:.2f}%" if change_7d is not None else "N/A",
-                "volatility": f"{volatility:.2f}% ({volatility_category})" if volatility else "N/A",
-                "market_cap": market_cap,
-                "pe_ratio": f"{pe_ratio:.2f}" if pe_ratio and pe_ratio != 'N/A' else "N/A",
-                "dividend_yield": dividend_yield,
-                "avg_volume": f"{avg_volume:,.0f}" if avg_volume else "N/A",
-                "current_volume": f"{current_volume:,.0f}" if current_volume else "N/A",
-                "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            }
+            result_string = self._format_ticker_data(ticker, hist_data['Close'], hist_data['Volume'], info)
+            logger.info(f"Successfully retrieved financial data for {ticker}")
+            return result_string
             
-            # Format the output as a readable string
-            result_string = f"""
+        except Exception as e:
+            logger.exception(f"Error fetching financial data for {ticker}: {str(e)}")
+            return f"Error fetching financial data for {ticker}: {str(e)}"
+
+    # Compute metrics from a ticker's close and volume series and format them
+    def _format_ticker_data(self, ticker: str, close: "pd.Series", volume: "pd.Series", info: Dict[str, Any]) -> str:
+        import pandas as pd
+        from tools.metrics_engine import window_return
+
+        # Calculate key metrics
+        current_price = close.iloc[-1] if not close.empty else None
+        
+        # Calculate 7-day change, as the return_7d of the metrics table
+        change_7d = window_return(close, 7) if not close.empty else None
+        if change_7d is not None and pd.isna(change_7d):
+            change_7d = None
+        
+        # Calculate volatility (standard deviation of returns)
+        returns = close.pct_change().dropna()
+        volatility = returns.std() * 100  # Convert to percentage
+        
+        # Determine volatility category
+        if volatility < 2:
+            volatility_category = "Low"
+        elif volatility < 5:
+            volatility_category = "Moderate"
+        else:
+            volatility_category = "High"
+        
+        # Get volume data
+        avg_volume = volume.mean()
+        current_volume = volume.iloc[-1]
+        
+        # Extract key company information
+        company_name = info.get('longName', 'N/A')
+        market_cap = info.get('marketCap', 'N/A')
+        pe_ratio = info.get('trailingPE', 'N/A')
+        dividend_yield = info.get('dividendYield', 'N/A')
+        
+        # Format dividend yield as percentage if available
+        if dividend_yield != 'N/A' and dividend_yield is not None:
+            dividend_yield = f"{dividend_yield * 100:.2f}%"
+        
+        # Format market cap
+        if market_cap != 'N/A' and market_cap is not None:
+            if market_cap >= 1e12:
+                market_cap = f"${market_cap / 1e12:.2f}T"
+            elif market_cap >= 1e9:
+                market_cap = f"${market_cap / 1e9:.2f}B"
+            elif market_cap >= 1e6:
+                market_cap = f"${market_cap / 1e6:.2f}M"
+        
+        # Create formatted result
+        formatted_result = {
+            "ticker": ticker.upper(),
+            "company": company_name,
+            "current_price": f"${current_price:.2f}" if current_price else "N/A",
+            "change_7d": f"{change_7d:.2f}%" if change_7d is not None else "N/A",
+            "volatility": f"{volatility:.2f}% ({volatility_category})" if volatility else "N/A",
+            "market_cap": market_cap,
+            "pe_ratio": f"{pe_ratio:.2f}" if pe_ratio and pe_ratio != 'N/A' else "N/A",
+            "dividend_yield": dividend_yield,
+            "avg_volume": f"{avg_volume:,.0f}" if avg_volume else "N/A",
+            "current_volume": f"{current_volume:,.0f}" if current_volume else "N/A",
+            "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        }
+        
+        # Format the output as a readable string
+        result_string = f"""
 Financial Data for {ticker.upper()}:
 Company: {formatted_result['company']}
 Current Price: {formatted_result['current_price']}
@@ -116,27 +139,92 @@ Average Volume (30d): {formatted_result['avg_volume']}
 Current Volume: {formatted_result['current_volume']}
 Last Updated: {formatted_result['last_updated']}
 """
-            
-            logger.info(f"Successfully retrieved financial data for {ticker}")
-            return result_string.strip()
-            
+        return result_string.strip()
+
+    # Fetch company info for one ticker, tolerating lookup failures
+    def _fetch_info(self, ticker: str) -> Dict[str, Any]:
+        import yfinance as yf
+        try:
+            return yf.Ticker(ticker).info or {}
         except Exception as e:
-            logger.exception(f"Error fetching financial data for {ticker}: {str(e)}")
-            return f"Error fetching financial data for {ticker}: {str(e)}"
+            logger.warning(f"Could not fetch company info for {ticker}: {str(e)}")
+            return {}
+
+    # Fetch per-ticker sections and price history for several tickers at once
+    def fetch_ticker_data(self, tickers: list):
+        """
+        Returns a dict of ticker to formatted section and a dict of ticker to
+        price history. Missing price history for all tickers is fetched in one
+        bulk download; a failing ticker gets an error section.
+        """
+        import pandas as pd
+        from tools.price_store import get_history
+
+        tickers = list(dict.fromkeys(t.upper() for t in tickers))
+        logger.info(f"Starting batched financial data fetch for tickers: {', '.join(tickers)}")
+
+        # Load price history for every ticker, downloading anything missing in one request
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=30)
+        history = get_history(tickers, end_date - timedelta(days=HISTORY_DAYS), end_date)
+
+        # Company info has no bulk endpoint; look it up concurrently
+        with ThreadPoolExecutor(max_workers=min(8, len(tickers))) as executor:
+            infos = dict(zip(tickers, executor.map(self._fetch_info, tickers)))
+
+        sections = {}
+        for ticker in tickers:
+            try:
+                recent = history[ticker][history[ticker].index >= pd.Timestamp(start_date).normalize()]
+                close = recent["Close"].dropna()
+                if close.empty:
+                    logger.warning(f"No historical data found for ticker: {ticker}")
+                    sections[ticker] = f"No historical data found for ticker: {ticker}"
+                    continue
+                volume = recent["Volume"].reindex(close.index).fillna(0)
+                sections[ticker] = self._format_ticker_data(ticker, close, volume, infos[ticker])
+            except Exception as e:
+                logger.warning(f"Error computing financial data for {ticker}: {str(e)}")
+                sections[ticker] = f"Error fetching financial data for {ticker}: {str(e)}"
+
+        logger.info(f"Successfully retrieved batched financial data for {len(tickers)} tickers")
+        return sections, history
+
+    # Combine fetched sections for a subset of tickers with their comparative metrics
+    def format_ticker_panel(self, tickers: list, sections: dict, history: dict) -> str:
+        """
+        Formats the sections of the given tickers followed by a comparative
+        metrics table. The first ticker is used as the benchmark for beta.
+        """
+        from tools.metrics_engine import build_panel, compute_panel_metrics, format_metrics_table
+
+        tickers = list(dict.fromkeys(t.upper() for t in tickers))
+        results = [sections[ticker] for ticker in tickers if ticker in sections]
+
+        # Comparative metrics for the whole panel, benchmarked on the first ticker
+        available = {ticker: history[ticker] for ticker in tickers if ticker in history and not history[ticker].empty}
+        if available:
+            metrics = compute_panel_metrics(
+                build_panel(available, "Close"),
+                build_panel(available, "Volume"),
+                benchmark=tickers[0]
+            )
+            results.append(
+                f"Comparative Metrics (returns, volatility and drawdown in %, beta vs {tickers[0]}):\n"
+                + format_metrics_table(metrics)
+            )
+        return ("\n" + "="*50 + "\n").join(results)
 
     # Helper method to get multiple tickers at once
     def get_multiple_tickers(self, tickers: list) -> str:
         """
-        Get financial data for multiple tickers at once
+        Get financial data for multiple tickers at once, with a comparative
+        metrics table benchmarked on the first ticker.
         """
         try:
-            results = []
-            for ticker in tickers:
-                result = self._run(ticker)
-                results.append(result)
-            
-            return "\n" + "="*50 + "\n".join(results)
+            sections, history = self.fetch_ticker_data(tickers)
+            return self.format_ticker_panel(tickers, sections, history)
             
         except Exception as e:
             logger.exception(f"Error fetching multiple ticker data: {str(e)}")
-            return f"Error fetching multiple ticker data: {str(e)}"
\ No newline at end of file
+            return f"Error fetching multiple ticker data: {str(e)}"
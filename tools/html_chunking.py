@@ -0,0 +1,104 @@
+import os
+import re
+import math
+import logging
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# Token budget per chunk sent to the summarizer
+CHUNK_TOKEN_BUDGET = int(os.getenv("BROWSER_CHUNK_TOKENS", "3000"))
+
+# partition_html element categories that never carry article content
+DROPPED_CATEGORIES = {"Header", "Footer", "Image", "PageBreak", "PageNumber", "EmailAddress", "Address", "Formula"}
+
+# Uncategorized fragments shorter than this many words are treated as navigation noise
+MIN_UNCATEGORIZED_WORDS = 6
+
+# Common navigation, consent and footer phrases
+BOILERPLATE_PATTERNS = re.compile(
+    r"(accept (all )?cookies|cookie (policy|settings|preferences)|we use cookies|"
+    r"privacy policy|terms (of (use|service)|and conditions)|all rights reserved|"
+    r"^©|copyright ©|subscribe to (our|the) newsletter|sign up for (our|the) newsletter|"
+    r"^(sign in|log in|sign up|register|subscribe|share|menu|search|skip to (main )?content)$|"
+    r"follow us on|advertisement|^related (articles|stories)$)",
+    re.IGNORECASE
+)
+
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+")
+
+
+def estimate_tokens(text):
+    """
+    Cheap token estimate (about four characters per token for English text).
+    """
+    return math.ceil(len(text) / 4)
+
+
+def clean_elements(elements):
+    """
+    Returns the text of content-bearing elements, dropping layout element
+    types, boilerplate phrases and repeated elements.
+    """
+    texts, seen = [], set()
+    for element in elements:
+        category = getattr(element, "category", None)
+        if category in DROPPED_CATEGORIES:
+            continue
+
+        text = " ".join(str(element).split())
+        if not text or (BOILERPLATE_PATTERNS.search(text) and len(text.split()) < 30):
+            continue
+        if category == "UncategorizedText" and len(text.split()) < MIN_UNCATEGORIZED_WORDS:
+            continue
+
+        # Pages repeat teasers, bylines and navigation; keep the first copy only
+        key = re.sub(r"\W+", "", text.casefold())
+        if key in seen:
+            continue
+        seen.add(key)
+        texts.append(text)
+
+    logger.info(f"Kept {len(texts)}/{len(elements)} elements after cleanup")
+    return texts
+
+
+def _split_oversized(text, max_tokens):
+    # Split on sentence boundaries, falling back to word boundaries for
+    # sentences that are themselves over budget
+    units = []
+    for sentence in SENTENCE_BOUNDARY.split(text):
+        if estimate_tokens(sentence) <= max_tokens:
+            units.append(sentence)
+            continue
+        part = ""
+        for word in sentence.split():
+            if part and estimate_tokens(part + " " + word) > max_tokens:
+                units.append(part)
+                part = word
+            else:
+                part = f"{part} {word}" if part else word
+        if part:
+            units.append(part)
+    return units
+
+
+def pack_chunks(texts, max_tokens=CHUNK_TOKEN_BUDGET):
+    """
+    Packs element texts into chunks of at most max_tokens, breaking only on
+    element boundaries (or sentence boundaries inside oversized elements).
+    """
+    chunks, current = [], ""
+    for text in texts:
+        units = _split_oversized(text, max_tokens) if estimate_tokens(text) > max_tokens else [text]
+        for position, unit in enumerate(units):
+            separator = " " if position else "\n\n"
+            if current and estimate_tokens(current + separator + unit) > max_tokens:
+                chunks.append(current)
+                current = unit
+            else:
+                current = current + separator + unit if current else unit
+    if current:
+        chunks.append(current)
+    return chunks
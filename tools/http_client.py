@@ -0,0 +1,174 @@
+import os
+import time
+import random
+import logging
+import threading
+from collections import deque
+import requests
+from requests.adapters import HTTPAdapter
+from tools.instrumentation import record_http
+from tools.rate_governor import get_rate_governor
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# Default (connect, read) timeouts in seconds per provider
+DEFAULT_TIMEOUTS = {
+    "serper": (3.05, 15),
+    "browserless": (5, 60),
+    "default": (5, 30)
+}
+
+# Status codes worth retrying
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class ProviderStats:
+    """
+    Latency and error counters for one provider.
+    """
+    def __init__(self, max_samples=1000):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.bytes_received = 0
+        self.latencies = deque(maxlen=max_samples)
+
+    def to_dict(self):
+        latencies = sorted(self.latencies)
+
+        def percentile(p):
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))], 4)
+
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "bytes_received": self.bytes_received,
+            "latency_p50": percentile(0.50),
+            "latency_p95": percentile(0.95),
+            "latency_max": round(latencies[-1], 4) if latencies else None
+        }
+
+
+class HttpClient:
+    """
+    Shared HTTP client for the tools: pooled keep-alive connections,
+    per-provider timeouts and retries with jittered exponential backoff.
+    Every attempt holds a rate governor slot for its provider.
+    """
+    def __init__(self, max_retries=3, backoff_base=0.5, backoff_max=10.0, pool_size=20):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def timeout_for(self, provider):
+        """
+        Returns the (connect, read) timeout for a provider, overridable with
+        HTTP_<PROVIDER>_CONNECT_TIMEOUT and HTTP_<PROVIDER>_READ_TIMEOUT.
+        """
+        connect, read = DEFAULT_TIMEOUTS.get(provider, DEFAULT_TIMEOUTS["default"])
+        prefix = f"HTTP_{provider.upper()}"
+        return (
+            float(os.getenv(f"{prefix}_CONNECT_TIMEOUT", connect)),
+            float(os.getenv(f"{prefix}_READ_TIMEOUT", read))
+        )
+
+    def _provider_stats(self, provider):
+        with self._lock:
+            if provider not in self._stats:
+                self._stats[provider] = ProviderStats()
+            return self._stats[provider]
+
+    def _backoff_delay(self, attempt, response):
+        # Honour Retry-After when the provider sends one
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after and retry_after.isdigit():
+                return min(float(retry_after), self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def request(self, provider, method, url, **kwargs):
+        """
+        Sends a request, retrying connection errors, timeouts and 429/5xx
+        responses. Returns the last response, or raises the last error.
+        """
+        kwargs.setdefault("timeout", self.timeout_for(provider))
+        stats = self._provider_stats(provider)
+
+        for attempt in range(self.max_retries + 1):
+            response, error = None, None
+            with get_rate_governor().slot(provider):
+                start = time.perf_counter()
+                try:
+                    response = self.session.request(method, url, **kwargs)
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    error = e
+                elapsed = time.perf_counter() - start
+            if response is not None:
+                get_rate_governor().feedback(provider, response.status_code, response.headers)
+
+            with self._lock:
+                stats.requests += 1
+                stats.latencies.append(elapsed)
+                if response is not None:
+                    stats.bytes_received += len(response.content)
+                if error is not None or response.status_code >= 400:
+                    stats.errors += 1
+            record_http(
+                provider,
+                "error" if error is not None else str(response.status_code),
+                retry=attempt > 0,
+                bytes_received=len(response.content) if response is not None else 0
+            )
+
+            if response is not None and response.status_code not in RETRY_STATUS_CODES:
+                return response
+            if attempt == self.max_retries:
+                if response is not None:
+                    return response
+                raise error
+
+            delay = self._backoff_delay(attempt, response)
+            reason = f"status {response.status_code}" if response is not None else str(error)
+            logger.warning(f"{provider} request failed ({reason}), retrying in {delay:.2f}s (attempt {attempt + 1}/{self.max_retries})")
+            with self._lock:
+                stats.retries += 1
+            time.sleep(delay)
+
+    def post(self, provider, url, **kwargs):
+        return self.request(provider, "POST", url, **kwargs)
+
+    def get(self, provider, url, **kwargs):
+        return self.request(provider, "GET", url, **kwargs)
+
+    def stats(self):
+        with self._lock:
+            return {provider: stats.to_dict() for provider, stats in self._stats.items()}
+
+
+_http_client = None
+_http_client_lock = threading.Lock()
+
+
+def get_http_client():
+    """
+    Returns the HTTP client shared by all tools.
+    """
+    global _http_client
+    with _http_client_lock:
+        if _http_client is None:
+            _http_client = HttpClient(
+                max_retries=int(os.getenv("HTTP_MAX_RETRIES", "3")),
+                backoff_base=float(os.getenv("HTTP_BACKOFF_BASE", "0.5"))
+            )
+        return _http_client
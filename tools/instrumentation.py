@@ -0,0 +1,275 @@
+import os
+import time
+import logging
+import threading
+import contextvars
+from contextlib import contextmanager
+from prometheus_client import Counter, Histogram, CollectorRegistry, CONTENT_TYPE_LATEST, generate_latest
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# USD per million (prompt, completion) tokens; LLM_PROMPT_PRICE_PER_MTOK and
+# LLM_COMPLETION_PRICE_PER_MTOK override the table for every model
+LLM_PRICES = {
+    "gemini/gemini-2.0-flash": (0.10, 0.40),
+    "gemini/gemini-2.0-flash-lite": (0.075, 0.30),
+    "gemini/gemini-1.5-pro": (1.25, 5.00)
+}
+
+STAGE_SECONDS = Histogram(
+    "brandscope_stage_seconds",
+    "Wall time of crews, tasks, tool calls and LLM calls",
+    ["stage", "name"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+)
+STAGE_ERRORS = Counter(
+    "brandscope_stage_errors_total",
+    "Crews, tasks, tool calls and LLM calls that raised",
+    ["stage", "name"]
+)
+HTTP_REQUESTS = Counter(
+    "brandscope_http_requests_total",
+    "Outbound HTTP attempts by provider and outcome",
+    ["provider", "outcome"]
+)
+HTTP_RETRIES = Counter(
+    "brandscope_http_retries_total",
+    "Outbound HTTP retries by provider",
+    ["provider"]
+)
+HTTP_BYTES = Counter(
+    "brandscope_http_bytes_received_total",
+    "Response bytes received by provider",
+    ["provider"]
+)
+LLM_TOKENS = Counter(
+    "brandscope_llm_tokens_total",
+    "LLM tokens by model and kind (prompt or completion)",
+    ["model", "kind"]
+)
+LLM_COST = Counter(
+    "brandscope_llm_cost_usd_total",
+    "Estimated LLM spend in USD by model",
+    ["model"]
+)
+RATE_LIMIT_WAIT = Histogram(
+    "brandscope_rate_limit_wait_seconds",
+    "Time spent waiting for a provider request slot",
+    ["provider", "priority"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+)
+CACHE_REQUESTS = Counter(
+    "brandscope_cache_requests_total",
+    "Cache lookups by cache and result (hit or miss)",
+    ["cache", "result"]
+)
+SENTIMENT_ARTICLES = Counter(
+    "brandscope_sentiment_articles_total",
+    "Articles scored by the local sentiment engine or escalated to the agent",
+    ["route"]
+)
+
+
+class RequestTimings:
+    """
+    Timing, token, HTTP and cache breakdown of one analysis, collected from
+    every thread that works on it.
+    """
+    def __init__(self):
+        self.stages = {}
+        self.tokens = {"prompt": 0, "completion": 0, "cost_usd": 0.0}
+        self.http = {}
+        self.cache = {}
+        self._lock = threading.Lock()
+
+    def add_stage(self, stage, name, seconds):
+        with self._lock:
+            entry = self.stages.setdefault(stage, {}).setdefault(name, {"calls": 0, "seconds": 0.0})
+            entry["calls"] += 1
+            entry["seconds"] += seconds
+
+    def add_tokens(self, prompt_tokens, completion_tokens, cost):
+        with self._lock:
+            self.tokens["prompt"] += prompt_tokens
+            self.tokens["completion"] += completion_tokens
+            self.tokens["cost_usd"] += cost
+
+    def add_http(self, provider, retry=False, bytes_received=0):
+        with self._lock:
+            entry = self.http.setdefault(provider, {"requests": 0, "retries": 0, "bytes_received": 0})
+            entry["requests"] += 1
+            entry["retries"] += int(retry)
+            entry["bytes_received"] += bytes_received
+
+    def add_cache(self, cache, hit):
+        with self._lock:
+            entry = self.cache.setdefault(cache, {"hits": 0, "misses": 0})
+            entry["hits" if hit else "misses"] += 1
+
+    def merge(self, data):
+        """
+        Adds a breakdown produced by to_dict(), e.g. one sent back by a crew
+        worker process.
+        """
+        with self._lock:
+            for stage, names in data.get("stages", {}).items():
+                for name, other in names.items():
+                    entry = self.stages.setdefault(stage, {}).setdefault(name, {"calls": 0, "seconds": 0.0})
+                    entry["calls"] += other["calls"]
+                    entry["seconds"] += other["seconds"]
+            for key in self.tokens:
+                self.tokens[key] += data.get("tokens", {}).get(key, 0)
+            for provider, other in data.get("http", {}).items():
+                entry = self.http.setdefault(provider, {"requests": 0, "retries": 0, "bytes_received": 0})
+                for key in entry:
+                    entry[key] += other.get(key, 0)
+            for cache, other in data.get("cache", {}).items():
+                entry = self.cache.setdefault(cache, {"hits": 0, "misses": 0})
+                for key in entry:
+                    entry[key] += other.get(key, 0)
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "stages": {
+                    stage: {
+                        name: {"calls": entry["calls"], "seconds": round(entry["seconds"], 3)}
+                        for name, entry in names.items()
+                    }
+                    for stage, names in self.stages.items()
+                },
+                "tokens": {**self.tokens, "cost_usd": round(self.tokens["cost_usd"], 6)},
+                "http": {provider: dict(entry) for provider, entry in self.http.items()},
+                "cache": {cache: dict(entry) for cache, entry in self.cache.items()}
+            }
+
+
+_current_timings = contextvars.ContextVar("request_timings", default=None)
+
+
+@contextmanager
+def collect_timings(timings):
+    """
+    Makes timings the collector for everything recorded in this context.
+    Worker threads see it only if they run in a copy of the context.
+    """
+    token = _current_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _current_timings.reset(token)
+
+
+def current_timings():
+    return _current_timings.get()
+
+
+@contextmanager
+def timed(stage, name):
+    """
+    Records the wall time of a block, or of every call when used as a
+    decorator, as a stage histogram sample and in the request breakdown.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        STAGE_ERRORS.labels(stage, name).inc()
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_SECONDS.labels(stage, name).observe(elapsed)
+        timings = _current_timings.get()
+        if timings is not None:
+            timings.add_stage(stage, name, elapsed)
+
+
+def record_http(provider, outcome, retry=False, bytes_received=0):
+    HTTP_REQUESTS.labels(provider, outcome).inc()
+    HTTP_BYTES.labels(provider).inc(bytes_received)
+    if retry:
+        HTTP_RETRIES.labels(provider).inc()
+    timings = _current_timings.get()
+    if timings is not None:
+        timings.add_http(provider, retry=retry, bytes_received=bytes_received)
+
+
+def record_rate_wait(provider, priority, seconds):
+    RATE_LIMIT_WAIT.labels(provider, str(priority)).observe(seconds)
+    timings = _current_timings.get()
+    if timings is not None and seconds > 0:
+        timings.add_stage("rate_limit_wait", provider, seconds)
+
+
+def record_cache(cache, hit):
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+    timings = _current_timings.get()
+    if timings is not None:
+        timings.add_cache(cache, hit)
+
+
+def record_sentiment(local, escalated):
+    SENTIMENT_ARTICLES.labels("local").inc(local)
+    SENTIMENT_ARTICLES.labels("escalated").inc(escalated)
+
+
+def estimate_cost(model, prompt_tokens, completion_tokens):
+    prompt_price, completion_price = LLM_PRICES.get(model, (0.0, 0.0))
+    prompt_price = float(os.getenv("LLM_PROMPT_PRICE_PER_MTOK", prompt_price))
+    completion_price = float(os.getenv("LLM_COMPLETION_PRICE_PER_MTOK", completion_price))
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000
+
+
+def record_llm_usage(model, prompt_tokens, completion_tokens):
+    if not prompt_tokens and not completion_tokens:
+        return
+    cost = estimate_cost(model, prompt_tokens, completion_tokens)
+    LLM_TOKENS.labels(model, "prompt").inc(prompt_tokens)
+    LLM_TOKENS.labels(model, "completion").inc(completion_tokens)
+    LLM_COST.labels(model).inc(cost)
+    timings = _current_timings.get()
+    if timings is not None:
+        timings.add_tokens(prompt_tokens, completion_tokens, cost)
+
+
+def _agent_token_usage(agent):
+    # crewai keeps a running token total per agent
+    process = getattr(agent, "_token_process", None)
+    if process is None:
+        return 0, 0
+    summary = process.get_summary()
+    return summary.prompt_tokens or 0, summary.completion_tokens or 0
+
+
+@contextmanager
+def track_agent_tokens(*agents):
+    """
+    Records the tokens the given agents spend inside the block, e.g. a task's
+    agent and the coworkers it can delegate to. Agents are pooled, so usage
+    is taken as the difference of each agent's running totals.
+    """
+    agents = list({id(agent): agent for agent in agents}.values())
+    before = [_agent_token_usage(agent) for agent in agents]
+    try:
+        yield
+    finally:
+        for agent, (prompt_before, completion_before) in zip(agents, before):
+            prompt_after, completion_after = _agent_token_usage(agent)
+            model = getattr(getattr(agent, "llm", None), "model", None) or "unknown"
+            record_llm_usage(model, prompt_after - prompt_before, completion_after - completion_before)
+
+
+def metrics_payload():
+    """
+    Returns the Prometheus exposition body and its content type. With
+    PROMETHEUS_MULTIPROC_DIR set, samples from crew worker processes are
+    aggregated in.
+    """
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -0,0 +1,219 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from typing import Any
+from crewai import LLM
+from crewai.llms.base_llm import BaseLLM, call_stop_override
+from tools.sqlite_store import SQLiteStore, DEFAULT_CACHE_DIR
+from tools.instrumentation import timed
+from tools.rate_governor import get_rate_governor
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+DEFAULT_MODEL = "gemini/gemini-2.0-flash"
+
+# Cache modes: "off" disables caching, "read_write" serves hits and stores
+# misses, "replay" serves hits only and fails on a miss
+CACHE_MODES = ("off", "read_write", "replay")
+
+
+class LLMCacheMiss(Exception):
+    """
+    Raised in replay mode when a prompt has no cached completion.
+    """
+
+
+class LLMCache(SQLiteStore):
+    """
+    Content-addressed store of LLM completions keyed by model, prompt and
+    sampling parameters, with least-recently-used eviction by total size.
+    """
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS llm_cache (
+        key TEXT PRIMARY KEY,
+        model TEXT NOT NULL,
+        response TEXT NOT NULL,
+        size INTEGER NOT NULL,
+        created_at REAL NOT NULL,
+        last_access REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_llm_cache_last_access ON llm_cache (last_access);
+    """
+    STATS_NAME = "llm"
+
+    def __init__(self, path, max_bytes=512 * 1024 * 1024):
+        super().__init__(path)
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def make_key(model, messages, params):
+        payload = json.dumps({"model": model, "messages": messages, "params": params}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        conn = self._connect()
+        row = conn.execute("SELECT response FROM llm_cache WHERE key = ?", (key,)).fetchone()
+        self._record(hit=row is not None)
+        if row is None:
+            return None
+        conn.execute("UPDATE llm_cache SET last_access = ? WHERE key = ?", (time.time(), key))
+        return row[0]
+
+    def set(self, key, model, response):
+        now = time.time()
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO llm_cache (key, model, response, size, created_at, last_access) VALUES (?, ?, ?, ?, ?, ?)",
+            (key, model, response, len(response.encode("utf-8")), now, now)
+        )
+
+        # Evict the least recently used completions beyond the size limit
+        conn.execute(
+            "DELETE FROM llm_cache WHERE key IN ("
+            "SELECT key FROM (SELECT key, SUM(size) OVER (ORDER BY last_access DESC, key) AS running FROM llm_cache) "
+            "WHERE running > ?)",
+            (self.max_bytes,)
+        )
+
+
+class CachedLLM(BaseLLM):
+    """
+    crewai LLM that serves byte-identical prompts from the LLM cache and
+    records the wall time of every call. With no cache it only records timings.
+
+    Wraps the provider client rather than subclassing LLM, because
+    LLM(model=...) returns a provider-specific class (e.g. GeminiCompletion)
+    that a subclass would never be.
+    """
+    llm: Any
+    cache: Any = None
+    cache_mode: str = "read_write"
+
+    def __init__(self, llm, cache=None, cache_mode="read_write"):
+        super().__init__(
+            model=llm.model if "/" in llm.model else f"{llm.provider}/{llm.model}",
+            llm=llm,
+            cache=cache,
+            cache_mode=cache_mode,
+            temperature=llm.temperature,
+            stop=list(llm.stop)
+        )
+
+    def _cache_key(self, messages, kwargs):
+        params = {
+            name: getattr(self.llm, name, None)
+            for name in ("temperature", "top_p", "max_tokens", "response_format", "seed")
+        }
+        params["stop"] = self.stop_sequences
+        params["tools"] = kwargs.get("tools")
+        response_model = kwargs.get("response_model")
+        params["response_model"] = response_model.__name__ if response_model is not None else None
+        return LLMCache.make_key(self.model, messages, params)
+
+    def call(self, messages, *args, **kwargs):
+        with timed("llm", self.model):
+            return self._cached_call(messages, *args, **kwargs)
+
+    def _rate_provider(self):
+        # Model names are prefixed with the provider, e.g. gemini/...
+        return self.model.split("/", 1)[0] if "/" in self.model else "default"
+
+    def _provider_call(self, messages, *args, **kwargs):
+        """
+        Calls the model through the rate governor and reports back-pressure.
+        """
+        governor = get_rate_governor()
+        provider = self._rate_provider()
+        with governor.slot(provider), call_stop_override(self.llm, self.stop_sequences):
+            try:
+                response = self.llm.call(messages, *args, **kwargs)
+            except Exception as e:
+                status_code = getattr(e, "status_code", None)
+                response_headers = getattr(getattr(e, "response", None), "headers", None)
+                governor.feedback(provider, status_code, response_headers)
+                raise
+        governor.feedback(provider, 200)
+        return response
+
+    def _cached_call(self, messages, *args, **kwargs):
+        if self.cache is None or self.cache_mode == "off":
+            return self._provider_call(messages, *args, **kwargs)
+
+        key = self._cache_key(messages, kwargs)
+        cached = self.cache.get(key)
+        if cached is not None:
+            logger.info(f"LLM cache hit for {self.model} ({key[:12]})")
+            return cached
+
+        if self.cache_mode == "replay":
+            raise LLMCacheMiss(f"No cached completion for {self.model} prompt {key[:12]} in replay mode")
+
+        response = self._provider_call(messages, *args, **kwargs)
+        if isinstance(response, str):
+            self.cache.set(key, self.model, response)
+        return response
+
+    def get_token_usage_summary(self):
+        return self.llm.get_token_usage_summary()
+
+    def supports_function_calling(self):
+        return self.llm.supports_function_calling()
+
+    def supports_stop_words(self):
+        return self.llm.supports_stop_words()
+
+    def supports_multimodal(self):
+        return self.llm.supports_multimodal()
+
+    def get_context_window_size(self):
+        return self.llm.get_context_window_size()
+
+
+_llm_cache = None
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_cache():
+    """
+    Returns the shared LLM cache, or None when LLM_CACHE_MODE is "off".
+    """
+    global _llm_cache
+    mode = os.getenv("LLM_CACHE_MODE", "read_write")
+    if mode not in CACHE_MODES:
+        raise ValueError(f"LLM_CACHE_MODE must be one of {', '.join(CACHE_MODES)}, got: {mode}")
+    if mode == "off":
+        return None
+    with _llm_cache_lock:
+        if _llm_cache is None:
+            _llm_cache = LLMCache(
+                os.getenv("LLM_CACHE_PATH", os.path.join(DEFAULT_CACHE_DIR, "llm_cache.sqlite")),
+                max_bytes=int(os.getenv("LLM_CACHE_MAX_MB", "512")) * 1024 * 1024
+            )
+        return _llm_cache
+
+
+_llm_factory = None
+
+
+def set_llm_factory(factory):
+    """
+    Replaces the LLM class used by create_llm, e.g. with a local stand-in for
+    benchmarks. Pass None to restore the default.
+    """
+    global _llm_factory
+    _llm_factory = factory
+
+
+def create_llm(model=DEFAULT_MODEL, **kwargs):
+    """
+    Creates the LLM used by agents, wrapped with the completion cache unless
+    LLM_CACHE_MODE is "off". Calls are timed either way.
+    """
+    if _llm_factory is not None:
+        return _llm_factory(model=model, **kwargs)
+    return CachedLLM(LLM(model=model, **kwargs), cache=get_llm_cache(), cache_mode=os.getenv("LLM_CACHE_MODE", "read_write"))
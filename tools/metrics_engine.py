@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+
+# Return windows in trading days
+DEFAULT_RETURN_WINDOWS = (1, 7, 30, 90)
+
+
+def build_panel(history, field="Close"):
+    """
+    Turns a dict of ticker to daily bars into one frame with a column per ticker.
+    """
+    return pd.DataFrame({ticker: bars[field] for ticker, bars in history.items()}).sort_index()
+
+
+def window_return(close, window):
+    """
+    Percent change of close over the last window bars. Works on one ticker's
+    series or on a panel, giving one value per ticker; missing if there are
+    not enough bars.
+    """
+    return (close.iloc[-1] / close.shift(window).iloc[-1] - 1) * 100
+
+
+def compute_panel_metrics(close, volume, benchmark=None, return_windows=DEFAULT_RETURN_WINDOWS,
+                          volatility_window=30, zscore_window=30):
+    """
+    Computes comparison metrics for every ticker of a price panel at once.
+
+    close and volume are frames indexed by date with one column per ticker.
+    Returns a frame indexed by ticker with the last close, n-day returns (%),
+    rolling daily volatility (%), max drawdown (%), the latest volume z-score
+    and, if a benchmark ticker is given, beta against it. Tickers without
+    bars up to the last date (delisted or stale) report their last known
+    close, and their returns and volatility as missing.
+    """
+    # Fill holiday gaps, but not past a ticker's last bar
+    last_close = close.ffill().iloc[-1]
+    close = close.ffill().where(close.bfill().notna())
+    returns = close.pct_change(fill_method=None)
+    metrics = {"last_close": last_close}
+
+    for window in return_windows:
+        metrics[f"return_{window}d"] = window_return(close, window)
+
+    metrics[f"volatility_{volatility_window}d"] = (
+        returns.rolling(volatility_window, min_periods=2).std().iloc[-1].where(close.iloc[-1].notna()) * 100
+    )
+    metrics["max_drawdown"] = (close / close.cummax() - 1).min() * 100
+
+    volume_mean = volume.rolling(zscore_window, min_periods=2).mean().iloc[-1]
+    volume_std = volume.rolling(zscore_window, min_periods=2).std().iloc[-1]
+    metrics["volume_zscore"] = (volume.iloc[-1] - volume_mean) / volume_std.replace(0, np.nan)
+
+    if benchmark is not None and benchmark in returns.columns:
+        covariance = returns.cov()
+        metrics["beta"] = covariance[benchmark] / covariance.loc[benchmark, benchmark]
+
+    table = pd.DataFrame(metrics)
+    table.index.name = "ticker"
+    return table
+
+
+def format_metrics_table(table):
+    """
+    Renders a metrics table as a Markdown table.
+    """
+    headers = ["Ticker"] + [column.replace("_", " ").title() for column in table.columns]
+    lines = [
+        "| " + " | ".join(headers) + " |",
+        "|" + "|".join("---" for _ in headers) + "|"
+    ]
+    for ticker, row in table.iterrows():
+        cells = ["N/A" if pd.isna(value) else f"{value:.2f}" for value in row]
+        lines.append("| " + " | ".join([ticker] + cells) + " |")
+    return "\n".join(lines)
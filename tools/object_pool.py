@@ -0,0 +1,66 @@
+import queue
+import logging
+import threading
+from contextlib import contextmanager
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+class ObjectPool:
+    """
+    Thread-safe pool of reusable objects. Objects are created by factory up
+    to max_size, either up front with warm() or on demand, and each one is
+    checked out by a single caller at a time.
+    """
+    def __init__(self, factory, max_size):
+        self.factory = factory
+        self.max_size = max_size
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _try_create(self):
+        with self._lock:
+            if self._created >= self.max_size:
+                return None
+            self._created += 1
+        try:
+            return self.factory()
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+
+    def warm(self, count=None):
+        """
+        Creates objects until count (default max_size) are available.
+        """
+        target = min(self.max_size, count or self.max_size)
+        while self._created < target:
+            obj = self._try_create()
+            if obj is None:
+                break
+            self._idle.put(obj)
+        logger.info(f"Warmed pool with {self._created} objects")
+
+    @contextmanager
+    def acquire(self, timeout=None):
+        """
+        Checks out an object, creating one if the pool has spare capacity and
+        otherwise waiting for one to be returned.
+        """
+        try:
+            obj = self._idle.get_nowait()
+        except queue.Empty:
+            obj = self._try_create()
+            if obj is None:
+                obj = self._idle.get(timeout=timeout)
+        try:
+            yield obj
+        finally:
+            self._idle.put(obj)
+
+    def size(self):
+        return self._created
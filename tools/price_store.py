@@ -0,0 +1,171 @@
+import os
+import time
+import logging
+import threading
+import importlib.util
+from datetime import timedelta
+import pandas as pd
+import yfinance as yf
+from tools.sqlite_store import DEFAULT_CACHE_DIR
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+PRICE_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+
+class PriceStore:
+    """
+    Local store of daily OHLCV bars, one Parquet file per ticker. Lookups
+    download only the dates after the last stored bar (plus any missing
+    history before the first one) and append them.
+    """
+    def __init__(self, directory, refresh_seconds=3600):
+        self.directory = directory
+        self.refresh_seconds = refresh_seconds
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, ticker):
+        return os.path.join(self.directory, f"{ticker.upper().replace('/', '_')}.parquet")
+
+    def load(self, ticker):
+        """
+        Returns the stored bars for a ticker, or an empty frame.
+        """
+        path = self._path(ticker)
+        if not os.path.exists(path):
+            return empty_bars()
+        return pd.read_parquet(path)
+
+    def _save(self, ticker, bars):
+        # Write to a temporary file first so readers never see a partial file
+        path = self._path(ticker)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        bars.to_parquet(tmp_path)
+        os.replace(tmp_path, path)
+
+    def _fetch_start(self, ticker, stored, start):
+        """
+        Returns the date to download from, or None if the stored bars are current.
+        """
+        if stored.empty or stored.index[0] > pd.Timestamp(start) + timedelta(days=5):
+            return start
+
+        # The file is rewritten or touched on every download, so its mtime is
+        # the last time the ticker was checked for new bars
+        if time.time() - os.path.getmtime(self._path(ticker)) < self.refresh_seconds:
+            return None
+
+        # Re-fetch the last stored bar too, since it may have been intraday
+        return stored.index[-1].to_pydatetime()
+
+    def get_history(self, tickers, start, end):
+        """
+        Returns a dict of ticker to daily bars between start and end,
+        downloading only what is missing from the store.
+        """
+        tickers = [t.upper() for t in tickers]
+        stored = {ticker: self.load(ticker) for ticker in tickers}
+
+        # Group tickers by download start so each group is one bulk request
+        groups = {}
+        for ticker in tickers:
+            fetch_start = self._fetch_start(ticker, stored[ticker], start)
+            if fetch_start is not None:
+                groups.setdefault(fetch_start.date(), []).append(ticker)
+
+        for fetch_start, group in groups.items():
+            logger.info(f"Downloading price history since {fetch_start} for: {', '.join(group)}")
+            downloaded = download_bars(group, fetch_start, end)
+            for ticker in group:
+                new_bars = downloaded[ticker]
+                if new_bars.empty:
+                    if not stored[ticker].empty:
+                        os.utime(self._path(ticker))
+                    continue
+
+                merged = pd.concat([stored[ticker], new_bars])
+                merged = merged[~merged.index.duplicated(keep="last")].sort_index()
+                self._save(ticker, merged)
+                stored[ticker] = merged
+
+        return {ticker: slice_bars(bars, start, end) for ticker, bars in stored.items()}
+
+
+def empty_bars():
+    return pd.DataFrame(columns=PRICE_COLUMNS, index=pd.DatetimeIndex([]))
+
+
+def slice_bars(bars, start, end):
+    if bars.empty:
+        return bars
+    return bars[(bars.index >= pd.Timestamp(start).normalize()) & (bars.index <= pd.Timestamp(end))]
+
+
+def download_bars(tickers, start, end):
+    """
+    Downloads daily bars for several tickers in one request. Returns a dict
+    of ticker to bars with a tz-naive date index; failed tickers map to an
+    empty frame.
+    """
+    downloaded = yf.download(
+        list(tickers),
+        start=start,
+        end=end + timedelta(days=1),
+        group_by="ticker",
+        auto_adjust=True,
+        threads=True,
+        progress=False
+    )
+
+    bars = {}
+    for ticker in tickers:
+        if isinstance(downloaded.columns, pd.MultiIndex):
+            ticker_bars = downloaded[ticker] if ticker in downloaded.columns.get_level_values(0) else pd.DataFrame()
+        else:
+            ticker_bars = downloaded
+        ticker_bars = ticker_bars.reindex(columns=PRICE_COLUMNS).dropna(subset=["Close"])
+        index = pd.to_datetime(ticker_bars.index)
+        if index.tz is not None:
+            index = index.tz_convert(None)
+        ticker_bars.index = index.normalize()
+        bars[ticker] = ticker_bars
+    return bars
+
+
+def get_history(tickers, start, end):
+    """
+    Returns a dict of ticker to daily bars, using the local store when available.
+    """
+    store = get_price_store()
+    if store is not None:
+        return store.get_history(tickers, start, end)
+    return {
+        ticker: slice_bars(bars, start, end)
+        for ticker, bars in download_bars([t.upper() for t in tickers], start, end).items()
+    }
+
+
+_price_store = None
+_price_store_lock = threading.Lock()
+
+
+def get_price_store():
+    """
+    Returns the shared price store, or None when it is disabled or pyarrow
+    is not installed.
+    """
+    global _price_store
+    if os.getenv("PRICE_STORE_ENABLED", "true").lower() != "true":
+        return None
+    with _price_store_lock:
+        if _price_store is None:
+            if importlib.util.find_spec("pyarrow") is None:
+                logger.warning("pyarrow is not installed; price history will not be stored locally")
+                return None
+            _price_store = PriceStore(
+                os.getenv("PRICE_STORE_DIR", os.path.join(DEFAULT_CACHE_DIR, "prices")),
+                refresh_seconds=int(os.getenv("PRICE_STORE_REFRESH_SECONDS", "3600"))
+            )
+        return _price_store
@@ -0,0 +1,260 @@
+import os
+import time
+import heapq
+import logging
+import itertools
+import threading
+import contextvars
+from contextlib import contextmanager
+from tools.instrumentation import record_rate_wait
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# Request priorities; lower values are served first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BATCH = 1
+PRIORITY_BACKGROUND = 2
+
+# Default (requests per second, burst, max in flight) per provider, overridable
+# with RATE_<PROVIDER>_RPS, RATE_<PROVIDER>_BURST and RATE_<PROVIDER>_MAX_IN_FLIGHT
+DEFAULT_LIMITS = {
+    "serper": (5.0, 5, 8),
+    "browserless": (2.0, 2, 4),
+    "gemini": (10.0, 10, 8),
+    "default": (10.0, 10, 16)
+}
+
+_priority = contextvars.ContextVar("request_priority", default=PRIORITY_INTERACTIVE)
+
+
+@contextmanager
+def request_priority(priority):
+    """
+    Sets the priority of every provider call made in this context. Worker
+    threads inherit it only if they run in a copy of the context.
+    """
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority():
+    return _priority.get()
+
+
+class RateLimitTimeout(TimeoutError):
+    """
+    Raised when a call waits longer than the governor allows for a slot.
+    """
+
+
+class ProviderLimiter:
+    """
+    Token bucket plus max-in-flight limit for one provider. Waiting callers
+    are served in priority order, then first come first served. The rate
+    halves on 429/503 responses, follows rate-limit headers, and recovers
+    additively on successful responses. share is the fraction of the
+    provider's quota this process owns, applied to the quota left in
+    rate-limit headers, which covers every process.
+    """
+    def __init__(self, name, rate, burst, max_in_flight, min_rate=None, share=1.0):
+        self.name = name
+        self.share = share
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min_rate or rate / 20
+        self.burst = burst
+        self.max_in_flight = max_in_flight
+        self.tokens = float(burst)
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.throttled = 0
+        self._last_refill = time.monotonic()
+        self._waiters = []
+        self._sequence = itertools.count()
+        self._cond = threading.Condition()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    def _wait_time(self, now):
+        # Seconds until the head of the queue could possibly proceed
+        if now < self.paused_until:
+            return self.paused_until - now
+        if self.tokens < 1:
+            return (1 - self.tokens) / self.rate
+        return None
+
+    def acquire(self, priority=PRIORITY_INTERACTIVE, timeout=None):
+        """
+        Blocks until the caller may send one request. Returns the seconds spent waiting.
+        """
+        start = time.monotonic()
+        deadline = start + timeout if timeout is not None else None
+        ticket = (priority, next(self._sequence))
+        with self._cond:
+            heapq.heappush(self._waiters, ticket)
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    wait = self._wait_time(now)
+                    if self._waiters[0] == ticket and wait is None and self.in_flight < self.max_in_flight:
+                        heapq.heappop(self._waiters)
+                        self.tokens -= 1
+                        self.in_flight += 1
+                        self._cond.notify_all()
+                        return now - start
+
+                    if deadline is not None:
+                        remaining = deadline - now
+                        if remaining <= 0:
+                            raise RateLimitTimeout(f"Timed out waiting for a {self.name} request slot")
+                        wait = min(wait, remaining) if wait is not None else remaining
+                    self._cond.wait(wait)
+            except BaseException:
+                if ticket in self._waiters:
+                    self._waiters.remove(ticket)
+                    heapq.heapify(self._waiters)
+                    self._cond.notify_all()
+                raise
+
+    def release(self):
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+
+    def feedback(self, status_code=None, headers=None):
+        """
+        Adapts the rate to a provider response: halves it on back-pressure,
+        pauses for Retry-After or an exhausted quota, caps it to the quota
+        left in the current window, and otherwise creeps back up.
+        """
+        headers = headers or {}
+        now = time.monotonic()
+        with self._cond:
+            if status_code in (429, 503):
+                self.rate = max(self.min_rate, self.rate / 2)
+                self.throttled += 1
+                retry_after = _parse_seconds(headers.get("Retry-After"))
+                if retry_after:
+                    self.paused_until = max(self.paused_until, now + retry_after)
+                logger.warning(f"{self.name} signalled back-pressure ({status_code}), rate lowered to {self.rate:.2f}/s")
+            elif status_code is not None and status_code < 400:
+                self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+
+            remaining = _parse_seconds(headers.get("X-RateLimit-Remaining") or headers.get("RateLimit-Remaining"))
+            reset = _parse_seconds(headers.get("X-RateLimit-Reset") or headers.get("RateLimit-Reset"))
+            if reset is not None and reset > 1e9:
+                # Some providers send the reset as a Unix timestamp
+                reset = max(0.0, reset - time.time())
+            if remaining is not None and reset:
+                if remaining < 1:
+                    self.paused_until = max(self.paused_until, now + reset)
+                else:
+                    self.rate = max(self.min_rate, min(self.rate, remaining * self.share / reset))
+            self._cond.notify_all()
+
+    def stats(self):
+        with self._cond:
+            return {
+                "rate": round(self.rate, 3),
+                "max_rate": self.max_rate,
+                "in_flight": self.in_flight,
+                "max_in_flight": self.max_in_flight,
+                "waiting": len(self._waiters),
+                "throttled": self.throttled,
+                "paused_seconds": round(max(0.0, self.paused_until - time.monotonic()), 3)
+            }
+
+
+def _parse_seconds(value):
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class RateGovernor:
+    """
+    Coordinates calls to every external provider across all threads of the
+    process, so concurrent analyses share one quota per provider. A process
+    that is one of several sharing the quotas, e.g. a crew worker, takes
+    share (0-1] of every limit.
+    """
+    def __init__(self, max_wait=None, share=1.0):
+        self.max_wait = max_wait
+        self.share = share
+        self._limiters = {}
+        self._lock = threading.Lock()
+
+    def limiter(self, provider):
+        with self._lock:
+            if provider not in self._limiters:
+                rate, burst, max_in_flight = DEFAULT_LIMITS.get(provider, DEFAULT_LIMITS["default"])
+                prefix = f"RATE_{provider.upper()}"
+                self._limiters[provider] = ProviderLimiter(
+                    provider,
+                    rate=float(os.getenv(f"{prefix}_RPS", rate)) * self.share,
+                    burst=max(1, round(int(os.getenv(f"{prefix}_BURST", burst)) * self.share)),
+                    max_in_flight=max(1, round(int(os.getenv(f"{prefix}_MAX_IN_FLIGHT", max_in_flight)) * self.share)),
+                    share=self.share
+                )
+            return self._limiters[provider]
+
+    def set_share(self, share):
+        """
+        Changes the fraction of every quota this process may use. Limiters are
+        rebuilt on their next use.
+        """
+        with self._lock:
+            self.share = share
+            self._limiters.clear()
+
+    @contextmanager
+    def slot(self, provider, priority=None):
+        """
+        Holds one request slot for provider, at the context's priority unless
+        one is given.
+        """
+        priority = current_priority() if priority is None else priority
+        limiter = self.limiter(provider)
+        waited = limiter.acquire(priority, timeout=self.max_wait)
+        record_rate_wait(provider, priority, waited)
+        try:
+            yield limiter
+        finally:
+            limiter.release()
+
+    def feedback(self, provider, status_code=None, headers=None):
+        self.limiter(provider).feedback(status_code, headers)
+
+    def stats(self):
+        with self._lock:
+            limiters = dict(self._limiters)
+        return {provider: limiter.stats() for provider, limiter in limiters.items()}
+
+
+_rate_governor = None
+_rate_governor_lock = threading.Lock()
+
+
+def get_rate_governor():
+    """
+    Returns the governor shared by the HTTP client and the LLM clients.
+    RATE_GOVERNOR_SHARE sets the fraction of each quota this process may use.
+    """
+    global _rate_governor
+    with _rate_governor_lock:
+        if _rate_governor is None:
+            max_wait = os.getenv("RATE_GOVERNOR_MAX_WAIT", "300")
+            _rate_governor = RateGovernor(
+                max_wait=float(max_wait) if max_wait else None,
+                share=float(os.getenv("RATE_GOVERNOR_SHARE", "1"))
+            )
+        return _rate_governor
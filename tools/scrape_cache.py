@@ -0,0 +1,132 @@
+import os
+import time
+import hashlib
+import logging
+import threading
+from tools.sqlite_store import SQLiteStore, DEFAULT_CACHE_DIR
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+def content_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class CachedPage:
+    """
+    Cached state of a scraped page.
+    """
+    def __init__(self, html_hash, text_hash, summary):
+        self.html_hash = html_hash
+        self.text_hash = text_hash
+        self.summary = summary
+
+
+class ScrapeCache(SQLiteStore):
+    """
+    Persistent cache of scraped pages keyed by URL. Stores the fetched HTML
+    hash, the partitioned text and per-chunk summaries keyed by chunk hash, so
+    only chunks whose content changed need to be summarized again.
+    """
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS scrape_pages (
+        url TEXT PRIMARY KEY,
+        html_hash TEXT NOT NULL,
+        text_hash TEXT NOT NULL,
+        content TEXT NOT NULL,
+        summary TEXT NOT NULL,
+        updated_at REAL NOT NULL,
+        last_access REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_scrape_pages_last_access ON scrape_pages (last_access);
+    CREATE TABLE IF NOT EXISTS scrape_chunks (
+        url TEXT NOT NULL,
+        chunk_hash TEXT NOT NULL,
+        summary TEXT NOT NULL,
+        PRIMARY KEY (url, chunk_hash)
+    );
+    """
+    STATS_NAME = "scrape"
+
+    def __init__(self, path, max_pages=2000):
+        super().__init__(path)
+        self.max_pages = max_pages
+
+    def get_page(self, url):
+        row = self._connect().execute(
+            "SELECT html_hash, text_hash, summary FROM scrape_pages WHERE url = ?",
+            (url,)
+        ).fetchone()
+        return CachedPage(*row) if row else None
+
+    def touch(self, url):
+        """
+        Marks a page as used.
+        """
+        self._connect().execute("UPDATE scrape_pages SET last_access = ? WHERE url = ?", (time.time(), url))
+
+    def record_lookup(self, hit):
+        """
+        Counts one scrape as a cache hit (cached summary served) or a miss.
+        """
+        self._record(hit=hit)
+
+    def get_chunk_summaries(self, url):
+        """
+        Returns a dict of chunk hash to summary for a page.
+        """
+        rows = self._connect().execute(
+            "SELECT chunk_hash, summary FROM scrape_chunks WHERE url = ?",
+            (url,)
+        ).fetchall()
+        return dict(rows)
+
+    def save_page(self, url, html_hash, content, summary, chunk_summaries):
+        """
+        Stores a freshly summarized page and replaces its chunk summaries.
+        chunk_summaries maps chunk hash to summary.
+        """
+        now = time.time()
+        conn = self._connect()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "INSERT OR REPLACE INTO scrape_pages (url, html_hash, text_hash, content, summary, updated_at, last_access) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, html_hash, content_hash(content), content, summary, now, now)
+            )
+            conn.execute("DELETE FROM scrape_chunks WHERE url = ?", (url,))
+            conn.executemany(
+                "INSERT INTO scrape_chunks (url, chunk_hash, summary) VALUES (?, ?, ?)",
+                [(url, chunk_hash, chunk_summary) for chunk_hash, chunk_summary in chunk_summaries.items()]
+            )
+
+            # Evict the least recently used pages beyond the size limit
+            evicted = [row[0] for row in conn.execute(
+                "SELECT url FROM scrape_pages ORDER BY last_access DESC LIMIT -1 OFFSET ?",
+                (self.max_pages,)
+            ).fetchall()]
+            for evicted_url in evicted:
+                conn.execute("DELETE FROM scrape_pages WHERE url = ?", (evicted_url,))
+                conn.execute("DELETE FROM scrape_chunks WHERE url = ?", (evicted_url,))
+
+
+_scrape_cache = None
+_scrape_cache_lock = threading.Lock()
+
+
+def get_scrape_cache():
+    """
+    Returns the shared scrape cache, or None when caching is disabled.
+    """
+    global _scrape_cache
+    if os.getenv("SCRAPE_CACHE_ENABLED", "true").lower() != "true":
+        return None
+    with _scrape_cache_lock:
+        if _scrape_cache is None:
+            _scrape_cache = ScrapeCache(
+                os.getenv("SCRAPE_CACHE_PATH", os.path.join(DEFAULT_CACHE_DIR, "scrape_cache.sqlite")),
+                max_pages=int(os.getenv("SCRAPE_CACHE_MAX_PAGES", "2000"))
+            )
+        return _scrape_cache
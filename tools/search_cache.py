@@ -0,0 +1,109 @@
+import os
+import re
+import json
+import time
+import hashlib
+import logging
+import threading
+from tools.sqlite_store import SQLiteStore, DEFAULT_CACHE_DIR
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# Words that do not change what a news search returns
+FILLER_WORDS = {"a", "an", "the", "latest", "recent", "current", "today", "todays", "about"}
+
+
+class SearchCache(SQLiteStore):
+    """
+    Persistent cache of Serper responses keyed on normalized queries, with a
+    per-entry TTL and least-recently-used eviction.
+    """
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS search_cache (
+        query_key TEXT PRIMARY KEY,
+        query TEXT NOT NULL,
+        response TEXT NOT NULL,
+        expires_at REAL NOT NULL,
+        last_access REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_search_cache_last_access ON search_cache (last_access);
+    """
+    STATS_NAME = "search"
+
+    def __init__(self, path, ttl_seconds=21600, max_entries=5000):
+        super().__init__(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+    @staticmethod
+    def normalize_query(query):
+        """
+        Lowercases the query, strips punctuation and filler words and
+        collapses whitespace, so "Nike news" and "nike  latest news" match.
+        """
+        words = re.sub(r"[^\w\s&.$-]", " ", query.casefold()).split()
+        return " ".join(word for word in words if word not in FILLER_WORDS)
+
+    def _key(self, query):
+        return hashlib.sha256(self.normalize_query(query).encode("utf-8")).hexdigest()
+
+    def get(self, query):
+        """
+        Returns the cached response for the query, or None on a miss.
+        """
+        now = time.time()
+        conn = self._connect()
+        key = self._key(query)
+        row = conn.execute(
+            "SELECT response, expires_at FROM search_cache WHERE query_key = ?",
+            (key,)
+        ).fetchone()
+
+        if row is None or row[1] < now:
+            if row is not None:
+                conn.execute("DELETE FROM search_cache WHERE query_key = ?", (key,))
+            self._record(hit=False)
+            return None
+
+        conn.execute("UPDATE search_cache SET last_access = ? WHERE query_key = ?", (now, key))
+        self._record(hit=True)
+        return json.loads(row[0])
+
+    def set(self, query, response, ttl_seconds=None):
+        now = time.time()
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO search_cache (query_key, query, response, expires_at, last_access) VALUES (?, ?, ?, ?, ?)",
+            (self._key(query), query, json.dumps(response), now + ttl, now)
+        )
+
+        # Evict the least recently used entries beyond the size limit
+        conn.execute(
+            "DELETE FROM search_cache WHERE query_key IN ("
+            "SELECT query_key FROM search_cache ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
+
+
+_search_cache = None
+_search_cache_lock = threading.Lock()
+
+
+def get_search_cache():
+    """
+    Returns the shared search cache, or None when caching is disabled.
+    """
+    global _search_cache
+    if os.getenv("SEARCH_CACHE_ENABLED", "true").lower() != "true":
+        return None
+    with _search_cache_lock:
+        if _search_cache is None:
+            _search_cache = SearchCache(
+                os.getenv("SEARCH_CACHE_PATH", os.path.join(DEFAULT_CACHE_DIR, "search_cache.sqlite")),
+                ttl_seconds=int(os.getenv("SEARCH_CACHE_TTL", "21600")),
+                max_entries=int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "5000"))
+            )
+        return _search_cache
@@ -1,10 +1,14 @@
+import os
 import json
-import requests
 import logging
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
-import streamlit as st
+from tools.search_cache import get_search_cache
+from tools.http_client import get_http_client
+from tools.secret_provider import require_secret
+from tools.instrumentation import timed
+from tools.url_index import resolve_url
 
 # Load environment variables from a .env file
 load_dotenv()
@@ -13,6 +17,9 @@ load_dotenv()
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# Serper search endpoint (overridable for local stand-ins)
+SERPER_URL = os.getenv("SERPER_URL", "https://google.serper.dev/search")
+
 # Define the schema for the search query input
 class SearchQuery(BaseModel):
     query: str = Field(..., description="The search query to look up")
@@ -23,30 +30,76 @@ class SearchTools(BaseTool):
     description: str = "Useful to search the internet about the given topic and return relevant results"
     args_schema: type[BaseModel] = SearchQuery
 
+    # Fetch raw Serper results, serving repeated queries from the cache
+    def _search(self, query: str):
+        cache = get_search_cache()
+        if cache is not None:
+            cached = cache.get(query)
+            if cached is not None:
+                logger.info(f"Search cache hit for query: {query}")
+                return cached
+
+        url = SERPER_URL
+        payload = json.dumps({"q": query})
+        headers = {
+            'X-API-KEY': require_secret("SERPER_API_KEY"),  # API key from the secrets provider
+            'Content-Type': 'application/json'
+        }
+
+        logger.debug(f"Sending POST request to {url} with payload: {payload}")
+        # Send POST request to the search API
+        response = get_http_client().post("serper", url, headers=headers, data=payload)
+        logger.info(f"Received response with status code: {response.status_code}")
+
+        # Check if the response status is not OK
+        if response.status_code != 200:
+            logger.error(f"Search API request failed with status code: {response.status_code}")
+            return None
+
+        data = response.json()
+        if cache is not None and "organic" in data:
+            cache.set(query, data)
+        return data
+
+    # Fetch fresh Serper results for several queries in one batched request
+    def _search_many(self, queries: list):
+        """
+        Returns one raw result dict per query, in query order, or None if the
+        request fails. The cache is not read, so results are always current,
+        but it is refreshed with every result.
+        """
+        payload = json.dumps([{"q": query} for query in queries])
+        headers = {
+            'X-API-KEY': require_secret("SERPER_API_KEY"),
+            'Content-Type': 'application/json'
+        }
+
+        logger.info(f"Sending batched search request for {len(queries)} queries")
+        response = get_http_client().post("serper", SERPER_URL, headers=headers, data=payload)
+        if response.status_code != 200:
+            logger.error(f"Batched search request failed with status code: {response.status_code}")
+            return None
+
+        data = response.json()
+        results = data if isinstance(data, list) else [data]
+        cache = get_search_cache()
+        if cache is not None:
+            for query, result in zip(queries, results):
+                if "organic" in result:
+                    cache.set(query, result)
+        return results
+
     # Main method to run the search
+    @timed("tool", "search")
     def _run(self, query: str) -> str:
         try:
             logger.info(f"Starting search for query: {query}")
             top_results_to_return = 4  # Number of top results to return
-            url = "https://google.serper.dev/search"
-            payload = json.dumps({"q": query})
-            headers = {
-                'X-API-KEY': st.secrets["SERPER_API_KEY"],  # API key from Streamlit secrets
-                'Content-Type': 'application/json'
-            }
-
-            logger.debug(f"Sending POST request to {url} with payload: {payload}")
-            # Send POST request to the search API
-            response = requests.request("POST", url, headers=headers, data=payload)
-            logger.info(f"Received response with status code: {response.status_code}")
-
-            # Check if the response status is not OK
-            if response.status_code != 200:
-                logger.error(f"Search API request failed with status code: {response.status_code}")
-                return f"Error: Search API request failed"
 
-            # Parse the JSON response
-            data = response.json()
+            # Get the parsed JSON response
+            data = self._search(query)
+            if data is None:
+                return f"Error: Search API request failed"
             logger.debug(f"Response JSON: {data}")
 
             # Check if 'organic' results are present in the response
@@ -56,14 +109,22 @@ class SearchTools(BaseTool):
 
             results = data["organic"]
             formatted_results = []
+            seen_links = set()
 
-            # Format each result for output
-            for result in results[:top_results_to_return]:
+            # Format each result for output, skipping tracking and AMP copies of earlier results
+            for result in results:
+                if len(formatted_results) >= top_results_to_return:
+                    break
                 try:
+                    link = result.get("link") or "N/A"
+                    key = resolve_url(link) if result.get("link") else link
+                    if key in seen_links:
+                        continue
+                    seen_links.add(key)
                     formatted_result = "\n".join(
                         [
                             f"Title: {result.get('title', 'N/A')}",
-                            f"Link: {result.get('link', 'N/A')}",
+                            f"Link: {link}",
                             f"Snippet: {result.get('snippet', 'N/A')}"
                         ]
                     )
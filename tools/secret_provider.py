@@ -0,0 +1,117 @@
+import os
+import json
+import logging
+import threading
+import importlib.util
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+class EnvSecrets:
+    """
+    Reads secrets from environment variables (including a loaded .env file).
+    """
+    def get(self, name):
+        return os.getenv(name)
+
+
+class FileSecrets:
+    """
+    Reads secrets from a TOML, JSON or KEY=VALUE file. Defaults to the
+    Streamlit secrets file so the same keys work without importing Streamlit.
+    """
+    def __init__(self, path):
+        self.path = path
+        self._values = None
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return {}
+        if self.path.endswith(".toml"):
+            import tomllib
+            with open(self.path, "rb") as f:
+                return tomllib.load(f)
+        with open(self.path) as f:
+            if self.path.endswith(".json"):
+                return json.load(f)
+            values = {}
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith("#") and "=" in line:
+                    key, value = line.split("=", 1)
+                    values[key.strip()] = value.strip().strip("'\"")
+            return values
+
+    def get(self, name):
+        if self._values is None:
+            self._values = self._load()
+        value = self._values.get(name)
+        return str(value) if value is not None else None
+
+
+class StreamlitSecrets:
+    """
+    Reads st.secrets. Streamlit is imported only on first lookup, and only if
+    it is installed.
+    """
+    def get(self, name):
+        if importlib.util.find_spec("streamlit") is None:
+            return None
+        import streamlit as st
+        try:
+            return st.secrets.get(name)
+        except Exception:
+            return None
+
+
+class SecretsProvider:
+    """
+    Looks a secret up in each source in order and returns the first match.
+    """
+    def __init__(self, sources):
+        self.sources = sources
+
+    def get(self, name, default=None):
+        for source in self.sources:
+            value = source.get(name)
+            if value:
+                return value
+        return default
+
+    def require(self, name):
+        value = self.get(name)
+        if value is None:
+            raise KeyError(f"Missing secret: {name}")
+        return value
+
+
+_secrets_provider = None
+_secrets_provider_lock = threading.Lock()
+
+
+def get_secrets_provider():
+    """
+    Returns the shared provider. SECRETS_SOURCES picks the sources and their
+    order (default "env,file,streamlit"); SECRETS_FILE sets the file source.
+    """
+    global _secrets_provider
+    with _secrets_provider_lock:
+        if _secrets_provider is None:
+            available = {
+                "env": EnvSecrets,
+                "file": lambda: FileSecrets(os.getenv("SECRETS_FILE", os.path.join(".streamlit", "secrets.toml"))),
+                "streamlit": StreamlitSecrets
+            }
+            names = [name.strip() for name in os.getenv("SECRETS_SOURCES", "env,file,streamlit").split(",") if name.strip()]
+            _secrets_provider = SecretsProvider([available[name]() for name in names])
+        return _secrets_provider
+
+
+def get_secret(name, default=None):
+    return get_secrets_provider().get(name, default)
+
+
+def require_secret(name):
+    return get_secrets_provider().require(name)
@@ -0,0 +1,71 @@
+import os
+import sqlite3
+import threading
+import logging
+from tools.instrumentation import record_cache
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# Default directory for on-disk caches
+DEFAULT_CACHE_DIR = os.getenv("BRANDSCOPE_CACHE_DIR", ".cache")
+
+
+class SQLiteStore:
+    """
+    Base class for small SQLite-backed stores shared by threads and worker
+    processes. Uses WAL mode with one connection per thread and keeps
+    hit/miss counters in the database so every process sees the same totals.
+    """
+    SCHEMA = ""
+    STATS_NAME = "store"
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.executescript(
+                "CREATE TABLE IF NOT EXISTS cache_stats (name TEXT PRIMARY KEY, hits INTEGER NOT NULL DEFAULT 0, misses INTEGER NOT NULL DEFAULT 0);"
+                + self.SCHEMA
+            )
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _record(self, hit):
+        record_cache(self.STATS_NAME, hit)
+        column = "hits" if hit else "misses"
+        try:
+            self._connect().execute(
+                f"INSERT INTO cache_stats (name, {column}) VALUES (?, 1) "
+                f"ON CONFLICT(name) DO UPDATE SET {column} = {column} + 1",
+                (self.STATS_NAME,)
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to record {self.STATS_NAME} cache stats: {str(e)}")
+
+    def stats(self):
+        """
+        Returns hit/miss counters and the hit rate for this store.
+        """
+        row = self._connect().execute(
+            "SELECT hits, misses FROM cache_stats WHERE name = ?",
+            (self.STATS_NAME,)
+        ).fetchone()
+        hits, misses = row if row else (0, 0)
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / total, 4) if total else 0.0
+        }
@@ -0,0 +1,277 @@
+import os
+import re
+import time
+import hashlib
+import logging
+import threading
+from contextlib import contextmanager
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode, urljoin, quote
+from tools.sqlite_store import SQLiteStore, DEFAULT_CACHE_DIR
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# Query parameters that only track the click and never change the article
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "yclid", "igshid", "mc_cid", "mc_eid", "_ga", "_gl",
+    "ref", "ref_src", "ref_url", "referrer", "cmpid", "ocid", "smid", "smtyp",
+    "spm", "guccounter", "guce_referrer", "guce_referrer_sig", "ito", "ns_source",
+    "ns_mchannel", "ns_campaign", "outputtype", "amp", "amp_js_v", "usqp", "__twitter_impression"
+}
+TRACKING_PREFIXES = ("utm_", "pk_", "hsa_", "at_")
+
+# Simhash fingerprints closer than this many bits are treated as the same article
+NEAR_DUPLICATE_BITS = 3
+
+# Pages with fewer words are not fingerprinted: consent walls, paywalls and
+# "enable JavaScript" stubs are short and look alike across unrelated articles
+MIN_FINGERPRINT_WORDS = int(os.getenv("URL_INDEX_MIN_FINGERPRINT_WORDS", "150"))
+
+_LINK_TAG = re.compile(r"<link\b[^>]*>", re.IGNORECASE)
+_META_TAG = re.compile(r"<meta\b[^>]*>", re.IGNORECASE)
+_ATTR = re.compile(r"""([\w:-]+)\s*=\s*("[^"]*"|'[^']*'|[^\s>]+)""")
+_PERCENT_ESCAPE = re.compile(r"%([0-9A-Fa-f]{2})")
+_UNRESERVED = set("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-._~")
+
+
+def _strip_amp(host, path):
+    # Google AMP cache: www-example-com.cdn.ampproject.org/c/s/www.example.com/path
+    if host.endswith(".cdn.ampproject.org"):
+        match = re.match(r"^/[a-z]/(?:s/)?([^/]+)(/.*)?$", path)
+        if match:
+            host, path = match.group(1).lower(), match.group(2) or "/"
+    # Google AMP viewer: www.google.com/amp/s/www.example.com/path
+    elif host.endswith("google.com") and path.startswith("/amp/"):
+        match = re.match(r"^/amp/(?:s/)?([^/]+)(/.*)?$", path)
+        if match:
+            host, path = match.group(1).lower(), match.group(2) or "/"
+
+    # amp.example.com, but not amp.dev itself
+    if host.startswith("amp.") and "." in host[4:]:
+        host = host[4:]
+    # story.amp and story.amp.html; /amp path segments are left alone since
+    # they are often real sections, and AMP pages declare their canonical anyway
+    path = re.sub(r"\.amp(?=(?:\.html)?/?$)", "", path)
+    return host, path
+
+
+def _normalize_path(path):
+    # Decode escaped unreserved characters and re-quote everything else, so
+    # %7E and ~ compare equal while %2F stays distinct from /
+    def normalize_escape(match):
+        char = chr(int(match.group(1), 16))
+        return char if char in _UNRESERVED else f"%{match.group(1).upper()}"
+    return quote(_PERCENT_ESCAPE.sub(normalize_escape, path), safe="/%:@!$&'()*+,;=")
+
+
+def canonicalize_url(url):
+    """
+    Normalizes a URL so variants of the same article compare equal: lowercase
+    scheme and host without www, no default port, fragment or tracking
+    parameters, AMP variants mapped to the regular page, sorted query and
+    no trailing slash.
+
+    The result is an identity key only; fetch and display the original URL,
+    since an https or non-www variant may not serve the page.
+    """
+    url = url.strip()
+    parts = urlsplit(url if "://" in url else f"https://{url}")
+    scheme = "https" if parts.scheme in ("http", "https") else parts.scheme
+    host = (parts.hostname or "").lower()
+    host, path = _strip_amp(host, _normalize_path(parts.path) or "/")
+    if host.startswith("www."):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    )
+    if len(path) > 1:
+        path = path.rstrip("/")
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+
+def extract_canonical(html, base_url):
+    """
+    Returns the page's declared canonical URL (rel=canonical, then og:url),
+    canonicalized, or None. A site root declared by an article page is
+    ignored, since that is a misconfigured template rather than a syndication.
+    """
+    head = html[:200_000]
+    for pattern, wanted in ((_LINK_TAG, ("rel", "canonical", "href")), (_META_TAG, ("property", "og:url", "content"))):
+        key, value, target = wanted
+        for tag in pattern.findall(head):
+            attrs = {name.lower(): raw.strip("\"'") for name, raw in _ATTR.findall(tag)}
+            if attrs.get(key, "").lower() == value and attrs.get(target):
+                canonical = canonicalize_url(urljoin(base_url, attrs[target]))
+                if urlsplit(canonical).path == "/" and urlsplit(canonicalize_url(base_url)).path != "/":
+                    return None
+                return canonical
+    return None
+
+
+def simhash(text, bits=64):
+    """
+    64-bit simhash of the word 3-shingles of a text. Near-duplicate texts,
+    e.g. the same article with different boilerplate, differ in few bits.
+    """
+    words = re.findall(r"\w+", text.casefold())
+    shingles = [" ".join(words[idx:idx + 3]) for idx in range(max(1, len(words) - 2))]
+    weights = [0] * bits
+    for shingle in shingles:
+        value = int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(bits):
+            weights[bit] += 1 if value >> bit & 1 else -1
+    fingerprint = sum(1 << bit for bit in range(bits) if weights[bit] > 0)
+    # SQLite integers are signed 64-bit
+    return fingerprint - (1 << 64) if fingerprint >= 1 << 63 else fingerprint
+
+
+def content_fingerprint(text, min_words=MIN_FINGERPRINT_WORDS):
+    """
+    Simhash of a page's text, or None when it is too short to tell articles apart.
+    """
+    if len(re.findall(r"\w+", text)) < min_words:
+        return None
+    return simhash(text)
+
+
+def hamming_distance(a, b):
+    return bin((a ^ b) & ((1 << 64) - 1)).count("1")
+
+
+class UrlIndex(SQLiteStore):
+    """
+    Index of articles already fetched and summarized, keyed by canonical URL.
+    Aliases map tracking, AMP and syndicated variants to one canonical URL,
+    and content fingerprints catch near-duplicates under different URLs.
+    Articles and aliases older than window_seconds are ignored, so articles
+    are fetched at most once per window and a wrong alias does not outlive it.
+    """
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS url_aliases (
+        url TEXT PRIMARY KEY,
+        canonical TEXT NOT NULL,
+        updated_at REAL NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS url_articles (
+        canonical TEXT PRIMARY KEY,
+        fingerprint INTEGER,
+        summary TEXT NOT NULL,
+        fetched_at REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_url_articles_fetched_at ON url_articles (fetched_at);
+    """
+    STATS_NAME = "url_index"
+
+    def __init__(self, path, window_seconds=21600):
+        super().__init__(path)
+        self.window_seconds = window_seconds
+        self._claims = {}
+        self._claims_lock = threading.Lock()
+
+    def resolve(self, url):
+        """
+        Returns the canonical URL for url, following aliases made within the window.
+        """
+        canonical = canonicalize_url(url)
+        row = self._connect().execute(
+            "SELECT canonical FROM url_aliases WHERE url = ? AND updated_at >= ?",
+            (canonical, time.time() - self.window_seconds)
+        ).fetchone()
+        return row[0] if row else canonical
+
+    def add_alias(self, url, canonical):
+        alias = canonicalize_url(url)
+        if alias != canonical:
+            self._connect().execute(
+                "INSERT OR REPLACE INTO url_aliases (url, canonical, updated_at) VALUES (?, ?, ?)",
+                (alias, canonical, time.time())
+            )
+
+    def get_summary(self, canonical):
+        """
+        Returns the summary of an article fetched within the window, or None.
+        """
+        row = self._connect().execute(
+            "SELECT summary FROM url_articles WHERE canonical = ? AND fetched_at >= ?",
+            (canonical, time.time() - self.window_seconds)
+        ).fetchone()
+        self._record(hit=row is not None)
+        return row[0] if row else None
+
+    def find_near_duplicate(self, fingerprint, exclude=None, max_distance=NEAR_DUPLICATE_BITS):
+        """
+        Returns (canonical, summary) of an article within the window whose
+        fingerprint is within max_distance bits, or None.
+        """
+        rows = self._connect().execute(
+            "SELECT canonical, fingerprint, summary FROM url_articles WHERE fetched_at >= ? AND fingerprint IS NOT NULL",
+            (time.time() - self.window_seconds,)
+        ).fetchall()
+        for canonical, other, summary in rows:
+            if canonical != exclude and hamming_distance(fingerprint, other) <= max_distance:
+                return canonical, summary
+        return None
+
+    def save_article(self, canonical, summary, fingerprint=None):
+        conn = self._connect()
+        conn.execute(
+            "INSERT INTO url_articles (canonical, fingerprint, summary, fetched_at) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(canonical) DO UPDATE SET fingerprint = COALESCE(excluded.fingerprint, fingerprint), "
+            "summary = excluded.summary, fetched_at = excluded.fetched_at",
+            (canonical, fingerprint, summary, time.time())
+        )
+        # Drop articles and aliases that fell out of the window
+        conn.execute("DELETE FROM url_articles WHERE fetched_at < ?", (time.time() - self.window_seconds,))
+        conn.execute("DELETE FROM url_aliases WHERE updated_at < ?", (time.time() - self.window_seconds,))
+
+    @contextmanager
+    def claim(self, canonical):
+        """
+        Serializes work on one canonical URL within the process, so concurrent
+        requests for the same article wait for the first fetch instead of
+        repeating it.
+        """
+        with self._claims_lock:
+            entry = self._claims.setdefault(canonical, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._claims_lock:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._claims[canonical]
+
+
+_url_index = None
+_url_index_lock = threading.Lock()
+
+
+def get_url_index():
+    """
+    Returns the shared URL index, or None when URL_INDEX_ENABLED is false.
+    """
+    global _url_index
+    if os.getenv("URL_INDEX_ENABLED", "true").lower() != "true":
+        return None
+    with _url_index_lock:
+        if _url_index is None:
+            _url_index = UrlIndex(
+                os.getenv("URL_INDEX_PATH", os.path.join(DEFAULT_CACHE_DIR, "url_index.sqlite")),
+                window_seconds=int(os.getenv("URL_INDEX_WINDOW", "21600"))
+            )
+        return _url_index
+
+
+def resolve_url(url):
+    """
+    Canonical form of url, following the shared index's aliases when enabled.
+    """
+    index = get_url_index()
+    return index.resolve(url) if index is not None else canonicalize_url(url)